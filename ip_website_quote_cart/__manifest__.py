@@ -28,9 +28,13 @@ Key Features:
     'depends': ['website_sale', 'sale_management', 'website_sale_wishlist', 'website_sale_comparison'],
     'post_init_hook': 'post_init_hook',
     'data': [
+        'security/ir.model.access.csv',
         'data/mail_template_data.xml',
+        'data/ir_cron_data.xml',
+        'data/sale_quote_request_counter_data.xml',
         'views/res_config_settings_views.xml',
         'views/views.xml',
+        'views/sale_quote_job_views.xml',
         'views/template.xml',
         'views/template_wishlist.xml',
         'views/template_comparison.xml',
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
 import logging
 from werkzeug.exceptions import Forbidden, NotFound
+from werkzeug.urls import url_encode
 from datetime import timedelta, datetime
 from odoo import fields, http, models, _
 from odoo.http import request, route
@@ -13,9 +15,120 @@ from odoo.addons.portal.controllers.portal import CustomerPortal, pager as porta
 from odoo.addons.website.controllers.form import WebsiteForm
 from odoo.addons.base.models.ir_qweb_fields import nl2br_enclose
 from odoo.tools import lazy, str2bool, clean_context
-from odoo.exceptions import AccessError, MissingError, ValidationError
+from odoo.exceptions import AccessError, MissingError, UserError, ValidationError
+from .. import metrics
 _logger = logging.getLogger(__name__)
 
+# Fragments a quote cart JSON route can return, see `WebsiteSale._get_quote_cart_fragments`:
+# * badge: the quote cart quantity shown in the header and the revision of the cart;
+# * notification: the payload of the "added to quote" notification;
+# * lines: the first page of cart lines of the quote cart page;
+# * line: the given cart lines alone, rendered again or removed;
+# * summary: the short cart summary;
+# * quote_summary: the items summary of the quote cart page;
+# * total: the total of the cart;
+# * reorder: the quick reorder history.
+QUOTE_CART_FRAGMENTS = ('badge', 'notification', 'lines', 'line', 'summary', 'quote_summary', 'total', 'reorder')
+
+# Number of cart lines rendered at once on the quote cart page, the next ones are loaded on demand.
+QUOTE_CART_LINES_PAGE_SIZE = 50
+
+# Sort order of the portal lists paginated with a keyset, see `_portal_keyset_search`.
+PORTAL_KEYSET_ORDER = 'date_order desc, id desc'
+PORTAL_KEYSET_REVERSE_ORDER = 'date_order asc, id asc'
+
+# Fields read by the portal order lists, fetched in one query for a whole page.
+PORTAL_ORDER_LIST_FIELDS = [
+    'name', 'date_order', 'validity_date', 'state', 'amount_total', 'currency_id',
+    'access_token', 'invoice_status',
+]
+
+# Number of addresses of each type listed on a page of the quote checkout.
+QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE = 20
+
+
+def _portal_keyset_search(SaleOrder, domain, url, page, step, after=None, before=None, url_args=None, keyset=True):
+    """Search a page of portal orders, seeking from the adjacent page instead of offsetting.
+
+    When `keyset` is set, the orders are sorted by `PORTAL_KEYSET_ORDER` and the pager only
+    links to the previous and next pages, with a cursor: `after` is the last order of the
+    previous page and `before` the first order of the next one, so that the search starts right
+    next to that order and deep pages cost the same as the first one. The orders are not
+    counted, one more order than the page holds is read to know whether there is a next page.
+    Without a valid cursor, e.g. for a page number typed in the url, the search falls back to an
+    offset. Without `keyset`, the pager is built from a count, up to the last page it shows.
+
+    :param SaleOrder: The `sale.order` model to search.
+    :param list domain: The domain of the orders.
+    :param str url: The url of the list, for the pager.
+    :param int page: The page to display.
+    :param int step: The number of orders per page.
+    :param str after: The cursor of the last order of the previous page.
+    :param str before: The cursor of the first order of the next page.
+    :param dict url_args: The query arguments of the pager links.
+    :param bool keyset: Whether the list is sorted by `PORTAL_KEYSET_ORDER`.
+    :return: The orders of the page, None without `keyset`, and the pager.
+    :rtype: tuple
+    """
+    if not keyset:
+        # The pager shows at most 5 pages after the current one.
+        total = SaleOrder.search_count(domain, limit=(page + 5) * step + 1)
+        return None, portal_pager(url=url, url_args=url_args, total=total, page=page, step=step)
+
+    after_cursor = after and _parse_portal_keyset_cursor(after)
+    before_cursor = not after_cursor and before and _parse_portal_keyset_cursor(before)
+    if before_cursor:
+        # Seek backwards, then list the orders of the page in the order of the list.
+        orders = SaleOrder.search(
+            domain + _portal_keyset_domain(before_cursor, '>'), order=PORTAL_KEYSET_REVERSE_ORDER, limit=step,
+        )[::-1]
+        has_next = True
+    else:
+        if after_cursor:
+            orders = SaleOrder.search(
+                domain + _portal_keyset_domain(after_cursor, '<'), order=PORTAL_KEYSET_ORDER, limit=step + 1,
+            )
+        else:
+            orders = SaleOrder.search(domain, order=PORTAL_KEYSET_ORDER, limit=step + 1, offset=(page - 1) * step)
+        has_next = len(orders) > step
+        orders = orders[:step]
+    orders.fetch(PORTAL_ORDER_LIST_FIELDS)
+
+    # Only the current page is numbered, the previous and next ones are reached with a cursor.
+    pager = portal_pager(
+        url=url, url_args=url_args, total=(page - 1 + has_next) * step + 1, page=page, step=step, scope=1,
+    )
+    if orders and has_next:
+        pager['page_next']['url'] = _portal_keyset_url(pager['page_next']['url'], after=orders[-1])
+    if orders and page > 1:
+        pager['page_previous']['url'] = _portal_keyset_url(pager['page_previous']['url'], before=orders[0])
+    return orders, pager
+
+
+def _portal_keyset_domain(cursor, operator):
+    """Return the domain of the orders sorted after (`<`) or before (`>`) the given cursor."""
+    date_order, order_id = cursor
+    return [
+        '|', ('date_order', operator, date_order),
+        '&', ('date_order', '=', date_order), ('id', operator, order_id),
+    ]
+
+
+def _portal_keyset_url(url, **orders):
+    """Return the pager url with the cursor of the given order, by cursor name."""
+    return '%s%s%s' % (url, '&' if '?' in url else '?', url_encode({
+        name: '%s,%s' % (fields.Datetime.to_string(order.date_order), order.id) for name, order in orders.items()
+    }))
+
+
+def _parse_portal_keyset_cursor(cursor):
+    """Return the `(date_order, id)` of a keyset cursor, or None if it is invalid."""
+    try:
+        date_order, order_id = cursor.split(',')
+        return fields.Datetime.to_datetime(date_order), int(order_id)
+    except ValueError:
+        return None
+
 
 class QuoteCartForm(WebsiteForm):
     """Handle form submissions for quote cart extra info page."""
@@ -30,9 +143,7 @@ class QuoteCartForm(WebsiteForm):
             return json.dumps({'error_fields': e.args[0]})
 
         # Get the quote order instead of normal cart
-        order_sudo = request.website.with_context(
-            request.website.update_quote_context()
-        ).sale_get_quote_order()
+        order_sudo = request.website._with_quote_context().sale_get_quote_order()
         
         if not order_sudo:
             return json.dumps({'error': "No quote order found; please add a product to your quote cart."})
@@ -40,6 +151,7 @@ class QuoteCartForm(WebsiteForm):
         # Write standard fields to the order
         if data['record']:
             order_sudo.write(data['record'])
+            order_sudo._bump_quote_cart_revision()
 
         # Log custom fields as a message in chatter
         if data['custom']:
@@ -65,20 +177,15 @@ class WebsiteSale(WebsiteSale):
         is_quote_checkout = kw.get('quote_cart') or '/shop/quote/' in request.httprequest.referrer if request.httprequest.referrer else False
         
         if is_quote_checkout:
-            order_sudo = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+            order_sudo = request.website._with_quote_context().sale_get_quote_order()
         else:
             order_sudo = request.cart
             
         if not order_sudo:
             return
 
-        ResPartner = request.env['res.partner'].sudo()
-        partner_sudo = ResPartner.browse(partner_id).exists()
-        children = ResPartner._search([
-            ('id', 'child_of', order_sudo.partner_id.commercial_partner_id.id),
-            ('type', 'in', ('invoice', 'delivery', 'other')),
-        ])
-        if (partner_sudo != order_sudo.partner_id and partner_sudo != order_sudo.partner_id.commercial_partner_id and partner_sudo.id not in children):
+        partner_sudo = request.env['res.partner'].sudo().browse(partner_id).exists()
+        if not self._is_order_address(order_sudo, partner_sudo):
             raise Forbidden()
         partner_fnames = set()
         if (address_type == 'billing' and partner_sudo != order_sudo.partner_invoice_id):
@@ -87,6 +194,25 @@ class WebsiteSale(WebsiteSale):
             partner_fnames.add('partner_shipping_id')
         order_sudo._update_address(partner_id, partner_fnames)
 
+    def _is_order_address(self, order_sudo, partner_sudo):
+        """Return whether the partner is the customer of the order or one of the invoice,
+        delivery or other addresses of its commercial entity.
+
+        The address is checked directly against the commercial entity of the customer, instead
+        of listing the whole address book of the entity.
+        """
+        customer_sudo = order_sudo.partner_id
+        commercial_partner_sudo = customer_sudo.commercial_partner_id
+        if not partner_sudo:
+            return False
+        if partner_sudo in (customer_sudo, commercial_partner_sudo):
+            return True
+        return (
+            partner_sudo.active
+            and partner_sudo.commercial_partner_id == commercial_partner_sudo
+            and partner_sudo.type in ('invoice', 'delivery', 'other')
+        )
+
     @route('/shop/delivery_methods', type='jsonrpc', auth='public', website=True)
     def shop_delivery_methods(self):
         """Override to support quote checkout - returns empty for quote orders (no delivery needed)."""
@@ -95,7 +221,7 @@ class WebsiteSale(WebsiteSale):
         
         if is_quote_checkout:
             # Quote checkout doesn't need delivery methods - return empty template
-            order_sudo = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+            order_sudo = request.website._with_quote_context().sale_get_quote_order()
             if order_sudo:
                 values = {
                     'delivery_methods': [],
@@ -109,11 +235,34 @@ class WebsiteSale(WebsiteSale):
         return super().shop_delivery_methods()
 
     @http.route(['/shop/quote/update'], type='jsonrpc', auth='public', methods=['POST'], website=True, csrf=False)
-    def update_quote_cart(self, line_id, quantity, product_id=None, **kwargs):
+    @metrics.timed_route('update_quote_cart')
+    def update_quote_cart(self, line_id, quantity, product_id=None, fragments=None, **kwargs):
+        """Update the quantity of a quote cart line from the cart page.
 
-        order_sudo = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order(force_create=1)
+        :param list fragments: names of the fragments to return, see `QUOTE_CART_FRAGMENTS`.
+                               Defaults to the badge, the cart lines, the total and the
+                               reorder history.
+        """
         quantity = int(quantity)  # Do not allow float values in ecommerce by default
-        IrUiView = request.env['ir.ui.view']
+        website = request.website._with_quote_context()
+        if website._is_session_quote_cart() and product_id:
+            website._update_session_quote_cart(product_id, set_qty=max(quantity, 0))
+            return self._get_session_quote_cart_values(
+                website, product_id, fragments or ('badge', 'lines', 'total', 'reorder'),
+            )
+
+        # Removing a line never requires a quote cart, do not create an empty one for it.
+        order_sudo = request.website._with_quote_context().sale_get_quote_order(
+            force_create=quantity > 0
+        )
+        if not order_sudo:
+            return {
+                'cart_quantity': 0,
+                'quote_cart_quantity': 0,
+                'cart_ready': False,
+                'amount': 0.0,
+                'is_quote_cart': 'is_quote_cart',
+            }
 
         # This method must be only called from the cart page BUT in some advanced logic
         # eg. website_sale_loyalty, a cart line could be a temporary record without id.
@@ -122,97 +271,370 @@ class WebsiteSale(WebsiteSale):
             line_id = order_sudo.order_line.filtered(
                 lambda sol: sol.product_id.id == product_id
             )[:1].id
+        # The linked lines (options, combo items) follow the quantity of their line.
+        line_sudo = order_sudo.order_line.filtered(lambda sol: sol.id == line_id)
+        updated_line_ids = [line_id, *line_sudo.linked_line_ids.ids]
 
         values = order_sudo._cart_update_line_quantity(line_id, quantity, **kwargs)
 
-        values['quote_cart_quantity'] = order_sudo.cart_quantity
-        request.session['quote_cart_quantity'] = order_sudo.cart_quantity
+        request.website._set_quote_session(quote_cart_quantity=order_sudo.cart_quantity)
         values['cart_ready'] = order_sudo._is_cart_ready()
         values['amount'] = order_sudo.amount_total
         values['is_quote_cart'] = 'is_quote_cart'
 
-        values['ip_website_quote_cart.cart_lines'] = IrUiView._render_template(
-            'ip_website_quote_cart.cart_lines', {
-                'website_sale_order': order_sudo,
-                'date': fields.Date.today(),
-                'suggested_products': order_sudo._cart_accessories()
-            }
-        )
-        values['website_sale.total'] = IrUiView._render_template(
-            'website_sale.total', {
-                'website_sale_order': order_sudo,
-            }
-        )
-        values['website_sale.quick_reorder_history'] = IrUiView._render_template(
-            'website_sale.quick_reorder_history', {
-                'website_sale_order': order_sudo,
-                **self._prepare_order_history(),
-            }
-        )
+        if fragments is None:
+            fragments = ('badge', 'lines', 'total', 'reorder')
+        values.update(self._get_quote_cart_fragments(order_sudo, fragments, line_ids=updated_line_ids))
         return values
 
     @http.route(['/shop/quote/cart/update_json'], type='jsonrpc', auth="public", methods=['POST'], website=True, csrf=False)
-    def quote_cart_update_json(self, product_id, line_id=None, add_qty=None, set_qty=None, display=True, **kwargs):
+    @metrics.timed_route('quote_cart_update_json')
+    def quote_cart_update_json(self, product_id, line_id=None, add_qty=None, set_qty=None, display=True, fragments=None, **kwargs):
         """This route is called when changing quantity from the cart or adding
-        a product from the wishlist."""
-        order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order(force_create=1)
+        a product from the wishlist.
+
+        :param bool display: when False and no `fragments` are given, only the badge and the
+                             notification payload are returned.
+        :param list fragments: names of the fragments to return, see `QUOTE_CART_FRAGMENTS`.
+        """
+        website = request.website._with_quote_context()
+        if website._is_session_quote_cart() and website._can_add_to_session_quote_cart(product_id, **kwargs):
+            website._update_session_quote_cart(product_id, add_qty=add_qty)
+            if fragments is None:
+                fragments = ('badge', 'notification', 'lines', 'summary') if display else ('badge', 'notification')
+            return self._get_session_quote_cart_values(website, product_id, fragments)
+
+        order = website.sale_get_quote_order(force_create=1)
 
         if order.state != 'draft':
-            request.website.with_context(request.website.update_quote_context()).sale_reset()
+            request.website._with_quote_context().sale_reset()
             return {}
 
         value = order.with_context(skip_cart_verification=True)._cart_add(product_id=product_id, quantity=add_qty, **kwargs)
-        request.session['quote_cart_quantity'] = order.cart_quantity
+        request.website._set_quote_session(quote_cart_quantity=order.cart_quantity)
 
         if not order.cart_quantity:
-            request.website.with_context(request.website.update_quote_context()).sale_reset()
+            request.website._with_quote_context().sale_reset()
             return value
 
-        value['quote_cart_quantity'] = order.cart_quantity
         value['is_quote_cart'] = True
 
         # Get the line that was just added/updated for notification
         added_line_ids = value.get('line_id') or value.get('line_ids', [])
         if isinstance(added_line_ids, int):
             added_line_ids = [added_line_ids]
-        
-        # Build notification info for quote cart
-        if added_line_ids:
-            lines = order.order_line.filtered(lambda l: l.id in added_line_ids)
-            value['notification_info'] = {
-                'currency_id': order.currency_id.id,
-                'lines': [
-                    {
-                        'id': line.id,
-                        'image_url': request.website.image_url(line.product_id, 'image_128'),
-                        'quantity': line.product_uom_qty,
-                        'name': line.name_short or line.product_id.name,
-                        'combination_name': line._get_combination_name() if hasattr(line, '_get_combination_name') else '',
-                        'price_total': 0,  # Set to 0 so price is hidden for quote cart
-                        'hide_price': True,  # Flag to hide price in notification
-                    } for line in lines
-                ],
-            }
 
-        value['ip_website_quote_cart.cart_lines'] = request.env['ir.ui.view']._render_template("ip_website_quote_cart.cart_lines", {
-            'website_sale_order': order,
-            'date': fields.Date.today(),
-            'suggested_products': order._cart_accessories(),
-        })
-        value['website_sale.short_cart_summary'] = request.env['ir.ui.view']._render_template("ip_website_quote_cart.short_cart_summary", {
-            'website_sale_order': order,
-        })
-        if not display:
-            return value
+        if fragments is None:
+            fragments = ('badge', 'notification', 'lines', 'summary') if display else ('badge', 'notification')
+        value.update(self._get_quote_cart_fragments(order, fragments, line_ids=added_line_ids))
         return value
 
+    @http.route(['/shop/quote/cart/update_batch_json'], type='jsonrpc', auth="public", methods=['POST'], website=True, csrf=False)
+    @metrics.timed_route('quote_cart_update_batch_json')
+    def quote_cart_update_batch_json(self, lines, fragments=('badge', 'notification'), **kwargs):
+        """Add a main product and its optional products to the quote cart in one call.
+
+        :param list lines: serialized products, each a dict with `product_id`, `quantity`,
+                           `product_template_id`, `parent_product_template_id`,
+                           `product_custom_attribute_values` and `no_variant_attribute_value_ids`.
+                           Optional products are linked to the line of their parent template.
+        :param list fragments: names of the fragments to return, see `QUOTE_CART_FRAGMENTS`.
+        """
+        website = request.website._with_quote_context()
+        if website._is_session_quote_cart() and all(
+            not line.get('parent_product_template_id') and website._can_add_to_session_quote_cart(
+                line['product_id'],
+                product_custom_attribute_values=line.get('product_custom_attribute_values'),
+                no_variant_attribute_value_ids=line.get('no_variant_attribute_value_ids'),
+            )
+            for line in lines
+        ):
+            product_ids = []
+            for line in lines:
+                if float(line.get('quantity') or 0) > 0:
+                    website._update_session_quote_cart(line['product_id'], add_qty=line['quantity'])
+                    product_ids.append(int(line['product_id']))
+            return self._get_session_quote_cart_values(website, product_ids, fragments)
+
+        order = website.sale_get_quote_order(force_create=1)
+
+        if order.state != 'draft':
+            request.website._with_quote_context().sale_reset()
+            return {}
+
+        values = self._quote_cart_add_lines(order, lines, **kwargs)
+        request.website._set_quote_session(quote_cart_quantity=order.cart_quantity)
+
+        if not order.cart_quantity:
+            request.website._with_quote_context().sale_reset()
+            return values
+
+        values['is_quote_cart'] = True
+        values.update(self._get_quote_cart_fragments(order, fragments, line_ids=values['line_ids']))
+        return values
+
+    def _quote_cart_add_lines(self, order_sudo, lines, **kwargs):
+        """Apply serialized lines to the quote order and verify the cart once at the end.
+
+        :param sale.order order_sudo: The quote order to update.
+        :param list lines: See `quote_cart_update_batch_json`.
+        :return: The added line ids, the quantities and the warnings of the update.
+        :rtype: dict
+        """
+        ProductSudo = request.env['product.product'].sudo()
+        order_sudo = order_sudo.with_context(skip_cart_verification=True)
+        line_id_per_template = {}
+        added_line_ids = []
+        warnings = []
+        for line in lines:
+            quantity = float(line.get('quantity') or 0)
+            if quantity <= 0:
+                continue
+            product_sudo = ProductSudo.browse(int(line['product_id'])).exists()
+            if not product_sudo or (
+                not product_sudo._is_add_to_cart_allowed() and product_sudo.type != 'combo'
+            ):
+                raise UserError(_("The given product does not exist therefore it cannot be added to cart."))
+
+            parent_template_id = line.get('parent_product_template_id')
+            linked_line_id = parent_template_id and line_id_per_template.get(parent_template_id)
+            if parent_template_id and not linked_line_id:
+                # The parent product was not added, its options must not be added either.
+                continue
+
+            values = order_sudo._cart_add(
+                product_id=product_sudo.id,
+                quantity=quantity,
+                linked_line_id=linked_line_id or False,
+                no_variant_attribute_value_ids=line.get('no_variant_attribute_value_ids'),
+                product_custom_attribute_values=line.get('product_custom_attribute_values'),
+                **kwargs,
+            )
+            if not values.get('line_id'):
+                continue
+            line_id_per_template[line.get('product_template_id') or product_sudo.product_tmpl_id.id] = values['line_id']
+            added_line_ids.append(values['line_id'])
+            if values.get('warning'):
+                warnings.append(values['warning'])
+
+        # Combo product lines and cart-level checks only make sense once all the lines exist.
+        main_line = request.env['sale.order.line'].sudo().browse(added_line_ids[:1])
+        if main_line.product_type == 'combo':
+            main_line._check_validity()
+        order_sudo._verify_cart_after_update()
+
+        return {
+            'line_ids': added_line_ids,
+            'warning': '\n'.join(warnings),
+        }
+
+    def _quote_cart_add_quantities(self, website, quantities):
+        """Add the given quantities of plain products to the quote cart in one batch.
+
+        The products must be allowed in the cart and must not be combo products. They are added
+        to the session quote cart in session mode, otherwise to the quote order, created if
+        needed, with one update of its lines, see `sale.order._quote_cart_import_lines`.
+
+        :param website website: The current website, with the quote context.
+        :param dict quantities: The quantities to add, by product id.
+        :return: The warnings of the quantity checks.
+        :rtype: list
+        """
+        if website._is_session_quote_cart():
+            for product_id, quantity in quantities.items():
+                website._update_session_quote_cart(product_id, add_qty=quantity)
+            return []
+        order_sudo = website.sale_get_quote_order(force_create=True)
+        if order_sudo.state != 'draft':
+            website.sale_reset()
+            order_sudo = website.sale_get_quote_order(force_create=True)
+        _lines, warnings = order_sudo._quote_cart_import_lines(quantities)
+        website._set_quote_session(quote_cart_quantity=order_sudo.cart_quantity)
+        return warnings
+
+    def _get_session_quote_cart_values(self, website, product_ids, fragments):
+        """Return the values of a quote cart JSON route for a session quote cart.
+
+        :param website website: The current website, with the quote context.
+        :param product_ids: The updated product(s), announced in the notification payload.
+        :param list fragments: names of the fragments to return, see `QUOTE_CART_FRAGMENTS`.
+        :rtype: dict
+        """
+        if isinstance(product_ids, (int, str)):
+            product_ids = [int(product_ids)]
+        order = website._get_session_quote_order()
+        lines = order.order_line.filtered(lambda l: l.product_id.id in product_ids)
+        values = {
+            'line_id': False,
+            'quantity': lines[:1].product_uom_qty,
+            'cart_quantity': order.cart_quantity if order else 0,
+            'cart_ready': False,
+            'amount': order.amount_total if order else 0.0,
+            'is_quote_cart': True,
+        }
+        if order:
+            # Lines of a session quote cart are identified by their product.
+            values.update(self._get_quote_cart_fragments(order, fragments, line_ids=product_ids))
+        else:
+            values['quote_cart_quantity'] = 0
+        return values
+
+    def _get_quote_cart_notification_info(self, order, line_ids):
+        """Return the payload of the "added to quote" notification for the given lines.
+
+        The lines of a session quote cart, which are not stored, are given by product id.
+        """
+        if order.id:
+            lines = order.order_line.filtered(lambda l: l.id in line_ids)
+        else:
+            lines = order.order_line.filtered(lambda l: l.product_id.id in line_ids)
+        return {
+            'currency_id': order.currency_id.id,
+            'lines': [
+                {
+                    'id': line.id or line.product_id.id,
+                    'image_url': request.website.image_url(line.product_id, 'image_128'),
+                    'quantity': line.product_uom_qty,
+                    'name': line.name_short or line.product_id.name,
+                    'combination_name': line._get_combination_name() if hasattr(line, '_get_combination_name') else '',
+                    'price_total': 0,  # Set to 0 so price is hidden for quote cart
+                    'hide_price': True,  # Flag to hide price in notification
+                } for line in lines
+            ],
+        }
+
+    def _get_quote_cart_fragments(self, order, fragments, line_ids=None):
+        """Compute the requested fragments of the quote cart, and only those.
+
+        :param sale.order order: The quote order.
+        :param list fragments: names of the fragments to return, see `QUOTE_CART_FRAGMENTS`.
+        :param list line_ids: The lines to announce in the notification payload.
+        :return: The values to return to the client, keyed as the client expects them.
+        :rtype: dict
+        """
+        fragments = set(fragments or ())
+        unknown_fragments = fragments - set(QUOTE_CART_FRAGMENTS)
+        if unknown_fragments:
+            raise ValidationError(_("Unknown quote cart fragments: %s", ', '.join(sorted(unknown_fragments))))
+
+        IrUiView = request.env['ir.ui.view']
+        values = {}
+        if 'badge' in fragments:
+            values['quote_cart_quantity'] = order.cart_quantity
+            values['quote_cart_revision'] = order._get_quote_cart_revision_key()
+        if 'notification' in fragments and line_ids:
+            values['notification_info'] = self._get_quote_cart_notification_info(order, line_ids)
+        if 'line' in fragments and not order.id:
+            # The lines of a session quote cart have no id to be found by, and are few.
+            fragments.add('lines')
+        elif 'line' in fragments:
+            with metrics.phase('render_lines'):
+                values['ip_website_quote_cart.cart_line'] = self._render_quote_cart_lines(order, line_ids or [])
+        if 'lines' in fragments:
+            with metrics.phase('render_lines'):
+                values['ip_website_quote_cart.cart_lines'] = IrUiView._render_template("ip_website_quote_cart.cart_lines", {
+                    'website_sale_order': order,
+                    'date': fields.Date.today(),
+                    **self._get_quote_cart_lines_window(order),
+                })
+        if 'summary' in fragments:
+            with metrics.phase('render_summary'):
+                values['website_sale.short_cart_summary'] = IrUiView._render_template("ip_website_quote_cart.short_cart_summary", {
+                    'website_sale_order': order,
+                })
+        if 'quote_summary' in fragments:
+            with metrics.phase('render_summary'):
+                values['ip_website_quote_cart.quote_cart_summary_content'] = IrUiView._render_template(
+                    "ip_website_quote_cart.quote_cart_summary_content", {'website_sale_order': order},
+                )
+                values['quote_cart_line_count'] = len(order.website_order_line)
+        if 'total' in fragments:
+            with metrics.phase('render_total'):
+                values['website_sale.total'] = IrUiView._render_template("website_sale.total", {
+                    'website_sale_order': order,
+                })
+        if 'reorder' in fragments:
+            with metrics.phase('render_reorder'):
+                values['website_sale.quick_reorder_history'] = IrUiView._render_template("website_sale.quick_reorder_history", {
+                    'website_sale_order': order,
+                    **self._prepare_order_history(),
+                })
+        return values
+
+    def _get_quote_cart_lines_window(self, order, offset=0):
+        """Return the rendering values of a page of `QUOTE_CART_LINES_PAGE_SIZE` cart lines.
+
+        :param sale.order order: The quote order.
+        :param int offset: The index of the first line of the page.
+        :return: The lines of the page, its offset and the offset of the next page, if any.
+        :rtype: dict
+        """
+        lines = order.website_order_line
+        window = lines[offset:offset + QUOTE_CART_LINES_PAGE_SIZE]
+        next_offset = offset + len(window)
+        return {
+            'quote_cart_lines': window,
+            'quote_cart_lines_offset': offset,
+            'quote_cart_lines_next_offset': next_offset if next_offset < len(lines) else False,
+        }
+
+    def _render_quote_cart_lines(self, order, line_ids):
+        """Render the given cart lines alone, to replace them on the quote cart page.
+
+        :param sale.order order: The quote order.
+        :param list line_ids: The lines to render.
+        :return: The html of each line, by line id, empty for the lines that no longer exist.
+        :rtype: dict
+        """
+        IrUiView = request.env['ir.ui.view']
+        lines = order.website_order_line
+        rendered = {}
+        for line_id in line_ids:
+            line = lines.filtered(lambda l: l.id == line_id)
+            rendered[line_id] = IrUiView._render_template("ip_website_quote_cart.cart_line", {
+                'website_sale_order': order,
+                'line': line,
+                'line_first': line == lines[:1],
+                'line_last': line == lines[-1:],
+            }) if line else ''
+        return rendered
+
+    @http.route(['/shop/quote/cart/add_all'], type='http', auth="public", methods=['POST'], website=True, sitemap=False)
+    @metrics.timed_route('quote_cart_add_all')
+    def quote_cart_add_all(self, source='comparison', product_ids='', keep_in_wishlist=False, **post):
+        """Add all the products of the wishlist, or of the comparison, to the quote cart in one
+        batch, and display the quote cart.
+
+        :param str source: 'wishlist' for the wishlist of the visitor, 'comparison' for the
+                           compared products given in `product_ids`.
+        :param str product_ids: The comma-separated ids of the compared products.
+        :param bool keep_in_wishlist: Whether the products added from the wishlist stay in it.
+        """
+        website = request.website._with_quote_context()
+        wishes_sudo = request.env['product.wishlist'].sudo()
+        if source == 'wishlist':
+            wishes_sudo = request.env['product.wishlist'].current().sudo()
+            products_sudo = wishes_sudo.product_id
+        else:
+            products_sudo = request.env['product.product'].sudo().browse(
+                int(product_id) for product_id in product_ids.split(',') if product_id.strip().isdigit()
+            ).exists()
+        products_sudo = products_sudo.filtered(
+            lambda product: product.type != 'combo' and product._is_add_to_cart_allowed()
+        )
+        if products_sudo:
+            self._quote_cart_add_quantities(website, dict.fromkeys(products_sudo.ids, 1.0))
+            if not keep_in_wishlist:
+                wishes_sudo.filtered(lambda wish: wish.product_id in products_sudo).unlink()
+        return request.redirect('/shop/quote/cart')
+
     @http.route(['/shop/quote/cart/update'], type='http', auth="public", methods=['POST'], website=True)
     def quote_cart_update(self, product_id, add_qty=1, set_qty=0, **kw):
         """This route is called when adding a product to cart (no options)."""
-        sale_order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order(force_create=True)
+        sale_order = request.website._with_quote_context().sale_get_quote_order(force_create=True)
         if sale_order.state != 'draft':
-            request.session['quote_order_id'] = None
-            sale_order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order(force_create=True)
+            request.website._set_quote_session(quote_order_id=None)
+            sale_order = request.website._with_quote_context().sale_get_quote_order(force_create=True)
 
         product_custom_attribute_values = None
         if kw.get('product_custom_attribute_values'):
@@ -228,25 +650,39 @@ class WebsiteSale(WebsiteSale):
             product_custom_attribute_values=product_custom_attribute_values,
             no_variant_attribute_values=no_variant_attribute_values
         )
-        request.session['quote_cart_quantity'] = sale_order.cart_quantity
+        request.website._set_quote_session(quote_cart_quantity=sale_order.cart_quantity)
 
         if kw.get('express'):
             return request.redirect("/shop/checkout?express=1")
         return request.redirect("/shop/quote/cart")
 
     @http.route(['/shop/quote/cart'], type='http', auth="public", website=True, sitemap=False)
+    @metrics.timed_route('quote_cart')
     def quote_cart(self, access_token=None, revive='', **post):
         """
         Main cart management + abandoned cart revival
         access_token: Abandoned cart SO access token
         revive: Revival method when abandoned cart. Can be 'merge' or 'squash'add_to_cart
         """
-        order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+        website = request.website._with_quote_context()
+        order = website.sale_get_quote_order()
         if order and order.state != 'draft':
-            request.session['quote_order_id'] = None
-            order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+            request.website._set_quote_session(quote_order_id=None)
+            order = website.sale_get_quote_order()
+        if not order and website._is_session_quote_cart():
+            order = website._get_session_quote_order()
         values = {}
-        request.session['quote_cart_quantity'] = order.cart_quantity if order else 0
+        request.website._set_quote_session(quote_cart_quantity=order.cart_quantity if order else 0)
+
+        if order.id:
+            inactive_lines = order.order_line.filtered(lambda sol: sol.product_id and not sol.product_id.active)
+            if inactive_lines:
+                inactive_lines.unlink()
+                order._bump_quote_cart_revision()
+
+        etag = not access_token and post.get('type') != 'popover' and self._get_quote_cart_etag(order, 'cart')
+        if self._quote_cart_etag_matches(etag):
+            return self._quote_cart_not_modified(etag)
 
         if access_token:
             abandoned_order = request.env['sale.order'].sudo().search([('access_token', '=', access_token)], limit=1)
@@ -254,13 +690,13 @@ class WebsiteSale(WebsiteSale):
                 raise NotFound()
             if abandoned_order.state != 'draft':  # abandoned cart already finished
                 values.update({'abandoned_proceed': True})
-            elif revive == 'squash' or (revive == 'merge' and not request.session.get('quote_order_id')):  # restore old cart or merge with unexistant
-                request.session['quote_order_id'] = abandoned_order.id
+            elif revive == 'squash' or (revive == 'merge' and not request.website._get_quote_session('quote_order_id')):  # restore old cart or merge with unexistant
+                request.website._set_quote_session(quote_order_id=abandoned_order.id)
                 return request.redirect('/shop/quote/cart')
             elif revive == 'merge':
-                abandoned_order.order_line.write({'order_id': request.session['quote_order_id']})
+                request.env['sale.order'].sudo().browse(request.website._get_quote_session('quote_order_id'))._merge_quote_cart_lines(abandoned_order)
                 abandoned_order.action_cancel()
-            elif abandoned_order.id != request.session.get('quote_order_id'):  # abandoned cart found, user have to choose what to do
+            elif abandoned_order.id != request.website._get_quote_session('quote_order_id'):  # abandoned cart found, user have to choose what to do
                 values.update({'access_token': abandoned_order.access_token})
 
         values.update({
@@ -269,8 +705,8 @@ class WebsiteSale(WebsiteSale):
             'suggested_products': [],
         })
         if order:
-            order.order_line.filtered(lambda sol: sol.product_id and not sol.product_id.active).unlink()
             values['suggested_products'] = order._cart_accessories()
+            values.update(self._get_quote_cart_lines_window(order))
 
         if post.get('type') == 'popover':
             values.update({
@@ -279,18 +715,163 @@ class WebsiteSale(WebsiteSale):
             # force no-cache so IE11 doesn't cache this XHR
             return request.render("website_sale.cart_popover", values, headers={'Cache-Control': 'no-cache'})
 
-        return request.render("ip_website_quote_cart.quote_cart", values)
+        return request.render("ip_website_quote_cart.quote_cart", values, headers=self._get_quote_cart_etag_headers(etag))
 
-    def _prepare_checkout_page_values(self, order_sudo, **kwargs):
-        res = super()._prepare_checkout_page_values(order_sudo, **kwargs)
+    @http.route(['/shop/quote/cart/lines'], type='jsonrpc', auth="public", methods=['POST'], website=True, readonly=True)
+    @metrics.timed_route('quote_cart_lines')
+    def quote_cart_lines(self, offset=0):
+        """Return the html of a page of lines of the quote cart page, see `QUOTE_CART_LINES_PAGE_SIZE`.
+
+        :param int offset: The index of the first line of the page.
+        :rtype: dict
+        """
+        website = request.website._with_quote_context()
+        order = website.sale_get_quote_order()
+        if order and order.state != 'draft':
+            order = request.env['sale.order']
+        if not order and website._is_session_quote_cart():
+            order = website._get_session_quote_order()
+        if not order:
+            return {'html': ''}
+        with metrics.phase('render_lines'):
+            html = request.env['ir.ui.view']._render_template("ip_website_quote_cart.cart_lines_page", {
+                'website_sale_order': order,
+                **self._get_quote_cart_lines_window(order, max(int(offset), 0)),
+            })
+        return {'html': html}
+
+    @http.route(['/shop/quote/cart/quantity'], type='jsonrpc', auth="public", methods=['POST'], website=True, readonly=True)
+    def quote_cart_quantity(self):
+        """Return the quantities of the header quote cart and cart badges.
+
+        Used to fill in the badges of cacheable headers, see `website.quote_cart_cacheable_header`.
+        """
+        return {
+            'quote_cart_quantity': request.website._get_quote_session('quote_cart_quantity', 0),
+            'cart_quantity': request.website._get_header_cart_quantity(),
+        }
+
+    @http.route(['/shop/quote/cart/popover'], type='jsonrpc', auth="public", methods=['POST'], website=True, readonly=True)
+    @metrics.timed_route('quote_cart_popover')
+    def quote_cart_popover(self, revision=None):
+        """Return the content of the header quote cart popover, without modifying the cart.
+
+        :param str revision: The revision of the popover cached by the client, if any.
+        :return: The revision and quantity of the quote cart, and the popover html unless the
+                 client's revision is still the current one.
+        :rtype: dict
+        """
+        website = request.website._with_quote_context()
+        order = website.sale_get_quote_order()
+        if order and order.state != 'draft':
+            order = request.env['sale.order']
+        if not order and website._is_session_quote_cart():
+            order = website._get_session_quote_order()
+        values = {
+            'revision': order._get_quote_cart_revision_key(),
+            'quote_cart_quantity': order.cart_quantity if order else 0,
+        }
+        if revision and revision == values['revision']:
+            metrics.cache_lookup('popover_revision', True)
+            return values
+        metrics.cache_lookup('popover_revision', False)
+        with metrics.phase('render_popover'):
+            values['html'] = request.env['ir.ui.view']._render_template('ip_website_quote_cart.quote_cart_popover', {
+                'website_sale_order': order,
+            })
+        return values
 
+    def _prepare_checkout_page_values(self, order_sudo, **kwargs):
         if order_sudo.is_quote:
-            res['address_url'] = '/shop/quote/address'
-        else:
-            res['address_url'] = '/shop/address'
+            return self._prepare_quote_checkout_page_values(order_sudo, **kwargs)
 
+        res = super()._prepare_checkout_page_values(order_sudo, **kwargs)
+        res['address_url'] = '/shop/address'
         return res
 
+    def _prepare_quote_checkout_page_values(self, order_sudo, **kwargs):
+        """Return the values of the quote checkout page.
+
+        The values are those of `_prepare_checkout_page_values` of website_sale, which is not called
+        since it lists the whole address book of the customer's commercial entity: large B2B
+        address books are listed one page at a time instead, see `_get_quote_checkout_addresses`.
+        """
+        delivery_addresses_sudo, delivery_pager = self._get_quote_checkout_addresses(order_sudo, 'delivery', **kwargs)
+        billing_addresses_sudo, billing_pager = self._get_quote_checkout_addresses(order_sudo, 'billing', **kwargs)
+        return {
+            'order': order_sudo,
+            'website_sale_order': order_sudo,
+            'delivery_addresses': delivery_addresses_sudo,
+            'billing_addresses': billing_addresses_sudo,
+            'use_delivery_as_billing': order_sudo.partner_shipping_id == order_sudo.partner_invoice_id,
+            'only_services': order_sudo.only_services,
+            'address_url': '/shop/quote/address',
+            'quote_address_pagers': {'delivery': delivery_pager, 'billing': billing_pager},
+        }
+
+    def _get_quote_checkout_addresses(self, order_sudo, address_type, **kwargs):
+        """Return a page of the addresses of the given type of the quote order's customer.
+
+        The page and the search term of each address type are given by the `<type>_page` and
+        `<type>_search` query string parameters of the checkout page. The address selected on the
+        order and the customer are always listed first.
+
+        :param sale.order order_sudo: The quote order.
+        :param str address_type: 'delivery' or 'billing'.
+        :return: The addresses of the page, and the values of the address picker.
+        :rtype: tuple
+        """
+        search = (kwargs.get('%s_search' % address_type) or '').strip()
+        try:
+            page = max(int(kwargs.get('%s_page' % address_type) or 1), 1)
+        except ValueError:
+            page = 1
+
+        commercial_partner_sudo = order_sudo.partner_id.commercial_partner_id
+        types = ['delivery', 'other'] if address_type == 'delivery' else ['invoice', 'other']
+        domain = [
+            ('commercial_partner_id', '=', commercial_partner_sudo.id),
+            '|', ('type', 'in', types), ('id', '=', commercial_partner_sudo.id),
+        ]
+        if search:
+            domain += [
+                '|', '|', '|', ('name', 'ilike', search), ('street', 'ilike', search),
+                ('city', 'ilike', search), ('zip', 'ilike', search),
+            ]
+        PartnerSudo = request.env['res.partner'].sudo().with_context(show_address=1)
+        total = PartnerSudo.search_count(domain)
+        page_count = max((total + QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE - 1) // QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE, 1)
+        page = min(page, page_count)
+        addresses_sudo = PartnerSudo.search(
+            domain, order='id desc', limit=QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE,
+            offset=(page - 1) * QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE,
+        )
+        selected_sudo = order_sudo.partner_shipping_id if address_type == 'delivery' else order_sudo.partner_invoice_id
+        if not search:
+            pinned_sudo = (selected_sudo | order_sudo.partner_id).with_context(show_address=1)
+            addresses_sudo = pinned_sudo | (addresses_sudo - pinned_sudo)
+
+        # Keep the picker state of the other address type in the page urls.
+        url_args = {
+            key: value for key, value in kwargs.items()
+            if key in ('delivery_search', 'delivery_page', 'billing_search', 'billing_page') and value
+        }
+        url_args.pop('%s_page' % address_type, None)
+
+        def page_url(page_number):
+            return '/shop/quote/checkout?%s' % url_encode({**url_args, '%s_page' % address_type: page_number})
+
+        return addresses_sudo, {
+            'search': search,
+            'search_name': '%s_search' % address_type,
+            'hidden_args': {key: value for key, value in url_args.items() if key != '%s_search' % address_type},
+            'total': total,
+            'page': page,
+            'page_count': page_count,
+            'prev_url': page > 1 and page_url(page - 1),
+            'next_url': page < page_count and page_url(page + 1),
+        }
+
     @route(
         ['/shop/checkout', '/shop/<string:quote_cart>/checkout'], type='http', methods=['GET'], auth='public', website=True, sitemap=False
     )
@@ -307,7 +888,7 @@ class WebsiteSale(WebsiteSale):
         """
         try_skip_step = str2bool(try_skip_step or 'false')
         is_quote_checkout = quote_cart == 'quote'
-        order_sudo = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order() if is_quote_checkout else request.cart
+        order_sudo = request.website._with_quote_context().sale_get_quote_order(materialize=True) if is_quote_checkout else request.cart
         request.session['sale_last_order_id'] = order_sudo.id
 
         redirection = self.quote_checkout_check_address(order_sudo) if is_quote_checkout else self._check_cart_and_addresses(order_sudo)
@@ -321,7 +902,11 @@ class WebsiteSale(WebsiteSale):
         })
 
         can_skip_delivery = True  # Delivery is only needed for deliverable products.
-        if order_sudo._has_deliverable_products():
+        if is_quote_checkout:
+            # Quote requests are not charged for delivery, their rate is computed once the
+            # request is turned into a quotation.
+            checkout_page_values['delivery_methods'] = []
+        elif order_sudo._has_deliverable_products():
             can_skip_delivery = False
             available_dms = order_sudo._get_delivery_methods()
             checkout_page_values['delivery_methods'] = available_dms
@@ -349,7 +934,7 @@ class WebsiteSale(WebsiteSale):
         partner_id = partner_id and int(partner_id)
         use_delivery_as_billing = str2bool(use_delivery_as_billing or 'false')
         is_quote_order = quote_cart == 'quote'
-        order_sudo = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order() if is_quote_order else request.cart
+        order_sudo = request.website._with_quote_context().sale_get_quote_order(materialize=True) if is_quote_order else request.cart
 
         if redirection := self._check_cart(order_sudo):
             return redirection
@@ -394,7 +979,7 @@ class WebsiteSale(WebsiteSale):
     @route(['/shop/address/submit', '/shop/quote/address'], type='http', methods=['POST'], auth='public', website=True, sitemap=False)
     def shop_address_submit(self, partner_id=None, address_type='billing', use_delivery_as_billing=None, callback=None, **form_data):
         # order_sudo = request.cart
-        order_sudo = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order() if form_data and form_data.get('quote_cart') else request.cart
+        order_sudo = request.website._with_quote_context().sale_get_quote_order(materialize=True) if form_data and form_data.get('quote_cart') else request.cart
 
         if redirection := self._check_cart(order_sudo):
             return json.dumps({'redirectUrl': redirection.location})
@@ -467,12 +1052,12 @@ class WebsiteSale(WebsiteSale):
     @http.route(['/shop/quote/extra_info'], type='http', auth="public", website=True, sitemap=False)
     def quote_extra_info(self, **post):
         """Display the extra info page for quote cart - similar to /shop/extra_info for normal cart."""
-        order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+        order = request.website._with_quote_context().sale_get_quote_order(materialize=True)
         
         if not order or not order.order_line:
             return request.redirect('/shop/quote/cart')
         if order.state != 'draft':
-            request.session['quote_order_id'] = None
+            request.website._set_quote_session(quote_order_id=None)
             return request.redirect('/shop')
         
         # Check address is filled
@@ -480,7 +1065,11 @@ class WebsiteSale(WebsiteSale):
         open_editor = request.params.get('open_editor') == 'true'
         if not open_editor and redirection:
             return redirection
-        
+
+        etag = not open_editor and self._get_quote_cart_etag(order, 'extra_info')
+        if self._quote_cart_etag_matches(etag):
+            return self._quote_cart_not_modified(etag)
+
         values = {
             'website_sale_order': order,
             'post': post,
@@ -490,42 +1079,114 @@ class WebsiteSale(WebsiteSale):
             'is_quote_order': True,
         }
         
-        return request.render("ip_website_quote_cart.quote_extra_info", values)
+        return request.render("ip_website_quote_cart.quote_extra_info", values, headers=self._get_quote_cart_etag_headers(etag))
 
     @http.route(['/shop/quote/submit'], type='http', auth="public", website=True, sitemap=False)
+    @metrics.timed_route('quote_submite_order')
     def quote_submite_order(self, **post):
-        order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+        order = request.website._with_quote_context().sale_get_quote_order(materialize=True)
         if order and not order.order_line:
             return request.redirect('/shop/quote/cart')
         if not order or order.state != 'draft':
-            request.session['quote_order_id'] = None
+            request.website._set_quote_session(quote_order_id=None)
             return request.redirect('/shop')
         redirection = self.quote_checkout_check_address(order)
         if redirection:
             return redirection
-        order._compute_fiscal_position_id()
-        # order.order_line._compute_tax_id()
-        request.session['last_order_quote_id'] = request.session.get('quote_order_id')
-        request.session['quote_order_id'] = None
-        request.session['quote_cart_quantity'] = 0
+        request.website._set_quote_session(
+            last_order_quote_id=request.website._get_quote_session('quote_order_id'),
+            quote_order_id=None,
+            quote_cart_quantity=None,
+        )
         order.is_quote_req_submit = True
+        order._bump_quote_cart_revision()
+        # Taxes, mails, PDF and hooks are run by the quote request jobs, after the redirection.
+        request.env['sale.quote.job'].sudo()._enqueue(order, order._get_quote_request_job_types())
         return request.redirect("/shop/quote/submit/%s" % (order.id))
 
     @http.route(['/shop/quote/submit/<int:so_id>'], type='http', auth="public", website=True, sitemap=False)
     def quote_submite_send(self, so_id=None, **post):
-        if so_id and request.session.get('last_order_quote_id') and so_id == request.session.get('last_order_quote_id'):
+        if so_id and request.website._get_quote_session('last_order_quote_id') and so_id == request.website._get_quote_session('last_order_quote_id'):
             env = request.env['sale.order'].sudo()
             domain = [('id', '=', so_id)]
             order = env.search(domain, limit=1)
         else:
-            order = request.website.with_context(request.website.update_quote_context()).sale_get_quote_order()
+            order = request.website._with_quote_context().sale_get_quote_order()
+        request.website._set_quote_session(quote_cart_quantity=0)
+        etag = self._get_quote_cart_etag(order, 'submit')
+        if self._quote_cart_etag_matches(etag):
+            return self._quote_cart_not_modified(etag)
+
         values = {
             'website_sale_order': order,
             'order': order,
             'order_reference': order.name,
         }
-        request.session['quote_cart_quantity'] = 0
-        return request.render("ip_website_quote_cart.qt_thanks_page", values)
+        return request.render("ip_website_quote_cart.qt_thanks_page", values, headers=self._get_quote_cart_etag_headers(etag))
+
+    def _get_quote_cart_etag(self, order, page):
+        """Return a strong ETag for a quote cart page of the current visitor.
+
+        The ETag changes with the revision of the quote order and with everything else the page
+        depends on: the pricelist, products and suggested accessories, the session (header
+        badges, CSRF token), the user, the language, the website and the installed views. Internal
+        users (who may edit the page) and orders with a pending
+        warning get no ETag.
+
+        :param sale.order order: The quote order displayed by the page.
+        :param str page: The name of the page.
+        :return: The ETag, unquoted, or None if the page must not be cached.
+        :rtype: str
+        """
+        if not order or request.env.user._is_internal() or order._get_shop_warning(clear=False):
+            return None
+        registry = request.env.registry
+        key = (
+            page,
+            order._get_quote_cart_revision_key(),
+            order._get_quote_cart_catalog_key(),
+            request.session.sid,
+            request.env.uid,
+            request.env.lang,
+            request.website.id,
+            request.website._get_quote_session('quote_cart_quantity'),
+            request.session.get('website_sale_cart_quantity'),
+            registry.registry_sequence,
+            registry.cache_sequences.get('templates'),
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()[:40]
+
+    def _get_quote_cart_etag_headers(self, etag):
+        """Return the caching headers of a quote cart page rendered with the given ETag."""
+        if not etag:
+            return None
+        return {'ETag': '"%s"' % etag, 'Cache-Control': 'private, no-cache'}
+
+    def _quote_cart_etag_matches(self, etag):
+        """Return whether the client's cached copy of a quote cart page is still current."""
+        if not etag:
+            return False
+        matches = request.httprequest.if_none_match.contains(etag)
+        metrics.cache_lookup('etag', matches)
+        return matches
+
+    def _quote_cart_not_modified(self, etag):
+        """Return the empty 304 response of a quote cart page whose ETag matched."""
+        return request.make_response('', headers=list(self._get_quote_cart_etag_headers(etag).items()), status=304)
+
+
+class QuoteCartMetrics(http.Controller):
+
+    @http.route(['/quote_cart/metrics'], type='http', auth='none', methods=['GET'], sitemap=False)
+    def quote_cart_metrics(self):
+        """Export the quote cart metrics in the Prometheus text format, to the clients holding
+        the metrics token, see `ip_website_quote_cart.metrics`."""
+        if not metrics.ENABLED or not metrics.check_token(request.httprequest.headers.get('Authorization')):
+            raise NotFound()
+        return request.make_response(metrics.export(), headers=[
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+            ('Cache-Control', 'no-store'),
+        ])
 
 
 class CustomerPortal(CustomerPortal):
@@ -538,12 +1199,8 @@ class CustomerPortal(CustomerPortal):
         if 'requested_quotation_count' in counters:
             try:
                 SaleOrder.check_access('read')
-                values['requested_quotation_count'] = SaleOrder.search_count([
-                    # ('message_partner_ids', 'child_of', [partner.commercial_partner_id.id]),
-                    ('partner_id', '=', partner.id),
-                    ('state', 'in', ['draft', 'sent', 'cancel']),
-                    ('is_quote_req_submit', '=', True)
-                ])
+                # Maintained by sale.order, see `SaleOrder._get_quote_request_counter_keys`.
+                values['requested_quotation_count'] = request.env['sale.quote.request.counter']._get_requested_quotation_count(partner)
             except AccessError:
                 values['requested_quotation_count'] = 0
 
@@ -554,7 +1211,7 @@ class CustomerPortal(CustomerPortal):
     #
 
     @http.route(['/my/requested_quotes', '/my/requested_quotes/page/<int:page>'], type='http', auth="user", website=True)
-    def portal_my_requested_quotes(self, page=1, date_begin=None, date_end=None, sortby=None, **kw):
+    def portal_my_requested_quotes(self, page=1, date_begin=None, date_end=None, sortby=None, after=None, before=None, **kw):
         values = self._prepare_portal_layout_values()
         partner = request.env.user.partner_id
         SaleOrder = request.env['sale.order'].sudo()
@@ -580,19 +1237,16 @@ class CustomerPortal(CustomerPortal):
         if date_begin and date_end:
             domain += [('create_date', '>', date_begin), ('create_date', '<=', date_end)]
 
-        # count for pager
-        quotation_count = SaleOrder.search_count(domain)
-        # make pager
-        pager = portal_pager(
-            url="/my/requested_quotes",
-            url_args={'date_begin': date_begin, 'date_end': date_end, 'sortby': sortby},
-            total=quotation_count,
-            page=page,
-            step=self._items_per_page
+        url_args = {'date_begin': date_begin, 'date_end': date_end, 'sortby': sortby}
+        quotations, pager = _portal_keyset_search(
+            SaleOrder, domain, "/my/requested_quotes", page, self._items_per_page,
+            after=after, before=before, url_args=url_args, keyset=sortby == 'date',
         )
-        # search the count to display, according to the pager data
-        quotations = SaleOrder.search(domain, order=sort_order, limit=self._items_per_page, offset=pager['offset'])
-        request.session['my_quotations_history'] = quotations.ids[:100]
+        if quotations is None:
+            quotations = SaleOrder.search(domain, order=sort_order, limit=self._items_per_page, offset=pager['offset'])
+            quotations.fetch(PORTAL_ORDER_LIST_FIELDS)
+        if request.session.get('my_quotations_history') != quotations.ids[:100]:
+            request.session['my_quotations_history'] = quotations.ids[:100]
 
         values.update({
             'date': date_begin,
@@ -607,7 +1261,7 @@ class CustomerPortal(CustomerPortal):
 
 
 class CustomerPortalSale(CustomerPortalSale):
-    def _prepare_sale_portal_rendering_values(self, page=1, date_begin=None, date_end=None, sortby=None, quotation_page=False, **kwargs):
+    def _prepare_sale_portal_rendering_values(self, page=1, date_begin=None, date_end=None, sortby=None, quotation_page=False, after=None, before=None, **kwargs):
         SaleOrder = request.env['sale.order']
 
         if not sortby:
@@ -631,14 +1285,14 @@ class CustomerPortalSale(CustomerPortalSale):
         if date_begin and date_end:
             domain += [('create_date', '>', date_begin), ('create_date', '<=', date_end)]
 
-        pager_values = portal_pager(
-            url=url,
-            total=SaleOrder.search_count(domain),
-            page=page,
-            step=self._items_per_page,
-            url_args={'date_begin': date_begin, 'date_end': date_end, 'sortby': sortby},
+        orders, pager_values = _portal_keyset_search(
+            SaleOrder, domain, url, page, self._items_per_page,
+            after=after, before=before, url_args={'date_begin': date_begin, 'date_end': date_end, 'sortby': sortby},
+            keyset=sort_order == 'date_order desc',
         )
-        orders = SaleOrder.search(domain, order=sort_order, limit=self._items_per_page, offset=pager_values['offset'])
+        if orders is None:
+            orders = SaleOrder.search(domain, order=sort_order, limit=self._items_per_page, offset=pager_values['offset'])
+            orders.fetch(PORTAL_ORDER_LIST_FIELDS)
         values.update({
             'date': date_begin,
             'quotations': orders.sudo() if quotation_page else SaleOrder,
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import io
+import itertools
+import re
+from collections import defaultdict
+
+from odoo import _, _lt, http
+from odoo.exceptions import UserError
+from odoo.http import request
+from odoo.tools import float_round
+
+from .main import WebsiteSale
+
+# Rows of an imported list resolved to products in one query.
+QUOTE_IMPORT_CHUNK_SIZE = 500
+# Maximum number of rows of an imported list, the next ones are not imported and the report says so.
+QUOTE_IMPORT_MAX_ROWS = 5000
+# Maximum number of rejected rows listed in the import report, the others are only counted.
+QUOTE_IMPORT_MAX_REPORTED_ROWS = 200
+
+# Statuses of the rows of an import report.
+QUOTE_IMPORT_STATUSES = {
+    'not_found': _lt("Unknown reference"),
+    'ambiguous': _lt("Reference shared by several products"),
+    'not_allowed': _lt("Not available for quotation"),
+    'invalid_quantity': _lt("Invalid quantity"),
+}
+
+_PASTED_ROW_RE = re.compile(r'^\s*(?P<code>[^\s,;]+)(?:[\s,;]+(?P<quantity>[^\s,;]+))?')
+
+
+def _parse_quantity(value):
+    """Return the quantity of an imported row, 1 if empty, or None if invalid."""
+    if value is None or str(value).strip() == '':
+        return 1.0
+    try:
+        quantity = float(str(value).strip().replace(',', '.'))
+    except ValueError:
+        return None
+    return quantity if quantity > 0 else None
+
+
+def _iter_csv_rows(stream):
+    """Yield the (code, quantity) rows of a CSV file, read as a stream."""
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    sample = text_stream.read(4096)
+    text_stream.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    for row in csv.reader(text_stream, dialect):
+        if row:
+            yield row[0], row[1] if len(row) > 1 else None
+
+
+def _iter_xlsx_rows(stream):
+    """Yield the (code, quantity) rows of the first sheet of an XLSX file, read as a stream."""
+    try:
+        import openpyxl  # noqa: PLC0415
+    except ImportError:
+        raise UserError(_("Importing XLSX files requires the openpyxl library, please upload a CSV file."))
+    workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(max_col=2, values_only=True):
+            if row and row[0] is not None:
+                yield row[0], row[1] if len(row) > 1 else None
+    finally:
+        workbook.close()
+
+
+def _iter_pasted_rows(text):
+    """Yield the (code, quantity) rows of a pasted list, one product per line, the reference
+    and the quantity separated by spaces, tabs, commas or semicolons."""
+    for line in io.StringIO(text):
+        match = _PASTED_ROW_RE.match(line)
+        if match:
+            yield match['code'], match['quantity']
+
+
+def _iter_import_rows(upload=None, text=None):
+    """Yield the (row number, code, quantity) rows of an uploaded file or a pasted list, skipping
+    a header row.
+
+    :param werkzeug.datastructures.FileStorage upload: A CSV or XLSX file.
+    :param str text: A pasted list.
+    """
+    if upload and upload.filename:
+        if upload.filename.lower().endswith('.xlsx'):
+            rows = _iter_xlsx_rows(upload.stream)
+        else:
+            rows = _iter_csv_rows(upload.stream)
+    else:
+        rows = _iter_pasted_rows(text or '')
+    for row_number, (code, quantity) in enumerate(rows, start=1):
+        code = str(code).strip()
+        if isinstance(quantity, float) and quantity.is_integer():
+            quantity = int(quantity)
+        if not code or (row_number == 1 and _parse_quantity(quantity) is None):
+            continue  # Empty row, or header row
+        yield row_number, code, quantity
+
+
+class WebsiteSale(WebsiteSale):
+
+    @http.route(['/shop/quote/cart/import'], type='http', auth="public", methods=['POST'], website=True, sitemap=False)
+    def quote_cart_import(self, import_file=None, import_text=None, **post):
+        """Add the products of an uploaded CSV or XLSX file, or of a pasted list, to the quote
+        cart, and display the quote cart with the report of the import.
+
+        Each row holds a product reference (internal reference or barcode) and an optional
+        quantity. The rows are resolved to products by chunks of `QUOTE_IMPORT_CHUNK_SIZE`, and
+        all the products are added to the quote cart in one batch.
+        """
+        website = request.website._with_quote_context()
+        try:
+            report = self._quote_cart_import_rows(website, _iter_import_rows(import_file, import_text))
+        except (UserError, UnicodeDecodeError, csv.Error, ValueError) as error:
+            report = {'error': str(error) if isinstance(error, UserError) else _("The file could not be read.")}
+
+        response = self.quote_cart()
+        response.qcontext['quote_import_report'] = report
+        return response
+
+    def _quote_cart_import_rows(self, website, rows):
+        """Resolve the imported rows to products and add them to the quote cart.
+
+        :param website website: The current website, with the quote context.
+        :param rows: The (row number, code, quantity) rows to import.
+        :return: The report of the import: the number of added rows and products, the rejected
+                 rows with their status, see `QUOTE_IMPORT_STATUSES`, whether rows after
+                 `QUOTE_IMPORT_MAX_ROWS` were left out, and the warnings of the quantity checks,
+                 e.g. for products out of stock.
+        :rtype: dict
+        """
+        ProductSudo = request.env['product.product'].sudo()
+        quantities = {}
+        added_rows = 0
+        rejected_rows = []
+        rejected_count = 0
+        rows = iter(rows)
+        imported_rows = itertools.islice(rows, QUOTE_IMPORT_MAX_ROWS)
+        while chunk := list(itertools.islice(imported_rows, QUOTE_IMPORT_CHUNK_SIZE)):
+            codes = {code for _row_number, code, _quantity in chunk}
+            product_ids_per_code = defaultdict(set)
+            product_ids_per_barcode = defaultdict(set)
+            for product in ProductSudo.search_fetch(
+                ['|', ('default_code', 'in', list(codes)), ('barcode', 'in', list(codes))],
+                ['default_code', 'barcode'],
+            ):
+                if product.default_code in codes:
+                    product_ids_per_code[product.default_code].add(product.id)
+                if product.barcode in codes:
+                    product_ids_per_barcode[product.barcode].add(product.id)
+            # An internal reference wins over a barcode. A reference shared by several products
+            # is ambiguous, it is not resolved to any of them.
+            product_id_per_code = {}
+            ambiguous_codes = set()
+            for code in codes:
+                product_ids = product_ids_per_code.get(code) or product_ids_per_barcode.get(code)
+                if product_ids and len(product_ids) > 1:
+                    ambiguous_codes.add(code)
+                elif product_ids:
+                    product_id_per_code[code] = next(iter(product_ids))
+            allowed_product_ids = set(ProductSudo.browse(set(product_id_per_code.values())).filtered(
+                lambda product: product._is_add_to_cart_allowed() and product.type != 'combo'
+            ).ids)
+
+            for row_number, code, quantity in chunk:
+                parsed_quantity = _parse_quantity(quantity)
+                product_id = product_id_per_code.get(code)
+                if code in ambiguous_codes:
+                    status = 'ambiguous'
+                elif not product_id:
+                    status = 'not_found'
+                elif product_id not in allowed_product_ids:
+                    status = 'not_allowed'
+                elif parsed_quantity is None:
+                    status = 'invalid_quantity'
+                else:
+                    quantities[product_id] = quantities.get(product_id, 0) + parsed_quantity
+                    added_rows += 1
+                    continue
+                rejected_count += 1
+                if len(rejected_rows) < QUOTE_IMPORT_MAX_REPORTED_ROWS:
+                    rejected_rows.append({
+                        'row': row_number,
+                        'code': code,
+                        'quantity': quantity,
+                        'status': status,
+                        'status_label': str(QUOTE_IMPORT_STATUSES[status]),
+                    })
+
+        warnings = []
+        if quantities:
+            warnings = self._quote_cart_add_quantities(website, {
+                product_id: float_round(quantity, precision_digits=3)
+                for product_id, quantity in quantities.items()
+            })
+
+        return {
+            'warnings': warnings,
+            'added_rows': added_rows,
+            'product_count': len(quantities),
+            'rejected_rows': rejected_rows,
+            'rejected_count': rejected_count,
+            # Any row left after the imported ones was not imported.
+            'truncated': next(rows, None) is not None,
+            'max_rows': QUOTE_IMPORT_MAX_ROWS,
+        }
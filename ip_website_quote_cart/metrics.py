@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Opt-in instrumentation of the quote cart hot paths.
+
+The instrumentation is enabled from the Odoo configuration file::
+
+    [options]
+    quote_cart_metrics = True
+    quote_cart_metrics_token = <a long random secret>
+    quote_cart_server_timing = True
+
+When `quote_cart_metrics` is disabled (the default), `timed_route` and `timed` return the
+decorated function unchanged and `phase` returns a shared no-op context manager, so that the
+instrumented code runs as if it was not instrumented.
+
+When enabled, the wall time and the SQL query count of each instrumented route and of each
+phase of the route (order lookup, line update, delivery rating, accessories, QWeb renders) are
+recorded in histograms, exported in the Prometheus text format by the `/quote_cart/metrics`
+route to the clients authenticated with the `quote_cart_metrics_token` bearer token, e.g. with
+the `authorization` option of a Prometheus scrape config. The route is disabled when no token is
+configured. With `quote_cart_server_timing`, the phases of each request are
+also returned in a `Server-Timing` response header.
+
+The metrics are kept in the memory of the process. With several HTTP workers (prefork mode), each
+worker has its own metrics, and a scrape only returns the metrics of the worker serving it: the
+samples are labelled with the `pid` of the worker, so that each series stays monotonic, but a
+scrape does not cover the other workers. Aggregate the series of all the workers by summing over
+the `pid` label, and scrape often enough to reach each of them, or enable the metrics on a server
+running with a single worker (`workers = 0`).
+"""
+
+import contextlib
+import functools
+import hmac
+import os
+import threading
+import time
+from collections import defaultdict
+
+from odoo.http import request
+from odoo.tools import config, str2bool
+
+ENABLED = str2bool(str(config.get('quote_cart_metrics') or False), False)
+SERVER_TIMING = ENABLED and str2bool(str(config.get('quote_cart_server_timing') or False), False)
+TOKEN = ENABLED and config.get('quote_cart_metrics_token') or None
+
+# Upper bounds of the histogram buckets, in seconds and in queries.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# ormcached methods of the module whose hit rates are exported, see `_ormcache_counters`.
+ORMCACHED_METHODS = (
+    '_get_quote_cart_accessory_ids',
+    '_get_quote_configurator_decision',
+)
+
+_NULL_PHASE = contextlib.nullcontext()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class Histogram:
+    """A cumulative histogram in the Prometheus sense, for a fixed set of buckets."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+# {(metric, labels): Histogram}, labels being a tuple of (name, value) pairs.
+_histograms = {}
+# {(name, outcome): count} of the cache lookups, outcome being 'hit' or 'miss'.
+_cache_lookups = defaultdict(int)
+
+
+def _observe(metric, labels, value, buckets):
+    key = (metric, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+
+def _query_count():
+    try:
+        return request.env.cr.sql_log_count
+    except (AttributeError, RuntimeError):  # no request or no cursor
+        return 0
+
+
+def _record(route, phase, duration, queries):
+    labels = (('route', route), ('phase', phase))
+    _observe('quote_cart_duration_seconds', labels, duration, DURATION_BUCKETS)
+    _observe('quote_cart_queries', labels, queries, QUERY_BUCKETS)
+
+
+@contextlib.contextmanager
+def _phase(name):
+    active = getattr(_local, 'phases', None)
+    if active is None or name in active:
+        # Outside of an instrumented route, or nested in the same phase: already accounted.
+        yield
+        return
+    active.add(name)
+    queries = _query_count()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        active.discard(name)
+        _record(_local.route, name, duration, _query_count() - queries)
+        _local.timings.append((name, duration))
+
+
+def phase(name):
+    """Return a context manager recording the time spent in the given phase of the current
+    instrumented route. The phase name must be a valid Server-Timing token."""
+    if not ENABLED:
+        return _NULL_PHASE
+    return _phase(name)
+
+
+def timed(name):
+    """Decorate a method to record its calls as the given phase of the current route."""
+    def decorator(method):
+        if not ENABLED:
+            return method
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with _phase(name):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_route(name):
+    """Decorate a controller method to record its calls as the given route. Must be applied
+    below `http.route`."""
+    def decorator(endpoint):
+        if not ENABLED:
+            return endpoint
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            _local.route, _local.phases, _local.timings = name, set(), []
+            queries = _query_count()
+            start = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                _record(name, 'total', duration, _query_count() - queries)
+                timings = _local.timings
+                _local.phases = None
+                if SERVER_TIMING and request:
+                    timings.append(('total', duration))
+                    request.future_response.headers.add('Server-Timing', ', '.join(
+                        '%s;dur=%.1f' % (phase_name, phase_duration * 1000)
+                        for phase_name, phase_duration in timings
+                    ))
+        return wrapper
+    return decorator
+
+
+def cache_lookup(name, hit):
+    """Count a lookup of the given application-level cache, e.g. a conditional GET."""
+    if ENABLED:
+        with _lock:
+            _cache_lookups[name, 'hit' if hit else 'miss'] += 1
+
+
+def _ormcache_counters():
+    """Return the hit and miss counts of the ormcached methods of the module.
+
+    :return: {method name: (hits, misses)}
+    """
+    from odoo.tools import cache  # noqa: PLC0415
+    counters = getattr(cache, '_COUNTERS', None) or getattr(cache, 'STAT', {})
+    result = defaultdict(lambda: [0, 0])
+    for key, counter in list(counters.items()):
+        # The key ends with the cached function, e.g. (db name, model name, function).
+        method_name = getattr(key[-1], '__name__', None)
+        if method_name in ORMCACHED_METHODS:
+            result[method_name][0] += counter.hit
+            result[method_name][1] += counter.miss
+    return result
+
+
+def _format_labels(labels, **extra):
+    pairs = [('pid', os.getpid())] + list(labels) + list(extra.items())
+    return '{%s}' % ','.join('%s="%s"' % (name, value) for name, value in pairs)
+
+
+def check_token(authorization):
+    """Return whether the `Authorization` header of a request holds the metrics token."""
+    if not TOKEN or not authorization:
+        return False
+    scheme, _sep, token = authorization.partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(token.strip(), str(TOKEN))
+
+
+def export():
+    """Return all the metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        histograms = sorted(_histograms.items())
+        cache_lookups = sorted(_cache_lookups.items())
+    for metric, help_text in (
+        ('quote_cart_duration_seconds', "Wall time of the quote cart routes and of their phases."),
+        ('quote_cart_queries', "SQL queries of the quote cart routes and of their phases."),
+    ):
+        lines += ['# HELP %s %s' % (metric, help_text), '# TYPE %s histogram' % metric]
+        for (name, labels), histogram in histograms:
+            if name != metric:
+                continue
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append('%s_bucket%s %s' % (metric, _format_labels(labels, le=bound), count))
+            lines.append('%s_bucket%s %s' % (metric, _format_labels(labels, le='+Inf'), histogram.count))
+            lines.append('%s_sum%s %s' % (metric, _format_labels(labels), histogram.sum))
+            lines.append('%s_count%s %s' % (metric, _format_labels(labels), histogram.count))
+
+    lines += [
+        '# HELP quote_cart_cache_lookups_total Lookups of the quote cart caches.',
+        '# TYPE quote_cart_cache_lookups_total counter',
+    ]
+    for (name, outcome), count in cache_lookups:
+        lines.append('quote_cart_cache_lookups_total%s %s' % (_format_labels((), cache=name, outcome=outcome), count))
+    for method_name, (hits, misses) in sorted(_ormcache_counters().items()):
+        lines.append('quote_cart_cache_lookups_total%s %s' % (_format_labels((), cache=method_name, outcome='hit'), hits))
+        lines.append('quote_cart_cache_lookups_total%s %s' % (_format_labels((), cache=method_name, outcome='miss'), misses))
+    return '\n'.join(lines) + '\n'
@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from . import product_product
+from . import product_template
+from . import product_template_attribute_line
+from . import product_template_attribute_exclusion
 from . import res_partner
 from . import sale_order
+from . import sale_quote_job
+from . import sale_quote_request_counter
 from . import website
 from . import res_config_settings
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models, tools
+
+# Fields whose change can alter the accessories suggested for the variant, or for the products it
+# is an accessory of, see `ProductProduct._get_quote_cart_accessory_ids`.
+ACCESSORY_INDEX_PRODUCT_FIELDS = {'active', 'product_template_attribute_value_ids'}
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'active' in vals:
+            # The number of variants decides whether a tile opens the configurator, or whether the
+            # template is shown as an optional product, see
+            # `product.template._get_quote_configurator_decision`.
+            self.product_tmpl_id._bump_quote_configurator_version()
+        if ACCESSORY_INDEX_PRODUCT_FIELDS.intersection(vals):
+            self.product_tmpl_id._bump_quote_accessory_version()
+        return res
+
+    @api.model
+    @tools.ormcache(
+        'product_id', 'website_id',
+        'self.sudo().browse(product_id).product_tmpl_id.quote_accessory_version',
+    )
+    def _get_quote_cart_accessory_ids(self, product_id, website_id):
+        """Return the accessories to suggest for a product in a quote cart.
+
+        The accessories are filtered as in `sale.order._cart_accessories`: published on the
+        website and possible with the variant of the product. The index is cached per website and
+        per `quote_accessory_version` of the template, which is bumped when the template, its
+        variants, its accessories or their publication change, so that no cache has to be cleared.
+        Prices are left out of the index since they depend on the validity dates of the pricelist
+        rules; `sale.order._cart_accessories` filters them on the accessories of the whole cart.
+
+        :param int product_id: The product of the cart line.
+        :param int website_id: The website of the quote cart.
+        :return: The ids of the accessories.
+        :rtype: tuple
+        """
+        product = self.sudo().with_context(website_id=website_id).browse(product_id)
+        accessories = product.product_tmpl_id._get_website_accessory_product().filtered('is_published')
+        combination = product.product_template_attribute_value_ids
+        return tuple(accessories.filtered(
+            lambda accessory: accessory._is_variant_possible(parent_combination=combination)
+        ).ids)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, tools
+from odoo.tools import SQL
+
+# Fields whose change can alter whether adding a product, or a product it is an optional product
+# of, to the quote cart opens the product configurator, see
+# `ProductTemplate._get_quote_configurator_decision`.
+CONFIGURATOR_DECISION_TEMPLATE_FIELDS = {
+    'optional_product_ids', 'type', 'active', 'sale_ok', 'is_published', 'website_published',
+    'website_id', 'attribute_line_ids', 'company_id',
+}
+
+# Fields whose change can alter the accessories suggested for the template, or for the templates
+# it is an accessory of, in quote carts, see `ProductProduct._get_quote_cart_accessory_ids`.
+ACCESSORY_INDEX_TEMPLATE_FIELDS = {
+    'accessory_product_ids', 'active', 'sale_ok', 'is_published', 'website_published',
+    'website_id', 'attribute_line_ids', 'company_id',
+}
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    quote_configurator_version = fields.Integer(
+        string="Quote Configurator Version", default=0, copy=False, readonly=True,
+        help="Incremented on every change that can alter the decision to open the product"
+             " configurator, used to key its cache.",
+    )
+    quote_accessory_version = fields.Integer(
+        string="Quote Accessory Version", default=0, copy=False, readonly=True,
+        help="Incremented on every change that can alter the accessories suggested for the"
+             " variants of the template in quote carts, used to key their index.",
+    )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CONFIGURATOR_DECISION_TEMPLATE_FIELDS.intersection(vals):
+            self._bump_quote_configurator_version()
+        if ACCESSORY_INDEX_TEMPLATE_FIELDS.intersection(vals):
+            self._bump_quote_accessory_version()
+        return res
+
+    def _bump_quote_configurator_version(self):
+        """Increment the configurator decision version of the templates in self, and of the
+        templates showing them as optional products."""
+        optional_of = self.sudo().with_context(active_test=False).search([
+            ('optional_product_ids', 'in', self.ids),
+        ])
+        (self | optional_of)._increment_quote_version('quote_configurator_version')
+
+    def _bump_quote_accessory_version(self):
+        """Increment the accessory index version of the templates in self, and of the templates
+        suggesting their variants as accessories."""
+        accessory_of = self.sudo().with_context(active_test=False).search([
+            ('accessory_product_ids.product_tmpl_id', 'in', self.ids),
+        ])
+        (self | accessory_of)._increment_quote_version('quote_accessory_version')
+
+    def _bump_quote_versions(self):
+        """Increment both the configurator decision and the accessory index versions."""
+        self._bump_quote_configurator_version()
+        self._bump_quote_accessory_version()
+
+    def _increment_quote_version(self, fname):
+        """Increment the given version field of the templates in self, in a single query."""
+        if not self:
+            return
+        self.flush_recordset([fname])
+        self.env.cr.execute(SQL(
+            "UPDATE product_template SET %(fname)s = %(fname)s + 1 WHERE id IN %(ids)s",
+            fname=SQL.identifier(fname),
+            ids=tuple(self.ids),
+        ))
+        self.invalidate_recordset([fname])
+
+    @api.model
+    @tools.ormcache(
+        'template_id', 'website_id', 'is_product_configured',
+        'self.sudo().browse(template_id).quote_configurator_version',
+        "self.env['website'].browse(website_id).add_to_cart_action",
+    )
+    def _get_quote_configurator_decision(self, template_id, website_id, is_product_configured):
+        """Return whether adding the product to the quote cart opens the product configurator,
+        as `/website_sale/should_show_product_configurator` decides it, so that the decision can
+        be embedded in the product page and tiles instead of being asked on each click.
+
+        The decision is cached per website and per `quote_configurator_version` of the template,
+        which is bumped when the template, its variants, its optional products or its attribute
+        exclusions change, so that no cache has to be cleared.
+
+        :param int template_id: The product template.
+        :param int website_id: The current website.
+        :param bool is_product_configured: Whether the variant is already chosen, i.e. on the
+                                           product page rather than on a tile.
+        :return: 'dialog' to open the configurator, 'direct' to add the product directly, or
+                 'rpc' when the decision depends on the chosen combination.
+        :rtype: str
+        """
+        website = self.env['website'].browse(website_id)
+        template = self.sudo().with_context(website_id=website_id).browse(template_id)
+        if website.add_to_cart_action == 'force_dialog':
+            return 'dialog'
+        if template.type == 'combo':
+            return 'rpc'
+        if not (is_product_configured or template.get_single_product_variant().get('product_id')):
+            return 'dialog'
+        optional_templates = template.optional_product_ids.filtered_domain(website.website_domain()).filtered(
+            lambda optional_template: optional_template.is_published and optional_template._is_add_to_cart_possible()
+        )
+        if not optional_templates:
+            return 'direct'
+        excluding_templates = template.attribute_line_ids.product_template_value_ids.exclude_for.product_tmpl_id
+        if optional_templates & excluding_templates:
+            # Some optional products are excluded by some combinations of the product.
+            return 'rpc'
+        return 'dialog'
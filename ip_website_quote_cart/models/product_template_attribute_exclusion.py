@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+
+class ProductTemplateAttributeExclusion(models.Model):
+    _inherit = 'product.template.attribute.exclusion'
+
+    # Exclusions decide which optional products are shown with a combination, see
+    # `ProductTemplate._get_quote_configurator_decision`, and which accessories are possible with
+    # a variant, see `ProductProduct._get_quote_cart_accessory_ids`.
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        exclusions = super().create(vals_list)
+        exclusions._get_quote_templates()._bump_quote_versions()
+        return exclusions
+
+    def write(self, vals):
+        templates = self._get_quote_templates()
+        res = super().write(vals)
+        (templates | self._get_quote_templates())._bump_quote_versions()
+        return res
+
+    def unlink(self):
+        templates = self._get_quote_templates()
+        res = super().unlink()
+        templates._bump_quote_versions()
+        return res
+
+    def _get_quote_templates(self):
+        """Return the templates whose combinations the exclusions restrict."""
+        return self.product_template_attribute_value_id.product_tmpl_id | self.product_tmpl_id
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+
+class ProductTemplateAttributeLine(models.Model):
+    _inherit = 'product.template.attribute.line'
+
+    # Attribute lines decide the variants of a template, see
+    # `ProductTemplate._get_quote_configurator_decision` and
+    # `ProductProduct._get_quote_cart_accessory_ids`. They are often edited without writing the
+    # template itself.
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines.product_tmpl_id._bump_quote_versions()
+        return lines
+
+    def write(self, vals):
+        templates = self.product_tmpl_id
+        res = super().write(vals)
+        (templates | self.product_tmpl_id)._bump_quote_versions()
+        return res
+
+    def unlink(self):
+        templates = self.product_tmpl_id
+        res = super().unlink()
+        templates._bump_quote_versions()
+        return res
@@ -12,3 +12,52 @@ class ResConfigSettings(models.TransientModel):
         related="website_id.website_request_quote",
         readonly=False,
     )
+    quote_cart_session_mode = fields.Boolean(
+        related="website_id.quote_cart_session_mode",
+        readonly=False,
+    )
+    quote_cart_cacheable_header = fields.Boolean(
+        related="website_id.quote_cart_cacheable_header",
+        readonly=False,
+    )
+    quote_price_deferred = fields.Boolean(
+        related="website_id.quote_price_deferred",
+        readonly=False,
+    )
+
+    quote_request_notifications = fields.Boolean(
+        string="Quote Request Emails",
+        config_parameter='ip_website_quote_cart.quote_request_notifications',
+        help="Email a confirmation to the customer and notify the salesperson when a quote request "
+             "is submitted.",
+    )
+    quote_request_pdf = fields.Boolean(
+        string="Quote Request PDF",
+        config_parameter='ip_website_quote_cart.quote_request_pdf',
+        help="Attach the quotation PDF to the quote request when it is submitted.",
+    )
+
+    quote_cart_retention_days = fields.Integer(
+        string="Quote Cart Retention (days)",
+        config_parameter='ip_website_quote_cart.retention_days',
+        default=30,
+        help="Quote carts of customers that were not submitted nor updated for this number of days, "
+             "nor sent a recovery email, are reclaimed. Set 0 to keep them.",
+    )
+    quote_cart_public_retention_days = fields.Integer(
+        string="Anonymous Quote Cart Retention (days)",
+        config_parameter='ip_website_quote_cart.public_retention_days',
+        default=2,
+        help="Quote carts of public visitors, or without any line, that were not updated for this "
+             "number of days are deleted. Set 0 to keep them.",
+    )
+    quote_cart_retention_action = fields.Selection(
+        selection=[
+            ('unlink', "Delete"),
+            ('cancel', "Cancel"),
+        ],
+        string="Stale Quote Carts",
+        config_parameter='ip_website_quote_cart.retention_action',
+        default='cancel',
+        help="Cancel the stale quote carts of customers to keep a trace of them, or delete them.",
+    )
@@ -9,20 +9,19 @@ class ResPartner(models.Model):
 
     last_website_qo_id = fields.Many2one('sale.order', compute='_compute_last_website_qo_id', string='Last Online Quotes')
 
+    # Index of the address books of commercial entities, so that a page of the addresses of a
+    # customer is found without scanning all of them, see `WebsiteSale._get_quote_checkout_addresses`.
+    _commercial_partner_type_idx = models.Index("(commercial_partner_id, type, id DESC) WHERE active IS TRUE")
+
     def _compute_last_website_qo_id(self):
         SaleOrder = self.env['sale.order']
         for partner in self:
             is_public = partner.is_public
             website = ir_http.get_request_website()
             if website and not is_public:
-                partner.last_website_qo_id = SaleOrder.search([
-                    ('partner_id', '=', partner.id),
-                    ('pricelist_id', '=', partner.property_product_pricelist.id),
-                    ('website_id', '=', website.id),
-                    ('state', '=', 'draft'),
-                    ('is_quote', '=', True),
-                    ('is_quote_req_submit', '=', False)
-                ], order='write_date desc', limit=1)
+                partner.last_website_qo_id = SaleOrder.browse(SaleOrder._get_website_open_order_id(
+                    partner.id, partner.property_product_pricelist.id, website.id, True,
+                )).exists()
             else:
                 partner.last_website_qo_id = SaleOrder  # Not in a website context or public User
 
@@ -32,12 +31,8 @@ class ResPartner(models.Model):
             is_public = partner.is_public
             website = ir_http.get_request_website()
             if website and not is_public:
-                partner.last_website_so_id = SaleOrder.search([
-                    ('partner_id', '=', partner.id),
-                    ('pricelist_id', '=', partner.property_product_pricelist.id),
-                    ('website_id', '=', website.id),
-                    ('state', '=', 'draft'),
-                    ('is_quote', '=', False),
-                ], order='write_date desc', limit=1)
+                partner.last_website_so_id = SaleOrder.browse(SaleOrder._get_website_open_order_id(
+                    partner.id, partner.property_product_pricelist.id, website.id, False,
+                )).exists()
             else:
                 partner.last_website_so_id = SaleOrder  # Not in a website context or public User
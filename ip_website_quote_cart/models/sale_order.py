@@ -1,8 +1,32 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, _
+import hashlib
+import logging
+import random
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from odoo import api, models, fields, _
+from odoo.fields import Domain
 from odoo.http import request
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
+
+from .. import metrics
+from .sale_quote_job import QUOTE_DOCUMENT_JOB_TYPES, QUOTE_JOB_TYPES, QUOTE_NOTIFICATION_JOB_TYPES
+from .sale_quote_request_counter import COUNTED_QUOTE_REQUEST_STATES
+
+_logger = logging.getLogger(__name__)
+
+# Fields of the predicate used to find the open cart of a partner, flushed before the lookup, see
+# `SaleOrder._get_website_open_order_id`.
+OPEN_ORDER_LOOKUP_FIELDS = {
+    'partner_id', 'pricelist_id', 'website_id', 'state', 'is_quote', 'is_quote_req_submit',
+}
+
+# Fields deciding whether and for whom an order is counted in the requested quotations portal
+# counters, see `SaleOrder._get_quote_request_counter_keys`.
+QUOTE_REQUEST_COUNTER_FIELDS = {'partner_id', 'state', 'is_quote_req_submit'}
 
 
 class SaleOrder(models.Model):
@@ -10,7 +34,195 @@ class SaleOrder(models.Model):
 
     is_quote = fields.Boolean(string="Is Quote")
     is_quote_req_submit = fields.Boolean(string="Request Quote Submited")
+    quote_cart_revision = fields.Integer(
+        string="Quote Cart Revision", default=0, copy=False, readonly=True,
+        help="Incremented on every change of the quote cart, used to invalidate client-side caches.",
+    )
+    quote_price_deferred = fields.Boolean(
+        string="Prices Deferred", copy=False, readonly=True,
+        help="The prices, discounts and taxes of the lines of this quote request are not computed"
+             " yet, see `website.quote_price_deferred`.",
+    )
+    quote_cart_recovery_email_date = fields.Datetime(
+        string="Quote Cart Recovery Email Date", copy=False, readonly=True,
+        help="When the recovery email of the abandoned quote cart was sent. The quote cart is kept"
+             " by the retention cron during the retention delay that follows.",
+    )
+    quote_delivery_rate_key = fields.Char(
+        string="Quote Delivery Rate Key", copy=False, readonly=True,
+        help="Hash of the cart contents and delivery address the delivery rate was last computed for.",
+    )
+
+    # Partial indexes matching the lookups of `_get_website_open_order_id`, so that finding
+    # the open quote cart (or cart) of a partner does not scan the whole table.
+    _website_open_quote_idx = models.Index(
+        "(partner_id, website_id, pricelist_id, write_date DESC)"
+        " WHERE state = 'draft' AND is_quote IS TRUE AND is_quote_req_submit IS NOT TRUE"
+    )
+    _website_open_cart_idx = models.Index(
+        "(partner_id, website_id, pricelist_id, write_date DESC)"
+        " WHERE state = 'draft' AND is_quote IS NOT TRUE"
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        self.env['sale.quote.request.counter']._update_counters(
+            Counter(), orders._get_quote_request_counter_keys(),
+        )
+        return orders
+
+    def write(self, vals):
+        counter_keys = None
+        if QUOTE_REQUEST_COUNTER_FIELDS.intersection(vals):
+            counter_keys = self._get_quote_request_counter_keys()
+        res = super().write(vals)
+        if 'state' in vals:
+            self._bump_quote_cart_revision()
+        if counter_keys is not None:
+            self.env['sale.quote.request.counter']._update_counters(
+                counter_keys, self._get_quote_request_counter_keys(),
+            )
+        return res
+
+    def unlink(self):
+        counter_keys = self._get_quote_request_counter_keys()
+        res = super().unlink()
+        self.env['sale.quote.request.counter']._update_counters(counter_keys, Counter())
+        return res
+
+    def _get_quote_request_counter_keys(self):
+        """Return the requested quotations counters the orders in self count in.
+
+        :return: The number of orders per counter, keyed by `(partner_id, scope)`.
+        :rtype: Counter
+        """
+        keys = Counter()
+        for order in self:
+            if order.is_quote_req_submit and order.state in COUNTED_QUOTE_REQUEST_STATES:
+                keys[order.partner_id.id, 'partner'] += 1
+                keys[order.partner_id.commercial_partner_id.id, 'commercial'] += 1
+        return keys
+
+    @api.model
+    def _get_website_open_order_id(self, partner_id, pricelist_id, website_id, is_quote):
+        """Return the id of the last open quote cart (or cart) of the partner on the website.
+
+        The query matches the predicate and the sort order of the `_website_open_quote_idx` and
+        `_website_open_cart_idx` indexes, so that it reads a single index entry. It is not
+        cached: the latest cart changes with every line edit of any open cart of the partner.
+        Within a request, the result is kept by the `last_website_qo_id` and `last_website_so_id`
+        fields of the partner, and by the quote order memo of `website.sale_get_quote_order`.
+
+        :param int partner_id: The customer of the cart.
+        :param int pricelist_id: The pricelist of the customer.
+        :param int website_id: The website of the cart.
+        :param bool is_quote: Whether to look for a quote cart or for a normal cart.
+        :return: The id of the order, or `None`.
+        :rtype: int
+        """
+        self.flush_model(list(OPEN_ORDER_LOOKUP_FIELDS) + ['write_date'])
+        if is_quote:
+            predicate = SQL("is_quote IS TRUE AND is_quote_req_submit IS NOT TRUE")
+        else:
+            predicate = SQL("is_quote IS NOT TRUE")
+        if pricelist_id:
+            pricelist_clause = SQL("pricelist_id = %s", pricelist_id)
+        else:
+            pricelist_clause = SQL("pricelist_id IS NULL")
+        self.env.cr.execute(SQL(
+            """
+            SELECT id
+              FROM sale_order
+             WHERE partner_id = %s
+               AND website_id = %s
+               AND %s
+               AND state = 'draft'
+               AND %s
+          ORDER BY write_date DESC
+             LIMIT 1
+            """,
+            partner_id, website_id, pricelist_clause, predicate,
+        ))
+        row = self.env.cr.fetchone()
+        return row and row[0]
+
+    def _bump_quote_cart_revision(self):
+        """Increment the revision of the quote carts in self."""
+        for order in self.filtered('is_quote'):
+            order.quote_cart_revision += 1
+
+    def _get_quote_cart_revision_key(self):
+        """Return a key identifying the current content of the quote cart.
+
+        :return: The key, or an empty string when there is no quote cart.
+        :rtype: str
+        """
+        if not self:
+            return ''
+        self.ensure_one()
+        if not self.id:
+            # Session quote cart, see `website._get_session_quote_order`.
+            content = [(line.product_id.id, line.product_uom_qty) for line in self.order_line]
+            return 'session-%s' % hashlib.sha1(repr(content).encode()).hexdigest()[:12]
+        return '%s-%s' % (self.id, self.quote_cart_revision)
+
+    def _get_quote_cart_catalog_key(self):
+        """Return a key identifying the catalog data the quote cart is displayed with: its
+        pricelist, the products of its lines and the accessories they suggest, see
+        `_cart_accessories`. Unlike the revision, it changes when these are edited in the backend.
+
+        :return: The key, or an empty tuple when there is no quote cart.
+        :rtype: tuple
+        """
+        if not self:
+            return ()
+        self.ensure_one()
+        pricelist = self.pricelist_id.sudo()
+        templates = self.order_line.product_id.product_tmpl_id.sudo()
+        products = self.order_line.product_id.sudo() | templates.accessory_product_ids
+        write_dates = filter(None, [
+            pricelist.write_date,
+            *products.mapped('write_date'),
+            *products.product_tmpl_id.mapped('write_date'),
+        ])
+        # The versions only ever grow, any bump changes their sum.
+        return (pricelist.id, max(write_dates, default=None), sum(templates.mapped('quote_accessory_version')))
+
+    def _get_quote_request_job_types(self):
+        """Return the follow-up steps to run after the quote request is submitted, in order, see
+        `sale.quote.job`. The emails are only sent, and the PDF only attached, when enabled in
+        the settings."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        skipped_job_types = set()
+        if not ICP.get_param('ip_website_quote_cart.quote_request_notifications'):
+            skipped_job_types |= QUOTE_NOTIFICATION_JOB_TYPES
+        if not ICP.get_param('ip_website_quote_cart.quote_request_pdf'):
+            skipped_job_types |= QUOTE_DOCUMENT_JOB_TYPES
+        return [job_type for job_type, _label in QUOTE_JOB_TYPES if job_type not in skipped_job_types]
+
+    def _on_quote_request_submitted(self):
+        """Hook run by the quote request jobs after the quote request is submitted, for CRM or
+        analytics integrations to override."""
+
+    @metrics.timed('line_update')
+    def _cart_add(self, *args, **kwargs):
+        values = super()._cart_add(*args, **kwargs)
+        self._bump_quote_cart_revision()
+        return values
 
+    @metrics.timed('line_update')
+    def _cart_update_line_quantity(self, *args, **kwargs):
+        values = super()._cart_update_line_quantity(*args, **kwargs)
+        self._bump_quote_cart_revision()
+        return values
+
+    def _update_address(self, partner_id, fnames=None):
+        res = super()._update_address(partner_id, fnames=fnames)
+        self._bump_quote_cart_revision()
+        return res
+
+    @metrics.timed('line_update')
     def _cart_update(self, product_id, line_id=None, add_qty=0, set_qty=0, **kwargs):
         """ Add or set product quantity, add_qty can be negative """
         self.ensure_one()
@@ -18,8 +230,7 @@ class SaleOrder(models.Model):
 
         if self.state != 'draft':
             if self.is_quote:
-                request.session.pop('quote_order_id', None)
-                request.session.pop('quote_cart_quantity', None)
+                request.website._set_quote_session(quote_order_id=None, quote_cart_quantity=None)
             else:
                 request.session.pop('sale_order_id', None)
                 request.session.pop('website_sale_cart_quantity', None)
@@ -85,18 +296,21 @@ class SaleOrder(models.Model):
             ))
         if self.only_services:
             self._remove_delivery_line()
-        elif self.carrier_id:
-            # Recompute the delivery rate.
+        elif self.carrier_id and not self.is_quote:
+            # Recompute the delivery rate. Quote carts are rated when the request is turned into
+            # a quotation, see `_rate_deferred_quote_delivery`.
             rate = self.carrier_id.rate_shipment(self)
             if rate['success']:
                 self.order_line.filtered(lambda line: line.is_delivery).price_unit = rate['price']
             else:
                 self._remove_delivery_line()
 
+        self._bump_quote_cart_revision()
+
         # Update session cart quantity (critical for badge display)
         if request:
             if self.is_quote:
-                request.session['quote_cart_quantity'] = self.cart_quantity
+                request.website._set_quote_session(quote_cart_quantity=self.cart_quantity)
             else:
                 request.session['website_sale_cart_quantity'] = self.cart_quantity
 
@@ -109,21 +323,471 @@ class SaleOrder(models.Model):
             'warning': warning,
         }
 
+    @metrics.timed('accessories')
+    def _cart_accessories(self):
+        """ Suggest accessories of quote carts from the per-website index of
+        `product.product._get_quote_cart_accessory_ids`, instead of filtering the accessories of
+        every line on each cart update. Only the zero price filter, which depends on the
+        pricelist rules in force, is applied here, once on the accessories of the whole cart. """
+        if not self.is_quote:
+            return super()._cart_accessories()
+
+        ProductSudo = self.env['product.product'].sudo()
+        lines = self.website_order_line.filtered('product_id')
+        # Read the index versions of all the lines at once, see the cache key.
+        lines.product_id.product_tmpl_id.sudo().mapped('quote_accessory_version')
+        accessory_ids = set()
+        for line in lines:
+            line_accessory_ids = ProductSudo._get_quote_cart_accessory_ids(line.product_id.id, self.website_id.id)
+            if line_accessory_ids and line.product_no_variant_attribute_value_ids:
+                # The index only knows the variant of the product, check the full combination.
+                combination = line.product_id.product_template_attribute_value_ids + line.product_no_variant_attribute_value_ids
+                line_accessory_ids = ProductSudo.browse(line_accessory_ids).filtered(
+                    lambda product: product._is_variant_possible(parent_combination=combination)
+                ).ids
+            accessory_ids.update(line_accessory_ids)
+        accessory_ids.difference_update(lines.product_id.ids)
+
+        accessory_products = self.env['product.product'].browse(accessory_ids)
+        if accessory_products and self.website_id.prevent_zero_price_sale:
+            prices = self.pricelist_id._get_products_price(
+                accessory_products.sudo(), 1.0, currency=self.currency_id,
+            )
+            accessory_products = accessory_products.filtered(lambda product: prices.get(product.id))
+        return random.sample(accessory_products, len(accessory_products))
+
     def _verify_cart_after_update(self):
         # If this is a quote cart, skip updating main website cart UI
         if self.is_quote:
+            # The delivery rate is deferred, see `_rate_deferred_quote_delivery`.
             if self.only_services:
                 self._remove_delivery_line()
-            elif self.carrier_id:
-                rate = self.carrier_id.rate_shipment(self)
-                if rate['success']:
-                    self.order_line.filtered('is_delivery').price_unit = rate['price']
-                else:
-                    self._remove_delivery_line()
             return
 
         super()._verify_cart_after_update()
 
+    def action_quotation_send(self):
+        self._price_deferred_quotes()
+        self._rate_deferred_quote_delivery()
+        return super().action_quotation_send()
+
+    def action_confirm(self):
+        self._price_deferred_quotes()
+        self._rate_deferred_quote_delivery()
+        return super().action_confirm()
+
+    def action_price_quote_requests(self):
+        self._price_deferred_quotes()
+
+    def _compute_fiscal_position_id(self):
+        deferred_orders = self.filtered('quote_price_deferred')
+        deferred_orders.fiscal_position_id = False
+        super(SaleOrder, self - deferred_orders)._compute_fiscal_position_id()
+
+    def _price_deferred_quotes(self):
+        """Compute the fiscal position, and the prices, discounts and taxes of the lines of the
+        quote requests whose pricing was deferred, see `website.quote_price_deferred`."""
+        orders = self.filtered('quote_price_deferred')
+        if not orders:
+            return
+        orders.quote_price_deferred = False
+        orders._compute_fiscal_position_id()
+        orders._recompute_prices()
+        orders._recompute_taxes()
+
+    def _get_quote_delivery_rate_key(self):
+        """Return a hash of what the delivery rate of the order depends on: the carrier, the
+        cart contents and the delivery address."""
+        self.ensure_one()
+        shipping = self.partner_shipping_id
+        key = (
+            self.carrier_id.id,
+            sorted(
+                (line.product_id.id, line.product_uom_qty, line.product_uom_id.id)
+                for line in self.order_line if not line.is_delivery
+            ),
+            shipping.country_id.id, shipping.state_id.id, shipping.zip, shipping.city,
+            shipping.street, shipping.street2,
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    @metrics.timed('rate_shipment')
+    def _rate_deferred_quote_delivery(self):
+        """Compute the delivery rate of quote requests.
+
+        Quote carts are not rated on every cart update since the quote flow never charges
+        shipping. The rate is computed once the request is turned into a quotation, and only
+        again if the carrier, the cart contents or the delivery address changed since.
+        """
+        for order in self.filtered(lambda o: o.is_quote and o.state in ('draft', 'sent') and o.carrier_id):
+            if order.only_services:
+                order._remove_delivery_line()
+                continue
+            rate_key = order._get_quote_delivery_rate_key()
+            if rate_key == order.quote_delivery_rate_key:
+                continue
+            rate = order.carrier_id.rate_shipment(order)
+            if rate['success']:
+                order.order_line.filtered('is_delivery').price_unit = rate['price']
+            else:
+                order._remove_delivery_line()
+            order.quote_delivery_rate_key = rate_key
+
+    def _merge_quote_cart_lines(self, orders):
+        """Merge the lines of the given quote carts into this quote cart.
+
+        Lines with the same product, attribute values and parent line as a line of the cart are
+        merged into it by adding up their quantities; the other lines are moved to the cart. The
+        lines are updated with one write per distinct value, so that the cart is recomputed once.
+
+        :param sale.order orders: The quote carts to merge, left without lines.
+        """
+        self.ensure_one()
+        orders -= self
+        SaleOrderLine = self.env['sale.order.line']
+        source_lines = orders.order_line
+        if not source_lines:
+            return
+        (self.order_line | source_lines).fetch([
+            'product_id', 'product_uom_qty', 'linked_line_id', 'display_type', 'is_delivery',
+            'product_no_variant_attribute_value_ids', 'product_custom_attribute_value_ids',
+        ])
+
+        keys = {}
+
+        def line_key(line):
+            if line.id not in keys:
+                keys[line.id] = (
+                    line.product_id.id,
+                    frozenset(line.product_no_variant_attribute_value_ids.ids),
+                    frozenset(
+                        (value.custom_product_template_attribute_value_id.id, value.custom_value)
+                        for value in line.product_custom_attribute_value_ids
+                    ),
+                    line.linked_line_id and line_key(line.linked_line_id),
+                )
+            return keys[line.id]
+
+        line_per_key = {
+            line_key(line): line
+            for line in self.order_line if not (line.display_type or line.is_delivery)
+        }
+        quantities = {}
+        merged_into = {}
+        moved_lines = SaleOrderLine
+        deleted_lines = SaleOrderLine
+        for line in source_lines.sorted('id'):
+            if line.is_delivery:
+                # The delivery of the cart is rated again for its new content.
+                deleted_lines |= line
+                continue
+            if line.display_type:
+                moved_lines |= line
+                continue
+            key = line_key(line)
+            target = line_per_key.get(key)
+            if target:
+                quantities[target] = quantities.get(target, target.product_uom_qty) + line.product_uom_qty
+                merged_into[line] = target
+                deleted_lines |= line
+            else:
+                # Later duplicates, e.g. from another source order, are merged into this line.
+                line_per_key[key] = line
+                moved_lines |= line
+
+        # The options of a merged line follow the line it was merged into.
+        children_per_parent = defaultdict(lambda: SaleOrderLine)
+        for line in moved_lines:
+            if line.linked_line_id in merged_into:
+                children_per_parent[merged_into[line.linked_line_id]] |= line
+
+        moved_lines.write({'order_id': self.id})
+        for parent, children in children_per_parent.items():
+            children.write({'linked_line_id': parent.id})
+        lines_per_quantity = defaultdict(lambda: SaleOrderLine)
+        for line, quantity in quantities.items():
+            lines_per_quantity[quantity] |= line
+        for quantity, lines in lines_per_quantity.items():
+            lines.write({'product_uom_qty': quantity})
+        deleted_lines.unlink()
+        self._bump_quote_cart_revision()
+
+    def _quote_cart_import_lines(self, quantities):
+        """Add the given quantities of products to the quote cart in one batch.
+
+        Each product is handled as by `_cart_add`: its quantity is added to its line, if any, see
+        `_get_quote_import_lines`, and checked by `_verify_updated_quantity`; the new lines are
+        prepared by `_prepare_order_line_values`, e.g. with the single-value no_variant attribute
+        values of the product. The lines are then written once per distinct quantity and created
+        in a single call, and the cart is verified once.
+
+        :param dict quantities: The quantities to add, by product id.
+        :return: The updated and created lines, and the warnings of the quantity checks.
+        :rtype: tuple
+        """
+        self.ensure_one()
+        if self.state != 'draft':
+            raise UserError(_('It is forbidden to modify a sales order which is not in draft status.'))
+        SaleOrderLine = self.env['sale.order.line']
+        lines_per_quantity = defaultdict(lambda: SaleOrderLine)
+        removed_lines = SaleOrderLine
+        new_line_vals_list = []
+        warnings = []
+        line_per_product_id = self._get_quote_import_lines(quantities)
+        for product_id, quantity in quantities.items():
+            order_line = line_per_product_id.get(product_id, SaleOrderLine)
+            quantity, warning = self._verify_updated_quantity(
+                order_line,
+                product_id,
+                order_line.product_uom_qty + quantity,
+                uom_id=order_line.product_uom_id.id,
+            )
+            if warning:
+                warnings.append(warning)
+            if order_line and quantity <= 0:
+                removed_lines |= order_line
+            elif order_line:
+                lines_per_quantity[quantity] |= order_line
+            elif quantity > 0:
+                new_line_vals_list.append(self._prepare_order_line_values(product_id, quantity))
+
+        for quantity, lines in lines_per_quantity.items():
+            lines.write({'product_uom_qty': quantity})
+        removed_lines.unlink()
+        new_lines = SaleOrderLine.create(new_line_vals_list)
+
+        self._bump_quote_cart_revision()
+        self._verify_cart_after_update()
+        return SaleOrderLine.concat(*lines_per_quantity.values()) | new_lines, warnings
+
+    def _get_quote_import_lines(self, product_ids):
+        """Return the lines the imported quantities of the given products are added to, found in
+        a single search instead of one `_cart_find_product_line` per product.
+
+        As for `_cart_find_product_line`, the line of a product has no custom value, is neither
+        linked to another line nor part of a combo and, for products with no_variant attributes,
+        has the values a new line gets, i.e. those of the single-value no_variant attributes.
+
+        :param product_ids: The ids of the imported products.
+        :return: The first matching line, by product id.
+        :rtype: dict
+        """
+        lines = self.env['sale.order.line'].search([
+            ('order_id', '=', self.id),
+            ('product_id', 'in', list(product_ids)),
+            ('product_custom_attribute_value_ids', '=', False),
+            ('linked_line_id', '=', False),
+            ('combo_item_id', '=', False),
+        ], order='id')
+        line_per_product_id = {}
+        for line in lines:
+            no_variant_values = line.product_id.product_tmpl_id.attribute_line_ids.filtered(
+                lambda ptal: ptal.attribute_id.create_variant == 'no_variant' and len(ptal.value_ids) == 1
+            ).product_template_value_ids.filtered('ptav_active')
+            if line.product_no_variant_attribute_value_ids == no_variant_values:
+                line_per_product_id.setdefault(line.product_id.id, line)
+        return line_per_product_id
+
+    @api.depends('is_quote')
+    def _compute_abandoned_cart(self):
+        # Quote carts get their own recovery email, see `_cron_send_quote_cart_recovery_email`.
+        quote_carts = self.filtered('is_quote')
+        quote_carts.is_abandoned_cart = False
+        super(SaleOrder, self - quote_carts)._compute_abandoned_cart()
+
+    def _search_abandoned_cart(self, operator, value):
+        domain = Domain(super()._search_abandoned_cart(operator, value))
+        values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        quote_domain = Domain('is_quote', '=', True)
+        if (True in values) != (operator in ('!=', 'not in')):
+            return domain & ~quote_domain
+        return domain | quote_domain
+
+    @api.model
+    def _get_abandoned_quote_cart_domain(self):
+        """Return the domain of the quote carts eligible for a recovery email, regardless of
+        the abandoned delay of their website."""
+        websites = self.env['website'].sudo().search([])
+        return [
+            ('is_quote', '=', True),
+            ('is_quote_req_submit', '=', False),
+            ('state', '=', 'draft'),
+            ('website_id', 'in', websites.filtered('send_abandoned_cart_email').ids),
+            ('order_line', '!=', False),
+            ('cart_recovery_email_sent', '=', False),
+            ('partner_id', 'not in', websites.partner_id.ids),
+            ('partner_id.email', '!=', False),
+            ('write_date', '<=', fields.Datetime.now() - timedelta(
+                hours=min(websites.mapped('cart_abandoned_delay') or [0.0]),
+            )),
+        ]
+
+    @api.model
+    def _cron_send_quote_cart_recovery_email(self):
+        """Send the recovery email of abandoned quote carts.
+
+        The candidates are processed in chunks of `ip_website_quote_cart.recovery_chunk_size`
+        orders, ordered by id, and the progress is committed after each chunk with
+        `ir.cron._commit_progress`. When the cron runs out of time, the run stops and the cron
+        is rescheduled right away; the orders already sent an email are no longer candidates, so
+        the next run resumes where this one stopped.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(ICP.get_param('ip_website_quote_cart.recovery_chunk_size', 200))
+        template = self.env.ref('ip_website_quote_cart.mail_template_quote_cart_recovery', raise_if_not_found=False)
+        if not template:
+            return
+
+        IrCron = self.env['ir.cron']
+        domain = self._get_abandoned_quote_cart_domain()
+        IrCron._commit_progress(remaining=self.sudo().search_count(domain))
+        last_id = 0
+        sent_count = 0
+        while True:
+            orders = self.sudo().search(domain + [('id', '>', last_id)], order='id', limit=chunk_size)
+            if not orders:
+                break
+
+            now = fields.Datetime.now()
+            abandoned_orders = orders.filtered(
+                lambda order: order.write_date <= now - timedelta(hours=order.website_id.cart_abandoned_delay)
+            )
+            if abandoned_orders:
+                abandoned_orders._portal_ensure_token()
+                template.send_mail_batch(abandoned_orders.ids)
+                abandoned_orders.write({'cart_recovery_email_sent': True, 'quote_cart_recovery_email_date': now})
+                sent_count += len(abandoned_orders)
+
+            last_id = orders[-1].id
+            if not IrCron._commit_progress(len(orders)):
+                break
+            # Free the memory of the processed chunk.
+            self.env.invalidate_all()
+        _logger.info("Sent %s abandoned quote cart recovery emails.", sent_count)
+
+    @api.model
+    def _get_stale_quote_cart_conditions(self):
+        """Return the SQL conditions matching the quote carts to reclaim according to the retention
+        settings, each with the action reclaiming them.
+
+        Empty quote carts and the ones of public visitors are deleted. The other ones are only
+        cancelled, unless `ip_website_quote_cart.retention_action` is set to delete them, and are
+        kept during the retention delay that follows their recovery email, see
+        `_cron_send_quote_cart_recovery_email`.
+
+        :return: A list of `(condition, action)`, the action being 'unlink' or 'cancel'.
+        :rtype: list
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        retention_days = int(ICP.get_param('ip_website_quote_cart.retention_days', 30))
+        public_retention_days = int(ICP.get_param('ip_website_quote_cart.public_retention_days', 2))
+        action = ICP.get_param('ip_website_quote_cart.retention_action', 'cancel')
+        now = fields.Datetime.now()
+
+        conditions = []
+        if public_retention_days > 0:
+            public_partner_ids = tuple(self.env['website'].sudo().search([]).partner_id.ids) or (0,)
+            conditions.append((SQL(
+                """so.write_date < %s AND (
+                    so.partner_id IN %s
+                    OR NOT EXISTS (SELECT 1 FROM sale_order_line sol WHERE sol.order_id = so.id)
+                )""",
+                now - timedelta(days=public_retention_days),
+                public_partner_ids,
+            ), 'unlink'))
+        if retention_days > 0:
+            limit_date = now - timedelta(days=retention_days)
+            conditions.append((SQL(
+                """so.write_date < %s AND (
+                    so.quote_cart_recovery_email_date IS NULL
+                    OR so.quote_cart_recovery_email_date < %s
+                )""",
+                limit_date,
+                limit_date,
+            ), 'unlink' if action == 'unlink' else 'cancel'))
+        return conditions
+
+    @api.model
+    def _cron_vacuum_quote_carts(self):
+        """Reclaim the stale quote carts: the empty ones, the ones of public visitors and the ones
+        left untouched for too long, according to the retention settings, see
+        `_get_stale_quote_cart_conditions`.
+
+        The carts are locked and reclaimed by chunks of `ip_website_quote_cart.vacuum_chunk_size`
+        orders, and the progress is committed after each chunk with `ir.cron._commit_progress`
+        so that locks are held briefly. Rows locked by another transaction, e.g. a visitor
+        updating their cart, are skipped until the next run. When the cron runs out of time, the
+        run stops and the cron is rescheduled right away.
+
+        :return: The number of deleted and cancelled orders, and of deleted order lines.
+        :rtype: dict
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(ICP.get_param('ip_website_quote_cart.vacuum_chunk_size', 500))
+        reclaimed = {'deleted': 0, 'cancelled': 0, 'lines': 0}
+
+        IrCron = self.env['ir.cron']
+        stale_conditions = self._get_stale_quote_cart_conditions()
+        query = SQL(
+            """
+            SELECT so.id
+              FROM sale_order so
+             WHERE so.is_quote IS TRUE
+               AND so.is_quote_req_submit IS NOT TRUE
+               AND so.state = 'draft'
+            """
+        )
+        if stale_conditions:
+            self.env.cr.execute(SQL(
+                "SELECT COUNT(*) FROM (%s AND (%s)) stale",
+                query,
+                SQL(' OR ').join(SQL('(%s)', condition) for condition, _action in stale_conditions),
+            ))
+            IrCron._commit_progress(remaining=self.env.cr.fetchone()[0])
+
+        has_time = True
+        for stale_condition, action in stale_conditions:
+            last_id = 0
+            while has_time:
+                self.env.cr.execute(SQL(
+                    """
+                    %s
+                       AND so.id > %s
+                       AND %s
+                  ORDER BY so.id
+                     LIMIT %s
+                       FOR UPDATE OF so SKIP LOCKED
+                    """,
+                    query,
+                    last_id,
+                    stale_condition,
+                    chunk_size,
+                ))
+                order_ids = [order_id for order_id, in self.env.cr.fetchall()]
+                if not order_ids:
+                    break
+
+                orders = self.sudo().browse(order_ids)
+                if action == 'cancel':
+                    orders._action_cancel()
+                    reclaimed['cancelled'] += len(order_ids)
+                else:
+                    reclaimed['lines'] += self.env['sale.order.line'].sudo().search_count([('order_id', 'in', order_ids)])
+                    orders.unlink()
+                    reclaimed['deleted'] += len(order_ids)
+
+                last_id = order_ids[-1]
+                has_time = IrCron._commit_progress(len(order_ids))
+                self.env.invalidate_all()
+                if len(order_ids) < chunk_size:
+                    break
+
+        _logger.info(
+            "Quote cart vacuum: %s stale quote carts deleted, %s cancelled, %s order lines deleted.",
+            reclaimed['deleted'], reclaimed['cancelled'], reclaimed['lines'],
+        )
+        return reclaimed
+
 
 class SaleOrderLine(models.Model):
     _inherit = 'sale.order.line'
@@ -133,3 +797,27 @@ class SaleOrderLine(models.Model):
             return
 
         return super()._check_validity()
+
+    def _filter_price_deferred(self):
+        """Return the lines whose pricing is deferred, see `sale.order.quote_price_deferred`."""
+        return self.filtered(lambda line: line.order_id.quote_price_deferred and not line.is_delivery)
+
+    def _compute_pricelist_item_id(self):
+        deferred_lines = self._filter_price_deferred()
+        deferred_lines.pricelist_item_id = False
+        super(SaleOrderLine, self - deferred_lines)._compute_pricelist_item_id()
+
+    def _compute_price_unit(self):
+        deferred_lines = self._filter_price_deferred()
+        deferred_lines.price_unit = 0.0
+        super(SaleOrderLine, self - deferred_lines)._compute_price_unit()
+
+    def _compute_discount(self):
+        deferred_lines = self._filter_price_deferred()
+        deferred_lines.discount = 0.0
+        super(SaleOrderLine, self - deferred_lines)._compute_discount()
+
+    def _compute_tax_ids(self):
+        deferred_lines = self._filter_price_deferred()
+        deferred_lines.tax_ids = False
+        super(SaleOrderLine, self - deferred_lines)._compute_tax_ids()
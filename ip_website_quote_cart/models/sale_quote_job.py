@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Follow-up steps of a submitted quote request, in the order they are enqueued and run. Each type
+# is run by the `_run_<type>` method of `sale.quote.job`.
+QUOTE_JOB_TYPES = [
+    ('recompute_taxes', "Compute Prices and Taxes"),
+    ('render_pdf', "Render Quotation PDF"),
+    ('confirmation_mail', "Customer Confirmation Email"),
+    ('notify_salesperson', "Salesperson Notification"),
+    ('submitted_hook', "Submission Hooks"),
+]
+
+# Steps sending emails, only run when `ip_website_quote_cart.quote_request_notifications` is set.
+QUOTE_NOTIFICATION_JOB_TYPES = {'confirmation_mail', 'notify_salesperson'}
+
+# Steps attaching the quotation PDF, only run when `ip_website_quote_cart.quote_request_pdf` is set.
+QUOTE_DOCUMENT_JOB_TYPES = {'render_pdf'}
+
+# Step each step waits for, when both are enqueued: the documents sent or attached to the quote
+# request show its final prices and taxes. The other steps run on their own, so that a step
+# failing for good does not hold them back.
+QUOTE_JOB_DEPENDENCIES = {
+    'render_pdf': 'recompute_taxes',
+    'confirmation_mail': 'recompute_taxes',
+}
+
+# Delay before the first retry of a failed job, in minutes, doubled after each attempt.
+QUOTE_JOB_RETRY_DELAY = 5
+
+
+class SaleQuoteJob(models.Model):
+    _name = 'sale.quote.job'
+    _description = "Quote Request Follow-up Job"
+    _order = 'scheduled_date, id'
+
+    order_id = fields.Many2one('sale.order', string="Quotation", required=True, index=True, ondelete='cascade')
+    job_type = fields.Selection(QUOTE_JOB_TYPES, string="Step", required=True)
+    previous_job_id = fields.Many2one(
+        'sale.quote.job', string="After", readonly=True, index='btree_not_null', ondelete='cascade',
+        help="The job only runs once this step of the quote request, which it depends on, is done.",
+    )
+    state = fields.Selection(
+        [('pending', "Pending"), ('done', "Done"), ('failed', "Failed"), ('cancel', "Cancelled")],
+        string="Status", required=True, default='pending',
+    )
+    idempotency_key = fields.Char(
+        string="Idempotency Key", required=True, readonly=True,
+        help="Enqueuing a job whose key already exists does nothing, so that a step is only done"
+             " once per quote request, e.g. when the customer submits twice.",
+    )
+    scheduled_date = fields.Datetime(string="Scheduled On", required=True, default=fields.Datetime.now)
+    date_done = fields.Datetime(string="Done On", readonly=True)
+    attempt_count = fields.Integer(string="Attempts", readonly=True)
+    max_attempts = fields.Integer(string="Max Attempts", default=5)
+    error = fields.Text(string="Last Error", readonly=True)
+
+    _idempotency_key_uniq = models.Constraint(
+        'UNIQUE(idempotency_key)',
+        "A job with the same idempotency key already exists.",
+    )
+    _pending_idx = models.Index("(scheduled_date, id) WHERE state = 'pending'")
+
+    @api.depends('order_id', 'job_type')
+    def _compute_display_name(self):
+        job_type_labels = dict(self._fields['job_type']._description_selection(self.env))
+        for job in self:
+            job.display_name = "%s - %s" % (job.order_id.name, job_type_labels.get(job.job_type))
+
+    @api.model
+    def _enqueue(self, orders, job_types, key='submit'):
+        """Enqueue the given steps for the orders, skipping the ones already enqueued, and
+        trigger the worker.
+
+        A step waits for the step it depends on, see `QUOTE_JOB_DEPENDENCIES`, so that e.g. the
+        PDF is only rendered once the prices and taxes are. The other steps run on their own.
+
+        :param sale.order orders: The quote requests.
+        :param list job_types: The steps to run, in order, see `QUOTE_JOB_TYPES`.
+        :param str key: The event the steps follow, part of their idempotency key.
+        :return: The created jobs.
+        :rtype: sale.quote.job
+        """
+        job_per_key = {
+            job.idempotency_key: job
+            for job in self.search_fetch(
+                [('idempotency_key', 'in', [
+                    '%s:%s:%s' % (order.id, job_type, key) for order in orders for job_type in job_types
+                ])],
+                ['idempotency_key'],
+            )
+        }
+        jobs = self.browse()
+        for order in orders:
+            job_per_type = {}
+            for job_type in job_types:
+                idempotency_key = '%s:%s:%s' % (order.id, job_type, key)
+                job = job_per_key.get(idempotency_key)
+                if not job:
+                    previous_job = job_per_type.get(QUOTE_JOB_DEPENDENCIES.get(job_type), self.browse())
+                    job = self.create({
+                        'order_id': order.id,
+                        'job_type': job_type,
+                        'idempotency_key': idempotency_key,
+                        'previous_job_id': previous_job.id,
+                    })
+                    jobs |= job
+                job_per_type[job_type] = job
+        if jobs:
+            self.env.ref('ip_website_quote_cart.ir_cron_quote_job')._trigger()
+        return jobs
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Run the pending jobs that are due, and whose previous step if any is done, one at a
+        time.
+
+        Each job is locked with `SKIP LOCKED`, so that several workers never run the same job,
+        run in a savepoint, and committed on its own with `ir.cron._commit_progress`: a failing
+        or slow job does not hold back the others. A failed job is retried after
+        `QUOTE_JOB_RETRY_DELAY` minutes, doubled after each attempt, until it reaches its
+        maximum number of attempts. When the cron runs out of time, the run stops and the cron
+        is rescheduled right away.
+
+        :return: The number of done, retried and failed jobs.
+        :rtype: dict
+        """
+        IrCron = self.env['ir.cron']
+        processed = {'done': 0, 'retried': 0, 'failed': 0}
+        IrCron._commit_progress(remaining=self.search_count([
+            ('state', '=', 'pending'), ('scheduled_date', '<=', fields.Datetime.now()),
+        ]))
+
+        while True:
+            self.env.cr.execute(SQL(
+                """
+                SELECT job.id
+                  FROM sale_quote_job job
+             LEFT JOIN sale_quote_job previous ON previous.id = job.previous_job_id
+                 WHERE job.state = 'pending'
+                   AND job.scheduled_date <= %s
+                   AND (previous.id IS NULL OR previous.state = 'done')
+              ORDER BY job.scheduled_date, job.id
+                 LIMIT 1
+                   FOR UPDATE OF job SKIP LOCKED
+                """,
+                fields.Datetime.now(),
+            ))
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+
+            job = self.sudo().browse(row[0])
+            job._run()
+            processed['retried' if job.state == 'pending' else job.state] += 1
+            if not IrCron._commit_progress(1):
+                break
+            self.env.invalidate_all()
+
+        _logger.info(
+            "Quote request jobs: %s done, %s to retry, %s failed.",
+            processed['done'], processed['retried'], processed['failed'],
+        )
+        return processed
+
+    def _run(self):
+        """Run the job and record its outcome; an error fails the job or schedules a retry."""
+        self.ensure_one()
+        self.attempt_count += 1
+        try:
+            with self.env.cr.savepoint():
+                getattr(self, '_run_%s' % self.job_type)(self.order_id)
+        except Exception as error:  # noqa: BLE001
+            _logger.warning("Quote request job %s (%s) failed.", self.id, self.job_type, exc_info=True)
+            if self.attempt_count >= self.max_attempts:
+                self.write({'state': 'failed', 'error': str(error)})
+            else:
+                self.write({
+                    'error': str(error),
+                    'scheduled_date': fields.Datetime.now() + timedelta(
+                        minutes=QUOTE_JOB_RETRY_DELAY * 2 ** (self.attempt_count - 1)
+                    ),
+                })
+        else:
+            self.write({'state': 'done', 'date_done': fields.Datetime.now(), 'error': False})
+
+    def _run_recompute_taxes(self, order):
+        if order.quote_price_deferred:
+            order._price_deferred_quotes()
+        else:
+            order._compute_fiscal_position_id()
+            order._recompute_taxes()
+
+    def _run_render_pdf(self, order):
+        # The step follows `recompute_taxes`, but may be retried on its own: never render a
+        # document of a quote request whose pricing is still deferred.
+        order._price_deferred_quotes()
+        content, _report_type = self.env['ir.actions.report']._render_qweb_pdf(
+            'sale.action_report_saleorder', order.ids,
+        )
+        self.env['ir.attachment'].create({
+            'name': _("Quotation Request - %s.pdf", order.name),
+            'type': 'binary',
+            'raw': content,
+            'res_model': 'sale.order',
+            'res_id': order.id,
+            'mimetype': 'application/pdf',
+        })
+
+    def _run_confirmation_mail(self, order):
+        order._price_deferred_quotes()
+        template = self.env.ref('ip_website_quote_cart.mail_template_quote_request_confirmation', raise_if_not_found=False)
+        if template and order.partner_id.email:
+            template.send_mail(order.id)
+
+    def _run_notify_salesperson(self, order):
+        if order.user_id:
+            order.message_post(
+                body=_("A new quotation request was submitted from the website."),
+                partner_ids=order.user_id.partner_id.ids,
+                subtype_xmlid='mail.mt_note',
+            )
+
+    def _run_submitted_hook(self, order):
+        order._on_quote_request_submitted()
+
+    def _get_next_jobs(self):
+        """Return the jobs waiting, directly or not, for the jobs in self."""
+        next_jobs = self.search([('previous_job_id', 'in', self.ids)])
+        if next_jobs:
+            next_jobs |= next_jobs._get_next_jobs()
+        return next_jobs
+
+    def action_retry(self):
+        """Run the jobs again, with the steps that were cancelled after them."""
+        self.write({
+            'state': 'pending',
+            'scheduled_date': fields.Datetime.now(),
+            'attempt_count': 0,
+        })
+        self._get_next_jobs().filtered(lambda job: job.state == 'cancel').write({'state': 'pending'})
+        self.env.ref('ip_website_quote_cart.ir_cron_quote_job')._trigger()
+
+    def action_cancel(self):
+        """Cancel the pending jobs, and the steps waiting for them."""
+        jobs = self.filtered(lambda job: job.state == 'pending')
+        (jobs | jobs._get_next_jobs()).filtered(lambda job: job.state == 'pending').write({'state': 'cancel'})
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# States of the submitted quote requests counted in the portal, see
+# `SaleOrder._get_quote_request_counter_keys`.
+COUNTED_QUOTE_REQUEST_STATES = ('draft', 'sent', 'cancel')
+
+
+class SaleQuoteRequestCounter(models.Model):
+    _name = 'sale.quote.request.counter'
+    _description = "Requested Quotations Portal Counter"
+    _log_access = False
+
+    partner_id = fields.Many2one('res.partner', string="Partner", required=True, ondelete='cascade')
+    scope = fields.Selection(
+        [('partner', "Partner"), ('commercial', "Commercial Partner")],
+        string="Scope", required=True,
+        help="Whether the counter holds the requests of the partner itself, or of all the"
+             " contacts of the commercial partner.",
+    )
+    count = fields.Integer(string="Requested Quotations")
+
+    _partner_scope_uniq = models.Constraint(
+        'UNIQUE(partner_id, scope)',
+        "A partner can only have one counter per scope.",
+    )
+
+    @api.model
+    def _get_requested_quotation_count(self, partner, scope='partner'):
+        """Return the number of submitted quote requests of the partner.
+
+        :param res.partner partner: The partner, or the commercial partner for the 'commercial'
+                                    scope.
+        :param str scope: 'partner' or 'commercial'.
+        :rtype: int
+        """
+        counter = self.sudo().search_fetch(
+            [('partner_id', '=', partner.id), ('scope', '=', scope)], ['count'], limit=1,
+        )
+        return counter.count
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """Add the given deltas to the counters, creating the missing ones.
+
+        :param dict deltas: The delta of each counter, keyed by `(partner_id, scope)`.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if key[0] and delta}
+        if not deltas:
+            return
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO sale_quote_request_counter (partner_id, scope, count)
+                 VALUES %s
+            ON CONFLICT (partner_id, scope)
+              DO UPDATE SET count = sale_quote_request_counter.count + EXCLUDED.count
+            """,
+            SQL(", ").join(
+                SQL("(%s, %s, %s)", partner_id, scope, delta)
+                for (partner_id, scope), delta in deltas.items()
+            ),
+        ))
+        self.invalidate_model(['count'])
+
+    @api.model
+    def _update_counters(self, keys_before, keys_after):
+        """Apply the difference between the counted orders before and after a change.
+
+        :param Counter keys_before: See `SaleOrder._get_quote_request_counter_keys`.
+        :param Counter keys_after: See `SaleOrder._get_quote_request_counter_keys`.
+        """
+        deltas = Counter(keys_after)
+        deltas.subtract(keys_before)
+        self._apply_deltas(deltas)
+
+    @api.model
+    def _rebuild_counters(self):
+        """Rebuild all the counters from the quote requests, e.g. after commercial partners
+        were changed or the counters got out of sync."""
+        self.env['sale.order'].flush_model(['partner_id', 'state', 'is_quote_req_submit'])
+        self.env['res.partner'].flush_model(['commercial_partner_id'])
+        self.env.cr.execute(SQL("DELETE FROM sale_quote_request_counter"))
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO sale_quote_request_counter (partner_id, scope, count)
+                 SELECT so.partner_id, 'partner', COUNT(*)
+                   FROM sale_order so
+                  WHERE so.is_quote_req_submit IS TRUE
+                    AND so.state IN %(states)s
+               GROUP BY so.partner_id
+            UNION ALL
+                 SELECT partner.commercial_partner_id, 'commercial', COUNT(*)
+                   FROM sale_order so
+                   JOIN res_partner partner ON partner.id = so.partner_id
+                  WHERE so.is_quote_req_submit IS TRUE
+                    AND so.state IN %(states)s
+                    AND partner.commercial_partner_id IS NOT NULL
+               GROUP BY partner.commercial_partner_id
+            """,
+            states=COUNTED_QUOTE_REQUEST_STATES,
+        ))
+        self.invalidate_model()
@@ -1,14 +1,56 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, SUPERUSER_ID, fields
+from odoo.fields import Command
 from odoo.http import request
 
+from .. import metrics
+
+# Session key of the quote cart state, stored as one compact dict, see `Website._get_quote_session`.
+QUOTE_SESSION_KEY = 'quote_cart'
+
+# Short keys of the quote cart state in the session, per state name:
+# * quote_order_id: the quote order of the visitor;
+# * quote_cart_quantity: the quantity shown in the header badge;
+# * last_order_quote_id: the last submitted quote order;
+# * quote_cart_lines: the quote cart of anonymous visitors in session mode, a list of
+#   `[product_id, quantity]` pairs, see `Website._is_session_quote_cart`;
+# * quote_order_reload_check: see `Website._is_last_quote_order_reloadable`.
+QUOTE_SESSION_FIELDS = {
+    'quote_order_id': 'o',
+    'quote_cart_quantity': 'q',
+    'last_order_quote_id': 'l',
+    'quote_cart_lines': 'c',
+    'quote_order_reload_check': 'r',
+}
+
 
 class Website(models.Model):
     _inherit = 'website'
 
     # Legacy field - kept for backward compatibility
     website_request_quote = fields.Boolean(default=True)
+    quote_cart_session_mode = fields.Boolean(
+        string="Session Quote Cart for Visitors",
+        help="Keep the quote cart of anonymous visitors in their session. The quotation is only "
+             "created when they proceed to the address step.",
+    )
+    quote_cart_cacheable_header = fields.Boolean(
+        string="Cacheable Quote Cart Header",
+        help="Render the header cart and quote cart badges without the visitor's session and "
+             "fill them in the browser, so that pages can be cached by a reverse proxy.",
+    )
+    quote_price_deferred = fields.Boolean(
+        string="Deferred Quote Pricing",
+        help="Store the lines of quote carts without computing their prices, discounts and "
+             "taxes. They are computed once the request is submitted, or by the salesperson.",
+    )
+
+    def _get_header_cart_quantity(self):
+        """Return the quantity of the header cart badge of website_sale, as its template reads it."""
+        if 'website_sale_cart_quantity' in request.session:
+            return request.session['website_sale_cart_quantity']
+        return self.sale_get_order().cart_quantity or 0
 
     def update_quote_context(self):
         # context = self._context.copy()
@@ -18,26 +60,80 @@ class Website(models.Model):
         })
         return context
 
+    def _with_quote_context(self):
+        """Return the website in the quote cart context, see `update_quote_context`."""
+        if self.env.context.get('is_quote_order'):
+            return self
+        return self.with_context(is_quote_order=True)
+
     def sale_reset(self):
         if self.env.context and self.env.context.get('is_quote_order'):
             # Only reset quote cart - don't touch normal cart
-            request.session.pop('quote_order_id', None)
-            request.session.pop('quote_cart_quantity', None)
+            self._set_quote_session(quote_order_id=None, quote_cart_quantity=None, quote_cart_lines=None)
         else:
             # Call parent for normal cart reset
             super(Website, self).sale_reset()
 
+    # Quote cart session state
+
+    def _get_quote_session(self, name, default=None):
+        """Return a value of the quote cart state of the session.
+
+        :param str name: The name of the state, see `QUOTE_SESSION_FIELDS`.
+        """
+        state = request.session.get(QUOTE_SESSION_KEY)
+        if state is None:
+            # Sessions created before the compact state kept each value under its own key.
+            return request.session.get(name, default)
+        return state.get(QUOTE_SESSION_FIELDS[name], default)
+
+    def _set_quote_session(self, **values):
+        """Update the quote cart state of the session, a falsy value removing the state.
+
+        The session is only modified, and thus only saved at the end of the request, if a value
+        actually changes. Cleared states are not kept, to keep the stored session small. The
+        values of sessions created before the compact state are moved into it.
+
+        :param values: The new values, by state name, see `QUOTE_SESSION_FIELDS`.
+        """
+        legacy_names = [name for name in QUOTE_SESSION_FIELDS if name in request.session]
+        state = request.session.get(QUOTE_SESSION_KEY)
+        if state is None:
+            state = {
+                QUOTE_SESSION_FIELDS[name]: request.session[name]
+                for name in legacy_names if request.session[name]
+            }
+        new_state = dict(state)
+        for name, value in values.items():
+            if value:
+                new_state[QUOTE_SESSION_FIELDS[name]] = value
+            else:
+                new_state.pop(QUOTE_SESSION_FIELDS[name], None)
+        if new_state == state and not legacy_names:
+            return
+        for name in legacy_names:
+            request.session.pop(name)
+        if new_state:
+            request.session[QUOTE_SESSION_KEY] = new_state
+        else:
+            request.session.pop(QUOTE_SESSION_KEY, None)
+
     def _prepare_sale_order_values(self, partner_sudo):
         res = super(Website, self)._prepare_sale_order_values(partner_sudo)
         res.update({
             'is_quote': True if self.env.context.get('is_quote_order') else False
         })
+        if res['is_quote'] and self.quote_price_deferred:
+            res['quote_price_deferred'] = True
         return res
 
-    def sale_get_quote_order(self, force_create=False):
+    @metrics.timed('order_lookup')
+    def sale_get_quote_order(self, force_create=False, materialize=False):
         """ Return the current sales order after mofications specified by params.
 
         :param bool force_create: Create sales order if not already existing
+        :param bool materialize: Create the sales order of a session quote cart, if any, see
+                                 `_is_session_quote_cart`
 
         :returns: current cart, as a sudoed `sale.order` recordset (might be empty)
         """
@@ -46,45 +142,66 @@ class Website(models.Model):
         self = self.with_company(self.company_id)
         SaleOrder = self.env['sale.order'].sudo()
 
-        quote_order_id = request.session.get('quote_order_id')
+        # The quote order is resolved once per request, see `_get_quote_order_memo_key`.
+        memo = getattr(request, 'quote_order_memo', None)
+        needs_order = force_create or (materialize and self._get_quote_session('quote_cart_lines'))
+        if memo and memo[0] == self._get_quote_order_memo_key() and (memo[1] or not needs_order):
+            return SaleOrder.browse(memo[1]) if memo[1] else self.env['sale.order']
+
+        quote_order_sudo = self._sale_get_quote_order(force_create=force_create, materialize=materialize)
+        request.quote_order_memo = (self._get_quote_order_memo_key(), quote_order_sudo.id)
+        return quote_order_sudo
+
+    def _get_quote_order_memo_key(self):
+        """Return the key of the quote order resolved for the current request: the order stays
+        the same as long as the website, the user and the quote cart of the session do."""
+        return (
+            self.id,
+            self.env.uid,
+            self._get_quote_session('quote_order_id'),
+            bool(self._get_quote_session('quote_cart_lines')),
+        )
+
+    def _sale_get_quote_order(self, force_create=False, materialize=False):
+        """Resolve the quote order of the current visitor, see `sale_get_quote_order`."""
+        SaleOrder = self.env['sale.order'].sudo()
+
+        quote_order_id = self._get_quote_session('quote_order_id')
+        session_lines = self._get_quote_session('quote_cart_lines')
+        if session_lines and (materialize or not self.env.user._is_public()):
+            # The visitor proceeds to the checkout or has logged in, their quote cart is needed.
+            force_create = True
 
         if quote_order_id:
             quote_order_sudo = SaleOrder.browse(quote_order_id).exists()
+            if (
+                quote_order_sudo
+                and quote_order_sudo.partner_id == self.partner_id
+                and not self.env.user._is_public()
+            ):
+                # The visitor logged in with an anonymous quote cart, merge it into their own.
+                last_quote_order_sudo = self.env.user.partner_id.last_website_qo_id
+                if last_quote_order_sudo and last_quote_order_sudo.state == 'draft':
+                    last_quote_order_sudo._merge_quote_cart_lines(quote_order_sudo)
+                    quote_order_sudo.action_cancel()
+                    quote_order_sudo = last_quote_order_sudo
+                    self._set_quote_session(
+                        quote_order_id=quote_order_sudo.id, quote_cart_quantity=quote_order_sudo.cart_quantity,
+                    )
         elif self.env.user and not self.env.user._is_public():
             quote_order_sudo = self.env.user.partner_id.last_website_qo_id
-            if quote_order_sudo:
-                available_pricelists = self.get_pricelist_available()
-                so_pricelist_sudo = quote_order_sudo.pricelist_id
-                if so_pricelist_sudo and so_pricelist_sudo not in available_pricelists:
-                    # Do not reload the cart of this user last visit
-                    # if the cart uses a pricelist no longer available.
-                    quote_order_sudo = SaleOrder
-                else:
-                    # Do not reload the cart of this user last visit
-                    # if the Fiscal Position has changed.
-                    fpos = quote_order_sudo.env['account.fiscal.position'].with_company(
-                        quote_order_sudo.company_id
-                    )._get_fiscal_position(
-                        quote_order_sudo.partner_id,
-                        delivery=quote_order_sudo.partner_shipping_id
-                    )
-                    if fpos.id != quote_order_sudo.fiscal_position_id.id:
-                        quote_order_sudo = SaleOrder
+            if quote_order_sudo and not self._is_last_quote_order_reloadable(quote_order_sudo):
+                quote_order_sudo = SaleOrder
         else:
             quote_order_sudo = SaleOrder
 
-        # Ignore the current order if a payment has been initiated. We don't want to retrieve the
-        # cart and allow the user to update it when the payment is about to confirm it.
-        if quote_order_sudo and quote_order_sudo.get_portal_last_transaction().state in (
-            'pending', 'authorized', 'done'
-        ):
-            quote_order_sudo = None
+        # Unlike carts, quote carts are never paid online: there is no transaction to look up
+        # before letting the visitor update their quote cart.
 
         if not (quote_order_sudo or force_create):
             # Do not create a SO record unless needed
-            if request.session.get('quote_order_id'):
-                request.session.pop('quote_order_id')
-                request.session.pop('quote_cart_quantity', None)
+            if self._get_quote_session('quote_order_id'):
+                self._set_quote_session(quote_order_id=None, quote_cart_quantity=None)
             return self.env['sale.order']
 
         partner_sudo = self.env.user.partner_id
@@ -94,8 +211,10 @@ class Website(models.Model):
             so_data = self._prepare_sale_order_values(partner_sudo)
             quote_order_sudo = SaleOrder.with_user(SUPERUSER_ID).create(so_data)
 
-            request.session['quote_order_id'] = quote_order_sudo.id
-            request.session['quote_cart_quantity'] = quote_order_sudo.cart_quantity
+            self._set_quote_session(quote_order_id=quote_order_sudo.id)
+            if session_lines:
+                self._add_session_quote_cart_lines(quote_order_sudo)
+            self._set_quote_session(quote_cart_quantity=quote_order_sudo.cart_quantity)
             # The order was created with SUPERUSER_ID, revert back to request user.
             return quote_order_sudo.with_user(self.env.user).sudo()
 
@@ -104,12 +223,151 @@ class Website(models.Model):
         #   * In session, for specified partner
 
         # case when user emptied the cart
-        if not request.session.get('quote_order_id'):
-            request.session['quote_order_id'] = quote_order_sudo.id
-            request.session['quote_cart_quantity'] = quote_order_sudo.cart_quantity
+        if not self._get_quote_session('quote_order_id'):
+            self._set_quote_session(
+                quote_order_id=quote_order_sudo.id, quote_cart_quantity=quote_order_sudo.cart_quantity,
+            )
 
         # check for change of partner_id ie after signup
         if partner_sudo.id not in (quote_order_sudo.partner_id.id, self.partner_id.id):
             quote_order_sudo._update_address(partner_sudo.id, ['partner_id'])
 
+        if session_lines:
+            self._add_session_quote_cart_lines(quote_order_sudo)
+            self._set_quote_session(quote_cart_quantity=quote_order_sudo.cart_quantity)
+
         return quote_order_sudo
+
+    def _is_last_quote_order_reloadable(self, quote_order_sudo):
+        """Return whether the quote cart of the user last visit can be reloaded, i.e. whether its
+        pricelist is still available and its fiscal position is still the right one. Quote carts
+        whose pricing is deferred have no fiscal position yet, it is only computed with their
+        prices, see `sale.order._price_deferred_quotes`.
+
+        The check is cached in the session, keyed by the versions of the order, of its partner,
+        of its delivery address and of its pricelist.
+        """
+        key = repr([
+            self.id,
+            *((record.id, str(record.write_date)) for record in (
+                quote_order_sudo,
+                quote_order_sudo.partner_id,
+                quote_order_sudo.partner_shipping_id,
+                quote_order_sudo.pricelist_id,
+            )),
+        ])
+        cached_check = self._get_quote_session('quote_order_reload_check')
+        if cached_check and cached_check[0] == key:
+            return cached_check[1]
+
+        so_pricelist_sudo = quote_order_sudo.pricelist_id
+        if so_pricelist_sudo and so_pricelist_sudo not in self.get_pricelist_available():
+            # Do not reload the cart of this user last visit
+            # if the cart uses a pricelist no longer available.
+            reloadable = False
+        elif quote_order_sudo.quote_price_deferred:
+            reloadable = True
+        else:
+            # Do not reload the cart of this user last visit
+            # if the Fiscal Position has changed.
+            fpos = quote_order_sudo.env['account.fiscal.position'].with_company(
+                quote_order_sudo.company_id
+            )._get_fiscal_position(
+                quote_order_sudo.partner_id,
+                delivery=quote_order_sudo.partner_shipping_id
+            )
+            reloadable = fpos.id == quote_order_sudo.fiscal_position_id.id
+        self._set_quote_session(quote_order_reload_check=[key, reloadable])
+        return reloadable
+
+    # Session quote cart
+
+    def _is_session_quote_cart(self):
+        """Return whether the quote cart of the current visitor lives in their session.
+
+        In session mode, the quote cart of an anonymous visitor is a compact list of products
+        and quantities stored in the session, and rendered from a virtual `sale.order`, see
+        `_get_session_quote_order`. The quotation is only created when the visitor proceeds to
+        the checkout, see `sale_get_quote_order`, so that visitors who leave the website do
+        not create any order.
+        """
+        self.ensure_one()
+        return bool(
+            self.quote_cart_session_mode
+            and self.env.user._is_public()
+            and not self._get_quote_session('quote_order_id')
+        )
+
+    def _can_add_to_session_quote_cart(self, product_id, **kwargs):
+        """Return whether the product can be added to the session quote cart.
+
+        Only plain products fit the compact form of the session: combo products, custom or
+        no-variant attribute values and optional products linked to another line require the
+        quotation to be created.
+        """
+        if any(kwargs.get(key) for key in (
+            'product_custom_attribute_values', 'no_variant_attribute_value_ids', 'linked_line_id',
+        )):
+            return False
+        product_sudo = self.env['product.product'].sudo().browse(int(product_id)).exists()
+        return bool(product_sudo) and product_sudo.type != 'combo' and product_sudo._is_add_to_cart_allowed()
+
+    def _update_session_quote_cart(self, product_id, add_qty=0, set_qty=None):
+        """Add or set the quantity of a product in the session quote cart.
+
+        :param int product_id: The product to update.
+        :param float add_qty: The quantity to add, ignored when `set_qty` is given.
+        :param float set_qty: The new quantity of the product, 0 removes it.
+        :return: The new quantity of the product in the session quote cart.
+        :rtype: float
+        """
+        product_id = int(product_id)
+        lines = [list(line) for line in self._get_quote_session('quote_cart_lines') or []]
+        line = next((line for line in lines if line[0] == product_id), None)
+        if line is None:
+            line = [product_id, 0]
+            lines.append(line)
+        line[1] = float(set_qty) if set_qty is not None else line[1] + float(add_qty or 1)
+        lines = [line for line in lines if line[1] > 0]
+        self._set_quote_session(
+            quote_cart_lines=lines,
+            quote_cart_quantity=int(sum(quantity for _product_id, quantity in lines)),
+        )
+        return max(line[1], 0)
+
+    def _get_session_quote_order(self):
+        """Return the session quote cart of the visitor as a virtual `sale.order`.
+
+        The order is a new record: it is computed in memory for rendering and never stored.
+
+        :return: The virtual quote order, sudoed, or an empty recordset.
+        :rtype: sale.order
+        """
+        self.ensure_one()
+        session_lines = self._get_quote_session('quote_cart_lines')
+        if not session_lines:
+            return self.env['sale.order']
+        website = self.with_company(self.company_id)._with_quote_context()
+        ProductSudo = website.env['product.product'].sudo()
+        products = ProductSudo.browse([product_id for product_id, _quantity in session_lines]).exists()
+        quantities = dict(session_lines)
+        values = website._prepare_sale_order_values(website.env.user.partner_id.sudo())
+        values['order_line'] = [
+            Command.create({'product_id': product.id, 'product_uom_qty': quantities[product.id]})
+            for product in products if product.active and product._is_add_to_cart_allowed()
+        ]
+        return website.env['sale.order'].sudo().new(values)
+
+    def _add_session_quote_cart_lines(self, order_sudo):
+        """Move the lines of the session quote cart into the given quote order."""
+        session_lines = self._get_quote_session('quote_cart_lines')
+        if not session_lines:
+            return
+        self._set_quote_session(quote_cart_lines=None)
+        ProductSudo = self.env['product.product'].sudo()
+        order_sudo = order_sudo.with_context(skip_cart_verification=True)
+        for product_id, quantity in session_lines:
+            product_sudo = ProductSudo.browse(product_id).exists()
+            if product_sudo and product_sudo._is_add_to_cart_allowed():
+                order_sudo._cart_add(product_id=product_id, quantity=quantity)
+        order_sudo._verify_cart_after_update()
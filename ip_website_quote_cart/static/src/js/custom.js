@@ -28,11 +28,32 @@ const { DateTime } = luxon;
 		if(data && data['is_quote_cart'] == 'is_quote_cart' && data.hasOwnProperty('quote_cart_quantity')){
 			// Update quote cart quantity using utility function
 			quoteCartUtils.updateQuoteCartNavBar(data.quote_cart_quantity);
+			if(data.quote_cart_revision !== undefined){
+				quoteCartUtils.setQuoteCartRevision(data.quote_cart_revision);
+			}
 			
 			// Update quote cart lines if present
 			if(data['ip_website_quote_cart.cart_lines'] != undefined){
 				$(".quote_cart_lines").first().before(data['ip_website_quote_cart.cart_lines']).end().remove();
 			}
+			// Replace (or remove) only the updated lines
+			const renderedLines = data['ip_website_quote_cart.cart_line'] || {};
+			for (const [lineId, html] of Object.entries(renderedLines)) {
+				const lineEl = document.querySelector(`.quote_cart_lines .o_cart_product[data-line-id="${lineId}"]`);
+				if (lineEl && html) {
+					lineEl.outerHTML = html;
+				} else if (lineEl) {
+					lineEl.remove();
+				}
+			}
+			if(data['ip_website_quote_cart.quote_cart_summary_content'] != undefined){
+				document.querySelectorAll('.o_quote_cart_summary').forEach(
+					el => el.innerHTML = data['ip_website_quote_cart.quote_cart_summary_content']
+				);
+				document.querySelectorAll('.o_quote_cart_line_count').forEach(
+					el => el.textContent = data.quote_cart_line_count
+				);
+			}
 		}
 		else{
 			// For everything else (normal cart), call the original function
@@ -60,6 +81,7 @@ const { DateTime } = luxon;
 		        line_id: lineId,
 		        product_id: productId,
 		        quantity: quantity,
+		        fragments: ['badge', 'line', 'quote_summary'],
 		    });
 
 		    // If cart empty
@@ -91,9 +113,29 @@ const { DateTime } = luxon;
 	        patchDynamicContent(this.dynamicContent, {
 	            '#add_to_quote_cart': { 't-on-click': this._onClickAddQuoteCalling.bind(this) },
 	            '.js_add_to_quote_cart': { 't-on-click': this._onClickAddToQuoteCartSimple.bind(this) },
+	            '.o_quote_cart_more_lines': { 't-on-click': this._onClickQuoteCartMoreLines.bind(this) },
 	        });
 	    },
 
+	    /**
+	     * Load the next page of lines of the quote cart page in place of the button.
+	     * @private
+	     * @param {MouseEvent} ev
+	     */
+	    async _onClickQuoteCartMoreLines(ev) {
+	        const button = ev.currentTarget;
+	        button.disabled = true;
+	        const { html } = await rpc('/shop/quote/cart/lines', {
+	            offset: parseInt(button.dataset.offset),
+	        });
+	        const moreEl = button.closest('.o_quote_cart_more');
+	        const template = document.createElement('template');
+	        template.innerHTML = html;
+	        const newEls = [...template.content.children];
+	        moreEl.replaceWith(template.content);
+	        newEls.forEach(el => this.services['public.interactions'].startInteractions(el));
+	    },
+
 	    /**
 	     * Handle click on "Add to Quote" button in comparison/wishlist pages
 	     * @private
@@ -115,6 +157,7 @@ const { DateTime } = luxon;
 	            const data = await rpc('/shop/quote/cart/update_json', {
 	                product_id: productId,
 	                add_qty: 1,
+	                fragments: ['badge', 'notification'],
 	            });
 	            
 	            // Update navbar and show notification
@@ -167,8 +210,8 @@ const { DateTime } = luxon;
 	        const ptavIds = wSaleUtils.getSelectedAttributeValues(containerEl);
 	        
 	        // Check if product configurator should be shown (for optional products)
-	        const shouldShowProductConfiguratorQuote = await rpc(
-	            '/website_sale/should_show_product_configurator',
+	        const shouldShowProductConfiguratorQuote = await quoteCartUtils.shouldShowQuoteConfigurator(
+	            ev.currentTarget,
 	            {
 	                product_template_id: productTemplateId,
 	                ptav_ids: ptavIds,
@@ -192,48 +235,12 @@ const { DateTime } = luxon;
 	                    is_quote_cart: true,
 	                },
 	                save: async (mainProduct, optionalProducts, options) => {
-	                    // Collect all notification lines
-	                    let allNotificationLines = [];
-	                    let currencyId = 0;
-	                    
-	                    // Add main product
-	                    const params = {
-	                        product_id: mainProduct.id,
-	                        add_qty: mainProduct.quantity,
-	                    };
-	                    
-	                    let data = await rpc("/shop/quote/cart/update_json", {
-	                        ...params,
-	                        display: false,
-	                        force_create: true,
+	                    // Add the main product and all its options in a single request
+	                    const data = await rpc("/shop/quote/cart/update_batch_json", {
+	                        lines: [mainProduct, ...optionalProducts].map(
+	                            quoteCartUtils.serializeQuoteProduct
+	                        ),
 	                    });
-	                    
-	                    // Collect main product notification info
-	                    if (data.notification_info && data.notification_info.lines) {
-	                        allNotificationLines = allNotificationLines.concat(data.notification_info.lines);
-	                        currencyId = data.notification_info.currency_id || currencyId;
-	                    }
-
-	                    // Add optional products
-	                    for (const optionalProduct of optionalProducts) {
-	                        data = await rpc("/shop/quote/cart/update_json", {
-	                            product_id: optionalProduct.id,
-	                            add_qty: optionalProduct.quantity,
-	                            display: false,
-	                        });
-	                        
-	                        // Collect optional product notification info
-	                        if (data.notification_info && data.notification_info.lines) {
-	                            allNotificationLines = allNotificationLines.concat(data.notification_info.lines);
-	                            currencyId = data.notification_info.currency_id || currencyId;
-	                        }
-	                    }
-
-	                    // Update UI with combined notification info
-	                    data.notification_info = {
-	                        lines: allNotificationLines,
-	                        currency_id: currencyId,
-	                    };
 	                    this._updateQuoteCartUI(data);
 	                    
 	                    // Navigate to quote cart if "Go to Quote" was clicked
@@ -255,7 +262,7 @@ const { DateTime } = luxon;
 
 	            const data = await rpc("/shop/quote/cart/update_json", {
 	                ...params,
-	                display: false,
+	                fragments: ['badge', 'notification'],
 	                force_create: true,
 	            });
 
@@ -280,6 +287,20 @@ const { DateTime } = luxon;
 
 	});
 
+	publicWidget.registry.websiteSaleQuoteCartBadge = publicWidget.Widget.extend({
+	    selector: 'li.o_wsale_my_quote.o_quote_cart_hydrate, li.o_wsale_my_cart.o_quote_cart_hydrate',
+
+	    /**
+	     * Fill in the badges of a cacheable header, rendered without the visitor's session.
+	     *
+	     * @override
+	     */
+	    start() {
+	        quoteCartUtils.hydrateQuoteCartNavBar();
+	        return this._super(...arguments);
+	    },
+	});
+
 	publicWidget.registry.websiteSaleQuoteCartLink = publicWidget.Widget.extend({
 	    selector: '#top_menu a[href$="/shop/quote/cart"]',
 	    events: {
@@ -329,19 +350,18 @@ const { DateTime } = luxon;
 	            if (!self.hovered || $('.myquotecart-popover:visible').length) {
 	                return;
 	            }
-	            self._popoverRPC = $.get("/shop/quote/cart", {
-	                type: 'popover',
-	            }).then(function (data) {
+	            self._popoverQuoteRPC = quoteCartUtils.fetchQuoteCartPopover().then(function (data) {
 	                const popover = Popover.getInstance(self.$el[0]);
-	                popover._config.content = data;
+	                popover._config.content = data.html;
 	                popover.setContent(popover.getTipElement());
 	                self.$el.popover("show");
 	                $('.popover').on('mouseleave', function () {
 	                    self.$el.trigger('mouseleave');
 	                });
-	                // Update quote cart quantity from session storage
-	                self.cartQty = quoteCartUtils.getQuoteCartQuantity();
-	                self._updateCartQuantityText();
+	                // Update quote cart quantity from the popover payload
+	                quoteCartUtils.setQuoteCartQuantity(data.quote_cart_quantity);
+	            }).finally(function () {
+	                self._popoverQuoteRPC = null;
 	            });
 	        }, 300);
 	    },
@@ -371,7 +391,7 @@ const { DateTime } = luxon;
 	        // going to that page may perform the same computation the popover rpc
 	        // is already doing.
 
-	        if (this._popoverQuoteRPC && this._popoverQuoteRPC.state() === 'pending') {
+	        if (this._popoverQuoteRPC) {
 	            ev.preventDefault();
 	            var href = ev.currentTarget.href;
 	            this._popoverQuoteRPC.then(function () {
@@ -13,6 +13,7 @@ import { useSubEnv } from '@odoo/owl';
 
 const { DateTime } = luxon;
 import wSaleUtils from "@website_sale/js/website_sale_utils";
+import quoteCartUtils from '@ip_website_quote_cart/js/quote_cart_utils';
 
 // Patch ProductConfiguratorDialog to allow adding products with zero price to quote cart
 patch(ProductConfiguratorDialog.prototype, {
@@ -101,8 +102,8 @@ publicWidget.registry.mdProductShopPage = publicWidget.Widget.extend({
         // Get product template ID from the button's data attribute (product tiles)
         const productTemplateId = parseInt(ev.currentTarget.dataset.productTemplateId);
         
-        const shouldShowProductConfiguratorQuote = await rpc(
-            '/website_sale/should_show_product_configurator',
+        const shouldShowProductConfiguratorQuote = await quoteCartUtils.shouldShowQuoteConfigurator(
+            ev.currentTarget,
             {
                 product_template_id: productTemplateId,
                 ptav_ids: [],
@@ -129,45 +130,15 @@ publicWidget.registry.mdProductShopPage = publicWidget.Widget.extend({
                     is_quote_cart: true,
                 },
                 save: async (mainProduct, optionalProducts, options) => {
-                    // Collect all notification lines
-                    let allNotificationLines = [];
-                    let currencyId = 0;
-                    
-                    // Add main product
-                    var product_id = mainProduct.id
-                    var qty = mainProduct.quantity
-                    const params = {
-                        product_id: parseInt(product_id),
-                        add_qty: parseFloat(qty),
-                    };
-
-                    let data = await rpc("/shop/quote/cart/update_json", {
-                        ...params,
-                        display: false,
-                        force_create: true,
+                    // Add the main product and all its options in a single request
+                    const data = await rpc("/shop/quote/cart/update_batch_json", {
+                        lines: [mainProduct, ...optionalProducts].map(
+                            quoteCartUtils.serializeQuoteProduct
+                        ),
                     });
-                    
-                    // Collect main product notification info
-                    if (data.notification_info && data.notification_info.lines) {
-                        allNotificationLines = allNotificationLines.concat(data.notification_info.lines);
-                        currencyId = data.notification_info.currency_id || currencyId;
-                    }
+                    const allNotificationLines = data.notification_info?.lines || [];
+                    const currencyId = data.notification_info?.currency_id || 0;
 
-                    // Add optional products
-                    for (const optionalProduct of optionalProducts) {
-                        data = await rpc("/shop/quote/cart/update_json", {
-                            product_id: optionalProduct.id,
-                            add_qty: optionalProduct.quantity,
-                            display: false,
-                        });
-                        
-                        // Collect optional product notification info
-                        if (data.notification_info && data.notification_info.lines) {
-                            allNotificationLines = allNotificationLines.concat(data.notification_info.lines);
-                            currencyId = data.notification_info.currency_id || currencyId;
-                        }
-                    }
-                
                     // Mark data as quote cart and update UI
                     data.is_quote_cart = 'is_quote_cart';
                     wSaleUtils.updateCartNavBar(data);
@@ -198,7 +169,7 @@ publicWidget.registry.mdProductShopPage = publicWidget.Widget.extend({
             };
             const data = await rpc("/shop/quote/cart/update_json", {
                 ...params,
-                display: false,
+                fragments: ['badge', 'notification'],
                 force_create: true,
             });
 
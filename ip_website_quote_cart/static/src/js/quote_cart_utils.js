@@ -1,6 +1,17 @@
 /** @odoo-module **/
 
+import { rpc } from "@web/core/network/rpc";
+
 const QUOTE_CART_QUANTITY_SESSION_NAME = 'quote_cart_quantity';
+const QUOTE_CART_REVISION_SESSION_NAME = 'quote_cart_revision';
+const QUOTE_CART_POPOVER_SESSION_NAME = 'quote_cart_popover';
+
+// Whether the cached popover was checked against the server since the page was loaded. Changes
+// made in another tab or by a full page submit are only noticed by this check.
+let popoverRevisionChecked = false;
+
+// The pending or done hydration of the header badge, see `hydrateQuoteCartNavBar`.
+let navBarHydration = null;
 
 /**
  * Get the quote cart quantity from the session.
@@ -20,6 +31,50 @@ function setQuoteCartQuantity(quantity) {
     sessionStorage.setItem(QUOTE_CART_QUANTITY_SESSION_NAME, quantity.toString());
 }
 
+/**
+ * Get the revision of the quote cart last returned by the server.
+ *
+ * @return {string} The revision, or an empty string if unknown.
+ */
+function getQuoteCartRevision() {
+    return sessionStorage.getItem(QUOTE_CART_REVISION_SESSION_NAME) || '';
+}
+
+/**
+ * Set the revision of the quote cart, as returned by the quote cart routes.
+ *
+ * @param {string} revision The revision of the quote cart.
+ */
+function setQuoteCartRevision(revision) {
+    sessionStorage.setItem(QUOTE_CART_REVISION_SESSION_NAME, revision || '');
+}
+
+/**
+ * Get the content of the header quote cart popover.
+ *
+ * The popover is cached in the session storage along with the revision of the cart it was
+ * rendered for. It is only fetched again when the revision changed, and checked once per page
+ * load with a request that does not render anything if the revision is unchanged.
+ *
+ * @return {Promise<Object>} The popover, with its `html`, `revision` and `quote_cart_quantity`.
+ */
+async function fetchQuoteCartPopover() {
+    const cached = JSON.parse(sessionStorage.getItem(QUOTE_CART_POPOVER_SESSION_NAME) || 'null');
+    if (cached && popoverRevisionChecked && cached.revision === getQuoteCartRevision()) {
+        return cached;
+    }
+    const data = await rpc('/shop/quote/cart/popover', {
+        revision: cached && cached.revision,
+    });
+    if (data.html === undefined) {
+        data.html = cached.html;
+    }
+    popoverRevisionChecked = true;
+    sessionStorage.setItem(QUOTE_CART_POPOVER_SESSION_NAME, JSON.stringify(data));
+    setQuoteCartRevision(data.revision);
+    return data;
+}
+
 /**
  * Update the visibility and quantity of the quote cart button in the navbar.
  * Icon is hidden when cart is empty, shown when items are added.
@@ -61,8 +116,121 @@ function updateQuoteCartNavBar(quantity) {
     }
 }
 
+/**
+ * Fill in the cart badge of website_sale in a cacheable header.
+ *
+ * @param {number} quantity The quantity of items in the cart.
+ */
+function updateCartNavBarQuantity(quantity) {
+    document.querySelectorAll('li.o_wsale_my_cart.o_quote_cart_hydrate').forEach(li => {
+        if (quantity > 0) {
+            li.classList.remove('d-none');
+        }
+        li.querySelectorAll('.my_cart_quantity').forEach(badgeEl => {
+            badgeEl.textContent = quantity;
+            badgeEl.classList.toggle('d-none', quantity === 0);
+        });
+    });
+}
+
+/**
+ * Fill in the quote cart and cart badges of a cacheable header, rendered without the visitor's
+ * session.
+ *
+ * The quantities are taken from the page itself when it was rendered for the visitor
+ * (`.o_quote_cart_state`), otherwise from `/shop/quote/cart/quantity`. The badges are only
+ * filled in once per page load.
+ *
+ * @return {Promise} Resolved once the badges are filled in.
+ */
+function hydrateQuoteCartNavBar() {
+    if (!navBarHydration) {
+        navBarHydration = (async () => {
+            const stateEl = document.querySelector('.o_quote_cart_state[data-quantity]');
+            let quantities;
+            if (stateEl) {
+                quantities = {
+                    quote_cart_quantity: parseInt(stateEl.dataset.quantity || '0'),
+                    cart_quantity: parseInt(stateEl.dataset.cartQuantity || '0'),
+                };
+            } else {
+                quantities = await rpc('/shop/quote/cart/quantity', {});
+            }
+            updateQuoteCartNavBar(quantities.quote_cart_quantity);
+            updateCartNavBarQuantity(quantities.cart_quantity);
+        })();
+    }
+    return navBarHydration;
+}
+
+/**
+ * Return whether adding a product to the quote cart opens the product configurator.
+ *
+ * The decision is embedded by the server in the `data-quote-configurator` attribute of the
+ * button, see `product.template._get_quote_configurator_decision`; the server is only asked
+ * when the decision depends on the chosen combination.
+ *
+ * @param {HTMLElement} buttonEl The "Add to Quote" button.
+ * @param {Object} params The parameters of `/website_sale/should_show_product_configurator`.
+ * @return {Promise<boolean>}
+ */
+async function shouldShowQuoteConfigurator(buttonEl, params) {
+    const decision = buttonEl?.dataset.quoteConfigurator;
+    if (decision === 'dialog' || decision === 'direct') {
+        return decision === 'dialog';
+    }
+    return rpc('/website_sale/should_show_product_configurator', params);
+}
+
+/**
+ * Serialize a product of the product configurator into a quote cart line, as expected by
+ * `/shop/quote/cart/update_batch_json`.
+ *
+ * @param {Object} product The product, as given to the configurator `save` callback.
+ * @return {Object} The serialized line.
+ */
+function serializeQuoteProduct(product) {
+    const serializedProduct = {
+        product_id: product.id,
+        product_template_id: product.product_tmpl_id,
+        parent_product_template_id: product.parent_product_tmpl_id,
+        quantity: product.quantity,
+    };
+
+    if (!product.attribute_lines) {
+        return serializedProduct;
+    }
+
+    // Custom attributes.
+    serializedProduct.product_custom_attribute_values = [];
+    for (const ptal of product.attribute_lines) {
+        const selectedCustomPTAV = ptal.attribute_values.find(
+            ptav => ptav.is_custom && ptal.selected_attribute_value_ids.includes(ptav.id)
+        );
+        if (selectedCustomPTAV) {
+            serializedProduct.product_custom_attribute_values.push({
+                custom_product_template_attribute_value_id: selectedCustomPTAV.id,
+                custom_value: ptal.customValue,
+            });
+        }
+    }
+
+    // No variant attributes.
+    serializedProduct.no_variant_attribute_value_ids = product.attribute_lines
+        .filter(ptal => ptal.create_variant === 'no_variant')
+        .flatMap(ptal => ptal.selected_attribute_value_ids);
+
+    return serializedProduct;
+}
+
 export default {
     getQuoteCartQuantity: getQuoteCartQuantity,
     setQuoteCartQuantity: setQuoteCartQuantity,
     updateQuoteCartNavBar: updateQuoteCartNavBar,
+    getQuoteCartRevision: getQuoteCartRevision,
+    setQuoteCartRevision: setQuoteCartRevision,
+    fetchQuoteCartPopover: fetchQuoteCartPopover,
+    hydrateQuoteCartNavBar: hydrateQuoteCartNavBar,
+    serializeQuoteProduct: serializeQuoteProduct,
+    shouldShowQuoteConfigurator: shouldShowQuoteConfigurator,
 };
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from . import test_quote_cart_etag
+from . import test_quote_cart_benchmark
+from . import test_quote_cart_merge
+from . import test_quote_job
+from . import test_quote_price_deferred
+from . import test_quote_cart_add_all
+from . import test_quote_configurator_decision
+from . import test_quote_session
+from . import test_quote_cart_vacuum
+from . import test_quote_cart_metrics
+from . import test_quote_cart_recovery
+from . import test_quote_cart_import
+from . import test_quote_cart_cacheable_header
+from . import test_quote_cart_accessories
+from . import test_quote_checkout_addresses
+from . import test_portal_keyset_pager
+from . import test_quote_session_cart
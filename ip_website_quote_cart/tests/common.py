@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+
+from odoo.fields import Command
+from odoo.tests import HttpCase, new_test_user
+
+
+class QuoteCartBenchmarkCommon(HttpCase):
+    """Reproducible synthetic data set for the quote cart benchmarks.
+
+    The data set holds products with variants and optional products, partners with large
+    address books and a history of quote orders. Its size scales with the
+    `QUOTE_CART_BENCHMARK_SCALE` environment variable (1 by default), and the random choices are
+    seeded so that two runs with the same scale generate the same data.
+    """
+
+    SEED = 20240601
+    PRODUCT_COUNT = 40
+    VARIANT_VALUE_COUNT = 4
+    OPTIONAL_PRODUCT_COUNT = 3
+    PARTNER_COUNT = 20
+    ADDRESS_COUNT = 50
+    HISTORY_ORDER_COUNT = 200
+    HISTORY_ORDER_LINE_COUNT = 5
+    CART_LINE_COUNT = 20
+
+    @classmethod
+    def _scaled(cls, count):
+        scale = float(os.environ.get('QUOTE_CART_BENCHMARK_SCALE') or 1)
+        return max(int(count * scale), 1)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.rng = random.Random(cls.SEED)
+        cls.website = cls.env['website'].get_current_website()
+        cls._generate_products()
+        cls._generate_partners()
+        cls._generate_quote_history()
+
+    @classmethod
+    def _generate_products(cls):
+        attribute = cls.env['product.attribute'].create({
+            'name': 'Benchmark Size',
+            'create_variant': 'always',
+            'value_ids': [
+                Command.create({'name': 'Size %s' % index}) for index in range(cls.VARIANT_VALUE_COUNT)
+            ],
+        })
+        ProductTemplate = cls.env['product.template']
+        cls.optional_templates = ProductTemplate.create([{
+            'name': 'Benchmark Option %s' % index,
+            'list_price': 5.0,
+            'is_published': True,
+            'sale_ok': True,
+        } for index in range(cls.OPTIONAL_PRODUCT_COUNT)])
+        cls.templates = ProductTemplate.create([{
+            'name': 'Benchmark Product %s' % index,
+            'list_price': cls.rng.randint(10, 500),
+            'is_published': True,
+            'sale_ok': True,
+            'optional_product_ids': [Command.set(cls.optional_templates.ids)],
+            'attribute_line_ids': [Command.create({
+                'attribute_id': attribute.id,
+                'value_ids': [Command.set(attribute.value_ids.ids)],
+            })],
+        } for index in range(cls._scaled(cls.PRODUCT_COUNT))])
+        cls.products = cls.templates.product_variant_ids
+
+    @classmethod
+    def _generate_partners(cls):
+        address = {
+            'street': '215 Vine St',
+            'city': 'Scranton',
+            'zip': '18503',
+            'country_id': cls.env.ref('base.us').id,
+            'state_id': cls.env.ref('base.state_us_39').id,
+            'phone': '+1 555-555-5555',
+        }
+        cls.user = new_test_user(cls.env, login='quote_benchmark_portal', groups='base.group_portal')
+        cls.partner = cls.user.partner_id
+        cls.partner.write({**address, 'email': 'quote.benchmark@example.com'})
+        cls.partners = cls.partner | cls.env['res.partner'].create([{
+            **address,
+            'name': 'Benchmark Customer %s' % index,
+            'email': 'quote.benchmark.%s@example.com' % index,
+            'is_company': True,
+        } for index in range(cls._scaled(cls.PARTNER_COUNT))])
+        cls.env['res.partner'].create([{
+            **address,
+            'name': '%s, Address %s' % (partner.name, index),
+            'parent_id': partner.id,
+            'type': cls.rng.choice(['delivery', 'invoice']),
+        } for partner in cls.partners for index in range(cls.ADDRESS_COUNT)])
+
+    @classmethod
+    def _generate_quote_history(cls):
+        orders = cls.env['sale.order'].create([{
+            'partner_id': partner.id,
+            'website_id': cls.website.id,
+            'is_quote': True,
+            'is_quote_req_submit': True,
+            'order_line': [
+                Command.create({'product_id': product_id, 'product_uom_qty': cls.rng.randint(1, 10)})
+                for product_id in cls.rng.sample(cls.products.ids, min(cls.HISTORY_ORDER_LINE_COUNT, len(cls.products)))
+            ],
+        } for partner in cls.partners.browse(cls.rng.choices(cls.partners.ids, k=cls._scaled(cls.HISTORY_ORDER_COUNT)))])
+        sent_orders = orders.filtered(lambda order: cls.rng.random() < 0.5)
+        sent_orders.write({'state': 'sent'})
+
+    @classmethod
+    def _create_quote_cart(cls, partner=None, line_count=None):
+        """Create an open quote cart on the website, for the benchmarked customer by default."""
+        partner = partner or cls.partner
+        product_ids = cls.rng.sample(cls.products.ids, min(line_count or cls.CART_LINE_COUNT, len(cls.products)))
+        return cls.env['sale.order'].create({
+            'partner_id': partner.id,
+            'website_id': cls.website.id,
+            'pricelist_id': partner.property_product_pricelist.id,
+            'is_quote': True,
+            'order_line': [Command.create({'product_id': product_id, 'product_uom_qty': 1}) for product_id in product_ids],
+        })
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ip_website_quote_cart.controllers.main import PORTAL_KEYSET_ORDER, _portal_keyset_search
+
+
+@tagged('post_install', '-at_install')
+class TestPortalKeysetPager(TransactionCase):
+    """Portal order lists paged with a keyset cursor."""
+
+    STEP = 10
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partner = cls.env['res.partner'].create({'name': 'Keyset Distributor'})
+        start = datetime(2024, 1, 1)
+        # Some orders share their date, the cursor then orders them by id.
+        cls.orders = cls.env['sale.order'].create([{
+            'partner_id': partner.id,
+            'date_order': start + timedelta(days=index // 2),
+        } for index in range(25)])
+        cls.domain = [('partner_id', '=', partner.id)]
+        cls.SaleOrder = cls.env['sale.order']
+
+    def _search(self, page, **cursor):
+        return _portal_keyset_search(self.SaleOrder, self.domain, '/my/orders', page, self.STEP, **cursor)
+
+    def _cursor(self, url, name):
+        return parse_qs(urlsplit(url).query)[name][0]
+
+    def test_keyset_pages(self):
+        expected = self.SaleOrder.search(self.domain, order=PORTAL_KEYSET_ORDER)
+
+        first_page, pager = self._search(1)
+        self.assertEqual(first_page, expected[:10])
+        self.assertEqual(len(pager['pages']), 1, "Only the current page is numbered")
+
+        second_page, pager = self._search(2, after=self._cursor(pager['page_next']['url'], 'after'))
+        self.assertEqual(second_page, expected[10:20])
+
+        third_page, pager = self._search(3, after=self._cursor(pager['page_next']['url'], 'after'))
+        self.assertEqual(third_page, expected[20:])
+        self.assertEqual(pager['page_count'], 3, "The last page has no next page")
+
+        previous_page, pager = self._search(2, before=self._cursor(pager['page_previous']['url'], 'before'))
+        self.assertEqual(previous_page, expected[10:20])
+
+    def test_page_without_cursor(self):
+        expected = self.SaleOrder.search(self.domain, order=PORTAL_KEYSET_ORDER)
+        orders, _pager = self._search(2, after='invalid')
+        self.assertEqual(orders, expected[10:20], "Pages without a valid cursor are offset")
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartAccessories(TransactionCase):
+    """Accessories suggested in quote carts from the versioned per-website index."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.accessory = cls.env['product.product'].create({
+            'name': 'Accessory Cable', 'list_price': 5.0, 'is_published': True, 'sale_ok': True,
+        })
+        cls.product = cls.env['product.product'].create({
+            'name': 'Accessory Router',
+            'list_price': 100.0,
+            'is_published': True,
+            'sale_ok': True,
+            'accessory_product_ids': [Command.set(cls.accessory.ids)],
+        })
+        cls.order = cls.env['sale.order'].create({
+            'partner_id': cls.env['res.partner'].create({'name': 'Accessory Customer'}).id,
+            'website_id': cls.website.id,
+            'is_quote': True,
+            'order_line': [Command.create({'product_id': cls.product.id})],
+        })
+
+    def test_accessory_index_follows_publication(self):
+        self.assertEqual(self.order._cart_accessories(), [self.accessory])
+        self.accessory.is_published = False
+        self.assertFalse(self.order._cart_accessories(), "The index must follow the accessory publication")
+        self.accessory.is_published = True
+        self.assertEqual(self.order._cart_accessories(), [self.accessory])
+        self.product.accessory_product_ids = False
+        self.assertFalse(self.order._cart_accessories(), "The index must follow the accessories of the product")
+
+    def test_accessory_zero_price(self):
+        self.website.prevent_zero_price_sale = True
+        self.assertEqual(self.order._cart_accessories(), [self.accessory])
+        self.accessory.list_price = 0.0
+        self.assertFalse(self.order._cart_accessories(), "Prices are checked on each suggestion")
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from odoo.fields import Command
+from odoo.http import Request
+from odoo.tests import HttpCase, new_test_user, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartAddAll(HttpCase):
+    """Addition of a whole wishlist, or of all the compared products, to the quote cart."""
+
+    PRODUCT_COUNT = 40
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.user = new_test_user(cls.env, login='quote_add_all_portal', groups='base.group_portal')
+        cls.products = cls.env['product.product'].create([{
+            'name': 'Quote Add All Product %s' % index,
+            'list_price': 10.0,
+            'website_published': True,
+            'sale_ok': True,
+        } for index in range(cls.PRODUCT_COUNT)])
+
+    def _add_all(self, **data):
+        response = self.url_open('/shop/quote/cart/add_all', data={
+            'csrf_token': Request.csrf_token(self),
+            **data,
+        }, allow_redirects=False)
+        self.assertEqual(response.status_code, 303)
+        return self.env['sale.order'].search([
+            ('partner_id', '=', self.user.partner_id.id),
+            ('is_quote', '=', True),
+            ('state', '=', 'draft'),
+        ])
+
+    def test_add_wishlist(self):
+        self.env['product.wishlist'].create([{
+            'partner_id': self.user.partner_id.id,
+            'website_id': self.website.id,
+            'product_id': product.id,
+            'pricelist_id': self.user.partner_id.property_product_pricelist.id,
+            'price': product.list_price,
+        } for product in self.products])
+        self.authenticate(self.user.login, self.user.login)
+
+        order = self._add_all(source='wishlist')
+        self.assertEqual(order.order_line.product_id, self.products)
+        self.assertFalse(
+            self.env['product.wishlist'].search([('partner_id', '=', self.user.partner_id.id)]),
+            "The products should be moved out of the wishlist",
+        )
+
+    def test_add_comparison(self):
+        self.authenticate(self.user.login, self.user.login)
+        order = self._add_all(source='comparison', product_ids=','.join(map(str, self.products[:3].ids)))
+        order = self._add_all(source='comparison', product_ids=','.join(map(str, self.products[:2].ids)))
+        self.assertEqual(len(order.order_line), 3)
+        self.assertEqual(order.order_line.mapped('product_uom_qty'), [2.0, 2.0, 1.0])
+
+    def test_add_no_variant_product(self):
+        """Products with no_variant attributes get the same line as when added one by one."""
+        attribute = self.env['product.attribute'].create({
+            'name': 'Quote Add All Engraving',
+            'create_variant': 'no_variant',
+            'value_ids': [Command.create({'name': 'None'})],
+        })
+        product = self.env['product.template'].create({
+            'name': 'Quote Add All Engraved Product',
+            'list_price': 10.0,
+            'website_published': True,
+            'sale_ok': True,
+            'attribute_line_ids': [Command.create({
+                'attribute_id': attribute.id,
+                'value_ids': [Command.set(attribute.value_ids.ids)],
+            })],
+        }).product_variant_id
+        self.authenticate(self.user.login, self.user.login)
+
+        order = self._add_all(source='comparison', product_ids='%s,%s' % (product.id, self.products[0].id))
+        line = order.order_line.filtered(lambda line: line.product_id == product)
+        self.assertEqual(
+            line.product_no_variant_attribute_value_ids,
+            product.product_tmpl_id.attribute_line_ids.product_template_value_ids,
+        )
+
+        single_order = self.env['sale.order'].create({
+            'partner_id': self.user.partner_id.id,
+            'website_id': self.website.id,
+        })
+        single_order._cart_add(product_id=product.id, quantity=1)
+        self.assertEqual(
+            line.product_no_variant_attribute_value_ids,
+            single_order.order_line.product_no_variant_attribute_value_ids,
+        )
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import statistics
+import time
+
+from odoo.tests import tagged
+
+from .common import QuoteCartBenchmarkCommon
+
+_logger = logging.getLogger(__name__)
+
+# Maximum number of SQL queries of one warm request to each benchmarked route, on the data set of
+# `QuoteCartBenchmarkCommon`. A change that makes a route exceed its budget is a regression; a
+# change that saves queries should lower the budget accordingly.
+QUERY_BUDGETS = {
+    'update_json': 45,
+    'update': 45,
+    'update_line': 35,
+    'cart_lines': 30,
+    'cart': 90,
+    'popover': 25,
+    'checkout': 110,
+    'submit': 40,
+    'requested_quotes': 40,
+}
+
+
+@tagged('post_install', '-at_install', 'quote_cart_benchmark')
+class TestQuoteCartBenchmark(QuoteCartBenchmarkCommon):
+    """Latency percentiles and SQL query counts of the quote cart routes.
+
+    Run with `--test-tags quote_cart_benchmark`; the report is logged at the INFO level.
+    """
+
+    RUNS = 10
+
+    def setUp(self):
+        super().setUp()
+        self.order = self._create_quote_cart()
+        self.authenticate(self.user.login, self.user.login)
+
+    def _measure(self, name, call, setup=None):
+        """Call `call` once to warm the caches, then `RUNS` times, log the latency percentiles
+        and query counts of the runs and check the query count against the route's budget.
+
+        :param str name: The key of the route in `QUERY_BUDGETS`.
+        :param call: A callable doing one request to the route.
+        :param setup: A callable run before each call, outside the measure.
+        """
+        durations, query_counts = [], []
+        for run in range(self.RUNS + 1):
+            if setup:
+                setup()
+            queries_before = self.cr.sql_log_count
+            start = time.perf_counter()
+            call()
+            duration = time.perf_counter() - start
+            if run:  # The first run is the warm-up.
+                durations.append(duration * 1000)
+                query_counts.append(self.cr.sql_log_count - queries_before)
+
+        p50, p90, p99 = (
+            statistics.quantiles(durations, n=100, method='inclusive')[index] for index in (49, 89, 98)
+        )
+        _logger.info(
+            "Quote cart benchmark %s: p50 %.1fms, p90 %.1fms, p99 %.1fms, queries %s-%s (budget %s)",
+            name, p50, p90, p99, min(query_counts), max(query_counts), QUERY_BUDGETS[name],
+        )
+        self.assertLessEqual(
+            max(query_counts), QUERY_BUDGETS[name],
+            "The %s route exceeds its query budget" % name,
+        )
+
+    def _get(self, url):
+        response = self.url_open(url, allow_redirects=False)
+        self.assertLess(response.status_code, 400, "GET %s failed" % url)
+        return response
+
+    def test_update_json(self):
+        product_ids = iter(self.products.ids * (self.RUNS + 1))
+        self._measure('update_json', lambda: self.make_jsonrpc_request('/shop/quote/cart/update_json', {
+            'product_id': next(product_ids),
+            'add_qty': 1,
+            'display': False,
+        }))
+
+    def test_update(self):
+        line = self.order.order_line[:1]
+        quantities = iter(range(2, self.RUNS + 3))
+        self._measure('update', lambda: self.make_jsonrpc_request('/shop/quote/update', {
+            'line_id': line.id,
+            'product_id': line.product_id.id,
+            'quantity': next(quantities),
+        }))
+
+    def test_update_line(self):
+        line = self.order.order_line[:1]
+        quantities = iter(range(2, self.RUNS + 3))
+        self._measure('update_line', lambda: self.make_jsonrpc_request('/shop/quote/update', {
+            'line_id': line.id,
+            'product_id': line.product_id.id,
+            'quantity': next(quantities),
+            'fragments': ['badge', 'line', 'quote_summary'],
+        }))
+
+    def test_cart_lines(self):
+        self._measure('cart_lines', lambda: self.make_jsonrpc_request('/shop/quote/cart/lines', {
+            'offset': 1,
+        }))
+
+    def test_cart(self):
+        self._measure('cart', lambda: self._get('/shop/quote/cart'))
+
+    def test_popover(self):
+        self._measure('popover', lambda: self.make_jsonrpc_request('/shop/quote/cart/popover', {}))
+
+    def test_checkout(self):
+        self._measure('checkout', lambda: self._get('/shop/quote/checkout'))
+
+    def test_submit(self):
+        # Each submit consumes the quote cart, give the customer a new one before each run.
+        self._measure('submit', lambda: self._get('/shop/quote/submit'), setup=self._create_quote_cart)
+
+    def test_requested_quotes(self):
+        self._measure('requested_quotes', lambda: self._get('/my/requested_quotes'))
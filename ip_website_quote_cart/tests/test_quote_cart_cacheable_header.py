@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import HttpCase, new_test_user, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartCacheableHeader(HttpCase):
+    """Headers rendered without the visitor's session, with both badges filled in the browser."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.website.quote_cart_cacheable_header = True
+        cls.user = new_test_user(cls.env, login='quote_header_portal', groups='base.group_portal')
+        cls.product = cls.env['product.product'].create({
+            'name': 'Quote Header Product',
+            'list_price': 10.0,
+            'website_published': True,
+            'sale_ok': True,
+        })
+
+    def test_cart_badge_not_rendered_from_session(self):
+        self.authenticate(self.user.login, self.user.login)
+        self.make_jsonrpc_request('/shop/cart/add', {
+            'product_template_id': self.product.product_tmpl_id.id,
+            'product_id': self.product.id,
+            'quantity': 2,
+        })
+        order = self.env['sale.order'].search([('partner_id', '=', self.user.partner_id.id)], limit=1)
+        self.assertTrue(order)
+
+        response = self.url_open('/shop')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('o_quote_cart_hydrate', response.text)
+        self.assertNotIn('data-order-id="%s"' % order.id, response.text)
+
+        quantities = self.make_jsonrpc_request('/shop/quote/cart/quantity', {})
+        self.assertEqual(quantities['cart_quantity'], 2)
+        self.assertEqual(quantities['quote_cart_quantity'], 0)
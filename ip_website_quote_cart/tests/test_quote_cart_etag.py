@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import statistics
+import time
+
+from odoo.tests import HttpCase, new_test_user, tagged
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartEtag(HttpCase):
+    """Conditional GETs of the quote cart pages, and the render time they save."""
+
+    CART_LINES = 60
+    RUNS = 5
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.user = new_test_user(cls.env, login='quote_etag_portal', groups='base.group_portal')
+        cls.partner = cls.user.partner_id
+        cls.partner.write({
+            'street': '215 Vine St',
+            'city': 'Scranton',
+            'zip': '18503',
+            'country_id': cls.env.ref('base.us').id,
+            'state_id': cls.env.ref('base.state_us_39').id,
+            'email': 'quote.etag@example.com',
+            'phone': '+1 555-555-5555',
+        })
+        products = cls.env['product.product'].create([{
+            'name': 'Quote ETag Product %s' % index,
+            'list_price': 10.0,
+            'website_published': True,
+            'sale_ok': True,
+        } for index in range(cls.CART_LINES)])
+        cls.order = cls.env['sale.order'].create({
+            'partner_id': cls.partner.id,
+            'website_id': cls.website.id,
+            'pricelist_id': cls.partner.property_product_pricelist.id,
+            'is_quote': True,
+            'order_line': [(0, 0, {'product_id': product.id, 'product_uom_qty': 1}) for product in products],
+        })
+
+    def _timed_get(self, url, headers=None):
+        start = time.perf_counter()
+        response = self.url_open(url, headers=headers)
+        return response, time.perf_counter() - start
+
+    def _assert_conditional_get(self, url):
+        self.authenticate(self.user.login, self.user.login)
+        response, _duration = self._timed_get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('ETag')
+        self.assertTrue(etag, "The quote cart page should be served with an ETag")
+
+        full_times, cached_times = [], []
+        for _run in range(self.RUNS):
+            response, duration = self._timed_get(url)
+            self.assertEqual(response.status_code, 200)
+            full_times.append(duration)
+
+            response, duration = self._timed_get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertFalse(response.content)
+            cached_times.append(duration)
+
+        _logger.info(
+            "%s with %s lines: full render %.1fms, conditional GET %.1fms (median of %s runs)",
+            url, self.CART_LINES,
+            statistics.median(full_times) * 1000, statistics.median(cached_times) * 1000, self.RUNS,
+        )
+        return etag
+
+    def _assert_etag_changed(self, etag, route, params):
+        """Update the quote cart through the given route, and check that the ETag it had no
+        longer matches."""
+        self.make_jsonrpc_request(route, params)
+        response = self.url_open('/shop/quote/cart', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200, "%s should change the ETag" % route)
+        new_etag = response.headers.get('ETag')
+        self.assertTrue(new_etag)
+        self.assertNotEqual(new_etag, etag, "%s should change the ETag" % route)
+        return new_etag
+
+    def test_quote_cart_not_modified(self):
+        etag = self._assert_conditional_get('/shop/quote/cart')
+
+        # Any change of the cart gives a new ETag.
+        line = self.order.order_line[:1]
+        etag = self._assert_etag_changed(etag, '/shop/quote/cart/update_json', {
+            'product_id': line.product_id.id,
+            'add_qty': 1,
+            'display': False,
+        })
+        etag = self._assert_etag_changed(etag, '/shop/quote/cart/update_batch_json', {
+            'lines': [{'product_id': line.product_id.id, 'quantity': 1}],
+        })
+        self._assert_etag_changed(etag, '/shop/quote/update', {
+            'line_id': line.id,
+            'product_id': line.product_id.id,
+            'quantity': 5,
+        })
+
+    def test_quote_extra_info_not_modified(self):
+        self._assert_conditional_get('/shop/quote/extra_info')
+
+    def test_quote_cart_catalog_change(self):
+        etag = self._assert_conditional_get('/shop/quote/cart')
+
+        # Editing the suggested accessories of a product in the backend gives a new ETag.
+        accessory = self.env['product.product'].create({
+            'name': 'Quote ETag Accessory',
+            'list_price': 5.0,
+            'website_published': True,
+            'sale_ok': True,
+        })
+        self.order.order_line[:1].product_id.product_tmpl_id.accessory_product_ids = accessory
+        response = self.url_open('/shop/quote/cart', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200, "Changing the accessories should change the ETag")
+        self.assertNotEqual(response.headers.get('ETag'), etag)
+
+    def test_popover_first_lines(self):
+        # Like its revision, the popover of a large quote cart stays compact.
+        self.authenticate(self.user.login, self.user.login)
+        result = self.make_jsonrpc_request('/shop/quote/cart/popover', {})
+        self.assertEqual(result['html'].count('cart_line'), 5)
+        self.assertIn('and %s more product(s)' % (self.CART_LINES - 5), ' '.join(result['html'].split()))
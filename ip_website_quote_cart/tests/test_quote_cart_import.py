@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ip_website_quote_cart.controllers import quote_cart_import
+from odoo.addons.website.tools import MockRequest
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartImport(TransactionCase):
+    """Batch addition of imported quantities to a quote cart."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.partner = cls.env['res.partner'].create({'name': 'Quote Import Customer'})
+        cls.product = cls.env['product.product'].create({'name': 'Quote Import Product', 'sale_ok': True})
+        attribute = cls.env['product.attribute'].create({
+            'name': 'Quote Import Finish',
+            'create_variant': 'no_variant',
+            'value_ids': [Command.create({'name': 'Matte'})],
+        })
+        cls.finished_product = cls.env['product.template'].create({
+            'name': 'Quote Import Finished Product',
+            'sale_ok': True,
+            'attribute_line_ids': [Command.create({
+                'attribute_id': attribute.id,
+                'value_ids': [Command.set(attribute.value_ids.ids)],
+            })],
+        }).product_variant_id
+        cls.order = cls.env['sale.order'].create({
+            'partner_id': cls.partner.id,
+            'website_id': cls.website.id,
+            'is_quote': True,
+        })
+
+    def test_import_lines(self):
+        lines, warnings = self.order._quote_cart_import_lines({self.product.id: 2.0, self.finished_product.id: 1.0})
+        self.assertEqual(lines, self.order.order_line)
+        self.assertFalse(warnings)
+        finished_line = lines.filtered(lambda line: line.product_id == self.finished_product)
+        self.assertEqual(
+            finished_line.product_no_variant_attribute_value_ids,
+            self.finished_product.product_tmpl_id.attribute_line_ids.product_template_value_ids,
+            "The single-value no_variant attribute value is set, as when adding the product from the shop",
+        )
+
+        self.order._quote_cart_import_lines({self.product.id: 3.0})
+        product_line = self.order.order_line.filtered(lambda line: line.product_id == self.product)
+        self.assertEqual(product_line.product_uom_qty, 5.0, "The quantity is added to the existing line")
+
+    def _import_rows(self, rows):
+        with MockRequest(self.env, website=self.website):
+            return quote_cart_import.WebsiteSale()._quote_cart_import_rows(self.website._with_quote_context(), rows)
+
+    def test_import_ambiguous_reference(self):
+        self.env['product.product'].create([
+            {'name': 'Quote Import Bolt %s' % index, 'default_code': 'BOLT-M6', 'sale_ok': True}
+            for index in range(2)
+        ])
+        report = self._import_rows([(1, 'BOLT-M6', 10)])
+        self.assertEqual(report['added_rows'], 0)
+        self.assertEqual(report['rejected_rows'][0]['status'], 'ambiguous')
+
+    def test_import_truncated(self):
+        rows = [(row_number, 'UNKNOWN-%s' % row_number, 1) for row_number in range(1, 4)]
+        with patch.object(quote_cart_import, 'QUOTE_IMPORT_MAX_ROWS', 2):
+            report = self._import_rows(rows)
+        self.assertEqual(report['rejected_count'], 2, "Only the first rows are imported")
+        self.assertTrue(report['truncated'])
+
+        with patch.object(quote_cart_import, 'QUOTE_IMPORT_MAX_ROWS', 3):
+            self.assertFalse(self._import_rows(rows)['truncated'])
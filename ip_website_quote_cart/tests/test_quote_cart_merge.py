@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartMerge(TransactionCase):
+    """Merge of quote carts, on abandoned cart revival and at login."""
+
+    LINE_COUNT = 300
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.partner = cls.env['res.partner'].create({'name': 'Quote Merge Customer'})
+        cls.products = cls.env['product.product'].create([{
+            'name': 'Quote Merge Product %s' % index,
+            'list_price': 10.0,
+            'sale_ok': True,
+        } for index in range(cls.LINE_COUNT)])
+
+    def _create_quote_cart(self, products, quantity=1):
+        return self.env['sale.order'].create({
+            'partner_id': self.partner.id,
+            'website_id': self.website.id,
+            'is_quote': True,
+            'order_line': [Command.create({'product_id': product.id, 'product_uom_qty': quantity}) for product in products],
+        })
+
+    def test_merge_duplicate_lines(self):
+        cart = self._create_quote_cart(self.products[:200])
+        abandoned_cart = self._create_quote_cart(self.products[100:], quantity=2)
+
+        start = time.perf_counter()
+        cart._merge_quote_cart_lines(abandoned_cart)
+        self.env.flush_all()
+        _logger.info("Merged %s lines in %.1fms", len(abandoned_cart.order_line) + 200, (time.perf_counter() - start) * 1000)
+
+        self.assertFalse(abandoned_cart.order_line)
+        self.assertEqual(len(cart.order_line), self.LINE_COUNT)
+        self.assertEqual(len(cart.order_line.product_id), self.LINE_COUNT, "No product should be repeated")
+        quantities = {line.product_id: line.product_uom_qty for line in cart.order_line}
+        self.assertEqual(quantities[self.products[0]], 1)
+        self.assertEqual(quantities[self.products[150]], 3)
+        self.assertEqual(quantities[self.products[250]], 2)
+        self.assertEqual(cart.cart_quantity, 100 * 1 + 100 * 3 + 100 * 2)
+
+    def test_merge_several_carts(self):
+        cart = self._create_quote_cart(self.products[:1])
+        carts = self._create_quote_cart(self.products[1:3]) | self._create_quote_cart(self.products[1:3])
+
+        cart._merge_quote_cart_lines(carts)
+
+        self.assertEqual(len(cart.order_line), 3)
+        self.assertEqual(cart.order_line.mapped('product_uom_qty'), [1, 2, 2])
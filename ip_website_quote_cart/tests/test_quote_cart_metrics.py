@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import HttpCase, TransactionCase, tagged
+
+from odoo.addons.ip_website_quote_cart import metrics
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartMetrics(TransactionCase):
+    """Exported hit and miss counts of the ormcached methods."""
+
+    def test_ormcache_counters(self):
+        website = self.env['website'].get_current_website()
+        template = self.env['product.template'].create({'name': 'Metrics Product', 'is_published': True})
+        hits, misses = metrics._ormcache_counters()['_get_quote_configurator_decision']
+
+        for _call in range(2):
+            template._get_quote_configurator_decision(template.id, website.id, True)
+
+        new_hits, new_misses = metrics._ormcache_counters()['_get_quote_configurator_decision']
+        self.assertEqual(new_misses - misses, 1)
+        self.assertEqual(new_hits - hits, 1)
+        self.assertIn('cache="_get_quote_configurator_decision",outcome="hit"', metrics.export())
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartMetricsRoute(HttpCase):
+    """The metrics are only exported to the clients holding the metrics token."""
+
+    def test_metrics_token(self):
+        with patch.object(metrics, 'ENABLED', True), patch.object(metrics, 'TOKEN', 'metrics-secret'):
+            self.assertEqual(self.url_open('/quote_cart/metrics').status_code, 404)
+            response = self.url_open('/quote_cart/metrics', headers={'Authorization': 'Bearer wrong-secret'})
+            self.assertEqual(response.status_code, 404)
+            response = self.url_open('/quote_cart/metrics', headers={'Authorization': 'Bearer metrics-secret'})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('quote_cart_duration_seconds', response.text)
+        with patch.object(metrics, 'ENABLED', True), patch.object(metrics, 'TOKEN', None):
+            response = self.url_open('/quote_cart/metrics', headers={'Authorization': 'Bearer '})
+            self.assertEqual(response.status_code, 404, "The route is disabled without a token")
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartRecovery(TransactionCase):
+    """Abandoned quote carts are left out of the abandoned carts of website_sale."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.website.cart_abandoned_delay = 1.0
+        customer = cls.env['res.partner'].create({'name': 'Recovery Customer', 'email': 'recovery@example.com'})
+        product = cls.env['product.product'].create({'name': 'Recovery Product', 'sale_ok': True})
+        cls.cart, cls.quote_cart = cls.env['sale.order'].create([{
+            'partner_id': customer.id,
+            'website_id': cls.website.id,
+            'date_order': fields.Datetime.now() - timedelta(days=1),
+            'is_quote': is_quote,
+            'order_line': [Command.create({'product_id': product.id})],
+        } for is_quote in (False, True)])
+
+    def test_quote_cart_not_abandoned_cart(self):
+        self.assertTrue(self.cart.is_abandoned_cart)
+        self.assertFalse(self.quote_cart.is_abandoned_cart)
+
+        orders = self.cart | self.quote_cart
+        self.assertEqual(orders.filtered_domain([('is_abandoned_cart', '=', True)]), self.cart)
+        self.assertEqual(orders.search([('id', 'in', orders.ids), ('is_abandoned_cart', '=', True)]), self.cart)
+        self.assertEqual(orders.search([('id', 'in', orders.ids), ('is_abandoned_cart', '=', False)]), self.quote_cart)
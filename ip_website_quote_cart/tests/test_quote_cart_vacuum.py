@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import SQL
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCartVacuum(TransactionCase):
+    """Reclaim of stale quote carts with the default retention settings."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.customer = cls.env['res.partner'].create({'name': 'Vacuum Customer', 'email': 'vacuum@example.com'})
+        cls.product = cls.env['product.product'].create({'name': 'Vacuum Product', 'sale_ok': True})
+
+    def _create_quote_cart(self, partner, days_ago, with_line=True):
+        order = self.env['sale.order'].create({
+            'partner_id': partner.id,
+            'website_id': self.website.id,
+            'is_quote': True,
+            'order_line': [Command.create({'product_id': self.product.id})] if with_line else [],
+        })
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "UPDATE sale_order SET write_date = %s WHERE id = %s",
+            fields.Datetime.now() - timedelta(days=days_ago), order.id,
+        ))
+        order.invalidate_recordset(['write_date'])
+        return order
+
+    def test_default_retention(self):
+        public_cart = self._create_quote_cart(self.website.partner_id, 3)
+        empty_cart = self._create_quote_cart(self.customer, 3, with_line=False)
+        recent_cart = self._create_quote_cart(self.customer, 3)
+        stale_cart = self._create_quote_cart(self.customer, 31)
+        emailed_cart = self._create_quote_cart(self.customer, 31)
+        emailed_cart.quote_cart_recovery_email_date = fields.Datetime.now() - timedelta(days=10)
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "UPDATE sale_order SET write_date = %s WHERE id = %s",
+            fields.Datetime.now() - timedelta(days=31), emailed_cart.id,
+        ))
+
+        reclaimed = self.env['sale.order']._cron_vacuum_quote_carts()
+
+        self.assertEqual(reclaimed['deleted'], 2)
+        self.assertFalse((public_cart | empty_cart).exists())
+        self.assertEqual(stale_cart.state, 'cancel', "Customer quote carts are only cancelled by default")
+        self.assertEqual(recent_cart.state, 'draft')
+        self.assertEqual(emailed_cart.state, 'draft', "A quote cart is kept after its recovery email")
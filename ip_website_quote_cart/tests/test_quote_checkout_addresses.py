@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ip_website_quote_cart.controllers.main import (
+    QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE,
+    WebsiteSale,
+)
+from odoo.addons.website.tools import MockRequest
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteCheckoutAddresses(TransactionCase):
+    """Address book of the quote checkout, listed and checked without reading all of it."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.company = cls.env['res.partner'].create({'name': 'Address Book Distributor', 'is_company': True})
+        cls.contact = cls.env['res.partner'].create({
+            'name': 'Address Book Buyer', 'parent_id': cls.company.id, 'type': 'contact',
+        })
+        cls.delivery_addresses = cls.env['res.partner'].create([{
+            'name': 'Warehouse %s' % index,
+            'parent_id': cls.company.id,
+            'type': 'delivery',
+            'street': '%s Dock Street' % index,
+        } for index in range(QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE * 2)])
+        cls.order = cls.env['sale.order'].create({
+            'partner_id': cls.contact.id,
+            'website_id': cls.website.id,
+            'is_quote': True,
+        })
+        cls.controller = WebsiteSale()
+
+    def test_checkout_addresses_paged(self):
+        with MockRequest(self.env, website=self.website):
+            values = self.controller._prepare_checkout_page_values(self.order)
+        delivery_addresses = values['delivery_addresses']
+        self.assertIn(self.contact, delivery_addresses, "The customer's own contact is listed")
+        self.assertEqual(delivery_addresses[:1], self.order.partner_shipping_id, "The selected address comes first")
+        self.assertLessEqual(len(delivery_addresses), QUOTE_CHECKOUT_ADDRESS_PAGE_SIZE + 2)
+        self.assertEqual(values['quote_address_pagers']['delivery']['page_count'], 3)
+        self.assertEqual(values['address_url'], '/shop/quote/address')
+
+        with MockRequest(self.env, website=self.website):
+            addresses, pager = self.controller._get_quote_checkout_addresses(
+                self.order, 'delivery', delivery_search='Warehouse 7',
+            )
+        self.assertEqual(addresses.mapped('name'), ['Warehouse 7'])
+        self.assertEqual(pager['total'], 1)
+
+    def test_order_address(self):
+        address = self.delivery_addresses[0]
+        self.assertTrue(self.controller._is_order_address(self.order, self.contact))
+        self.assertTrue(self.controller._is_order_address(self.order, address))
+        other = self.env['res.partner'].create({'name': 'Other Customer', 'type': 'delivery'})
+        self.assertFalse(self.controller._is_order_address(self.order, other))
+        address.active = False
+        self.assertFalse(self.controller._is_order_address(self.order, address), "Archived addresses are refused")
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from odoo.fields import Command
+from odoo.tests import HttpCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteConfiguratorDecision(HttpCase):
+    """Decision to open the product configurator, embedded in the "Add to Quote" buttons."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.website.add_to_cart_action = 'stay'
+        cls.option = cls.env['product.template'].create({
+            'name': 'Configurator Option', 'is_published': True, 'sale_ok': True,
+        })
+        cls.attribute = cls.env['product.attribute'].create({
+            'name': 'Configurator Size',
+            'value_ids': [Command.create({'name': 'S'}), Command.create({'name': 'L'})],
+        })
+        cls.template = cls.env['product.template'].create({
+            'name': 'Configurator Product',
+            'is_published': True,
+            'sale_ok': True,
+            'attribute_line_ids': [Command.create({
+                'attribute_id': cls.attribute.id,
+                'value_ids': [Command.set(cls.attribute.value_ids.ids)],
+            })],
+        })
+
+    def _decision(self, is_product_configured):
+        return self.template._get_quote_configurator_decision(self.template.id, self.website.id, is_product_configured)
+
+    def test_simple_product(self):
+        self.assertEqual(self._decision(True), 'direct')
+        self.assertEqual(self._decision(False), 'dialog', "The variant must be chosen from a tile")
+
+    def test_optional_products(self):
+        self.template.optional_product_ids = self.option
+        self.assertEqual(self._decision(True), 'dialog')
+
+        ptav = self.template.attribute_line_ids.product_template_value_ids[:1]
+        self.env['product.template.attribute.exclusion'].create({
+            'product_template_attribute_value_id': ptav.id,
+            'product_tmpl_id': self.option.id,
+        })
+        self.assertEqual(self._decision(True), 'rpc', "The option depends on the chosen size")
+
+    def test_optional_product_unpublished(self):
+        self.template.optional_product_ids = self.option
+        self.assertEqual(self._decision(True), 'dialog')
+        self.option.is_published = False
+        self.assertEqual(self._decision(True), 'direct', "The cached decision must follow the option")
+
+    def test_optional_product_archived(self):
+        self.template.optional_product_ids = self.option
+        self.assertEqual(self._decision(True), 'dialog')
+        self.option.product_variant_ids.active = False
+        self.assertEqual(self._decision(True), 'direct', "The cached decision must follow the option variants")
+
+    def test_attribute_line_edit(self):
+        self.assertEqual(self._decision(False), 'dialog')
+        attribute_line = self.template.attribute_line_ids
+        attribute_line.value_ids = attribute_line.value_ids[:1]
+        self.assertEqual(self._decision(False), 'direct', "The cached decision must follow the variants")
+
+    def test_matches_core_route(self):
+        """A single variant product with a multi-valued no_variant attribute, decided as by the
+        route of website_sale."""
+        attribute = self.env['product.attribute'].create({
+            'name': 'Configurator Engraving',
+            'create_variant': 'no_variant',
+            'value_ids': [Command.create({'name': 'Front'}), Command.create({'name': 'Back'})],
+        })
+        template = self.env['product.template'].create({
+            'name': 'Configurator Engraved Product',
+            'is_published': True,
+            'sale_ok': True,
+            'attribute_line_ids': [Command.create({
+                'attribute_id': attribute.id,
+                'value_ids': [Command.set(attribute.value_ids.ids)],
+            })],
+        })
+        self.assertEqual(template.product_variant_count, 1)
+        for is_product_configured in (False, True):
+            show_configurator = self.make_jsonrpc_request('/website_sale/should_show_product_configurator', {
+                'product_template_id': template.id,
+                'ptav_ids': [],
+                'is_product_configured': is_product_configured,
+            })
+            self.assertEqual(
+                template._get_quote_configurator_decision(template.id, self.website.id, is_product_configured),
+                'dialog' if show_configurator else 'direct',
+            )
+
+    def test_force_dialog(self):
+        self.website.add_to_cart_action = 'force_dialog'
+        self.assertEqual(self._decision(True), 'dialog')
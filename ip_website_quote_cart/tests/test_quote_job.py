@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ip_website_quote_cart.models.sale_quote_job import SaleQuoteJob
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteJob(TransactionCase):
+    """Jobs run after the submission of a quote request."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Quote Job Customer', 'email': 'customer@example.com'})
+        product = cls.env['product.product'].create({'name': 'Quote Job Product', 'list_price': 10.0})
+        cls.order = cls.env['sale.order'].create({
+            'partner_id': cls.partner.id,
+            'is_quote': True,
+            'is_quote_req_submit': True,
+            'order_line': [Command.create({'product_id': product.id})],
+        })
+        cls.Job = cls.env['sale.quote.job']
+
+    def test_enqueue_idempotent(self):
+        jobs = self.Job._enqueue(self.order, ['recompute_taxes', 'confirmation_mail', 'submitted_hook'])
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual(jobs[1].previous_job_id, jobs[0], "The email waits for the taxes")
+        self.assertFalse(jobs[2].previous_job_id, "The hooks run on their own")
+        self.assertFalse(self.Job._enqueue(self.order, ['recompute_taxes', 'submitted_hook']))
+        self.assertEqual(len(self.Job._enqueue(self.order, ['submitted_hook'], key='resubmit')), 1)
+
+    def test_default_job_types(self):
+        self.assertEqual(self.order._get_quote_request_job_types(), ['recompute_taxes', 'submitted_hook'])
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('ip_website_quote_cart.quote_request_notifications', True)
+        ICP.set_param('ip_website_quote_cart.quote_request_pdf', True)
+        self.assertEqual(self.order._get_quote_request_job_types(), [
+            'recompute_taxes', 'render_pdf', 'confirmation_mail', 'notify_salesperson', 'submitted_hook',
+        ])
+
+    def test_process_and_retry(self):
+        taxes_job, mail_job = self.Job._enqueue(self.order, ['recompute_taxes', 'confirmation_mail'])
+        taxes_job.max_attempts = 2
+        with patch.object(SaleQuoteJob, '_run_recompute_taxes', side_effect=ValueError("Tax service down")):
+            processed = self.Job._cron_process_jobs()
+        self.assertEqual(processed, {'done': 0, 'retried': 1, 'failed': 0})
+        self.assertEqual(taxes_job.state, 'pending')
+        self.assertEqual(taxes_job.error, "Tax service down")
+        self.assertGreater(taxes_job.scheduled_date, taxes_job.create_date, "The retry should be delayed")
+        self.assertEqual(mail_job.attempt_count, 0, "The email waits for the taxes")
+
+        taxes_job.scheduled_date = taxes_job.create_date
+        with patch.object(SaleQuoteJob, '_run_recompute_taxes', side_effect=ValueError("Tax service down")):
+            self.Job._cron_process_jobs()
+        self.assertEqual(taxes_job.state, 'failed')
+        self.assertEqual(taxes_job.attempt_count, 2)
+        self.assertEqual(mail_job.state, 'pending')
+
+        taxes_job.action_retry()
+        self.Job._cron_process_jobs()
+        self.assertEqual(taxes_job.state, 'done')
+        self.assertEqual(mail_job.state, 'done')
+
+    def test_failed_step_does_not_block_others(self):
+        pdf_job, notify_job, hook_job = self.Job._enqueue(self.order, ['render_pdf', 'notify_salesperson', 'submitted_hook'])
+        pdf_job.max_attempts = 1
+        with patch.object(SaleQuoteJob, '_run_render_pdf', side_effect=OSError("wkhtmltopdf not found")):
+            self.Job._cron_process_jobs()
+        self.assertEqual(pdf_job.state, 'failed')
+        self.assertEqual((notify_job | hook_job).mapped('state'), ['done'] * 2)
+
+    def test_cancel_chain(self):
+        taxes_job, pdf_job, hook_job = self.Job._enqueue(self.order, ['recompute_taxes', 'render_pdf', 'submitted_hook'])
+        taxes_job.action_cancel()
+        self.assertEqual((taxes_job | pdf_job).mapped('state'), ['cancel'] * 2)
+        self.assertEqual(hook_job.state, 'pending', "The hooks do not depend on the taxes")
+        taxes_job.action_retry()
+        self.assertEqual((taxes_job | pdf_job).mapped('state'), ['pending'] * 2)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from odoo.fields import Command
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.website.tools import MockRequest
+
+
+@tagged('post_install', '-at_install')
+class TestQuotePriceDeferred(TransactionCase):
+    """Quote carts of websites deferring the pricing of quote requests."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.website.quote_price_deferred = True
+        cls.partner = cls.env['res.partner'].create({'name': 'Deferred Pricing Customer'})
+        cls.tax = cls.env['account.tax'].create({'name': 'Deferred Pricing Tax', 'amount': 10.0})
+        cls.product = cls.env['product.product'].create({
+            'name': 'Deferred Pricing Product',
+            'list_price': 100.0,
+            'taxes_id': [Command.set(cls.tax.ids)],
+        })
+
+    def _create_quote_cart(self):
+        values = self.website._with_quote_context()._prepare_sale_order_values(self.partner)
+        values['order_line'] = [Command.create({'product_id': self.product.id, 'product_uom_qty': 2})]
+        return self.env['sale.order'].create(values)
+
+    def test_quote_cart_not_priced(self):
+        order = self._create_quote_cart()
+        self.assertTrue(order.quote_price_deferred)
+        self.assertEqual(order.order_line.price_unit, 0.0)
+        self.assertFalse(order.order_line.tax_ids)
+
+        order.order_line.product_uom_qty = 3
+        self.assertEqual(order.amount_total, 0.0, "Updating the cart should not price it")
+
+    def test_price_quote_requests(self):
+        order = self._create_quote_cart()
+        order.action_price_quote_requests()
+        self.assertFalse(order.quote_price_deferred)
+        self.assertEqual(order.order_line.price_unit, 100.0)
+        self.assertEqual(order.order_line.tax_ids, self.tax)
+        self.assertEqual(order.amount_untaxed, 200.0)
+
+    def test_documents_priced(self):
+        """The jobs sending documents of the quote request price it first, even when run alone."""
+        order = self._create_quote_cart()
+        job = self.env['sale.quote.job']._enqueue(order, ['confirmation_mail'])
+        job._run()
+        self.assertEqual(job.state, 'done')
+        self.assertFalse(order.quote_price_deferred)
+        self.assertEqual(order.amount_untaxed, 200.0)
+
+    def test_reload_with_fiscal_position(self):
+        """The deferred quote cart of a customer with a fiscal position is reloaded on their
+        next visit, although it has no fiscal position yet."""
+        self.partner.property_account_position_id = self.env['account.fiscal.position'].create({
+            'name': 'Deferred Pricing Fiscal Position',
+        })
+        order = self._create_quote_cart()
+        self.assertFalse(order.fiscal_position_id)
+        with MockRequest(self.env, website=self.website):
+            self.assertTrue(self.website._is_last_quote_order_reloadable(order))
+
+        order.action_price_quote_requests()
+        self.assertEqual(order.fiscal_position_id, self.partner.property_account_position_id)
+
+    def test_cart_not_deferred(self):
+        values = self.website._prepare_sale_order_values(self.partner)
+        self.assertNotIn('quote_price_deferred', values, "Only quote carts are deferred")
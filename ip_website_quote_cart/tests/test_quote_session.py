@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.website.tools import MockRequest
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteSession(TransactionCase):
+    """Compact quote cart state of the session."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.order = cls.env['sale.order'].create({
+            'partner_id': cls.website.partner_id.id,
+            'website_id': cls.website.id,
+            'is_quote': True,
+        })
+
+    def test_set_state(self):
+        with MockRequest(self.env, website=self.website) as request:
+            self.website._set_quote_session(quote_order_id=self.order.id, quote_cart_quantity=2)
+            self.assertEqual(request.session['quote_cart'], {'o': self.order.id, 'q': 2})
+            self.website._set_quote_session(quote_order_id=None, quote_cart_quantity=None)
+            self.assertNotIn('quote_cart', request.session, "An empty state is not kept")
+
+    def test_legacy_session(self):
+        """Sessions created before the compact state keep their quote cart when it is updated."""
+        with MockRequest(self.env, website=self.website) as request:
+            request.session.update({
+                'quote_order_id': self.order.id,
+                'quote_cart_quantity': 3,
+                'last_order_quote_id': self.order.id,
+            })
+            self.assertEqual(self.website._get_quote_session('quote_order_id'), self.order.id)
+
+            self.website._set_quote_session(quote_cart_quantity=4)
+            self.assertEqual(request.session['quote_cart'], {'o': self.order.id, 'q': 4, 'l': self.order.id})
+            for name in ('quote_order_id', 'quote_cart_quantity', 'last_order_quote_id'):
+                self.assertNotIn(name, request.session)
+            self.assertEqual(self.website._get_quote_session('quote_order_id'), self.order.id)
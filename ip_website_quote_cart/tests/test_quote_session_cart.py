@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import HttpCase, new_test_user, tagged
+
+from odoo.addons.website.tools import MockRequest
+
+
+@tagged('post_install', '-at_install')
+class TestQuoteSessionCart(HttpCase):
+    """Quote carts of anonymous visitors kept in their session until they are needed."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].get_current_website()
+        cls.website.quote_cart_session_mode = True
+        cls.product = cls.env['product.product'].create({
+            'name': 'Session Cart Product',
+            'list_price': 10.0,
+            'website_published': True,
+            'sale_ok': True,
+        })
+        cls.user = new_test_user(cls.env, login='quote_session_portal', groups='base.group_portal')
+
+    def _quote_orders(self):
+        return self.env['sale.order'].search([('is_quote', '=', True), ('website_id', '=', self.website.id)])
+
+    def _update_quantity(self, quantity):
+        return self.make_jsonrpc_request('/shop/quote/update', {
+            'line_id': False, 'product_id': self.product.id, 'quantity': quantity, 'fragments': ['badge'],
+        })
+
+    def test_add_update_remove(self):
+        self.authenticate(None, None)
+        orders = self._quote_orders()
+
+        values = self.make_jsonrpc_request('/shop/quote/cart/update_json', {
+            'product_id': self.product.id, 'add_qty': 2, 'display': False,
+        })
+        self.assertEqual(values['quantity'], 2)
+        self.assertEqual(values['cart_quantity'], 2)
+        self.assertEqual(self._quote_orders(), orders, "Adding a product creates no order")
+
+        self.assertEqual(self._update_quantity(5)['cart_quantity'], 5)
+        response = self.url_open('/shop/quote/cart')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Session Cart Product', response.text, "The cart page renders the session cart")
+
+        values = self._update_quantity(0)
+        self.assertEqual(values['cart_quantity'], 0)
+        self.assertEqual(values['quote_cart_quantity'], 0)
+        self.assertEqual(self._quote_orders(), orders, "Updating and removing lines creates no order")
+
+    def test_materialized_at_checkout(self):
+        self.authenticate(None, None)
+        orders = self._quote_orders()
+        self.make_jsonrpc_request('/shop/quote/cart/update_json', {
+            'product_id': self.product.id, 'add_qty': 3, 'display': False,
+        })
+        self.url_open('/shop/quote/checkout', allow_redirects=False)
+
+        order = self._quote_orders() - orders
+        self.assertEqual(len(order), 1, "The checkout creates the quotation")
+        self.assertEqual(order.order_line.product_id, self.product)
+        self.assertEqual(order.order_line.product_uom_qty, 3)
+
+        self.url_open('/shop/quote/checkout', allow_redirects=False)
+        self.assertEqual(order.order_line.product_uom_qty, 3, "The session lines are only added once")
+
+    def test_promoted_at_login(self):
+        """The session quote cart of a visitor who logs in is added to their own quote cart."""
+        env = self.env(user=self.user)
+        website = self.website.with_env(env)
+        with MockRequest(env, website=website) as request:
+            request.quote_order_memo = None  # Not resolved yet in this request
+            website._set_quote_session(quote_cart_lines=[[self.product.id, 4]])
+            order = website._with_quote_context().sale_get_quote_order()
+            self.assertEqual(order.partner_id, self.user.partner_id)
+            self.assertEqual(order.order_line.product_uom_qty, 4)
+            self.assertFalse(website._get_quote_session('quote_cart_lines'), "The session lines are moved")
+            self.assertEqual(website._get_quote_session('quote_order_id'), order.id)